@@ -0,0 +1,157 @@
+import time
+from collections import deque
+
+import numpy as np
+
+# Niveis de qualidade, do melhor para o mais barato.
+# modo_fundo None = usa o modo configurado (MODO_FUNDO_JOGO)
+NIVEIS_QUALIDADE = [
+    dict(nome="ALTA",   escala_inferencia=1.0,  desenhar_landmarks=True,  modo_fundo=None,     model_complexity=1),
+    dict(nome="MEDIA",  escala_inferencia=0.75, desenhar_landmarks=True,  modo_fundo=None,     model_complexity=1),
+    dict(nome="BAIXA",  escala_inferencia=0.5,  desenhar_landmarks=False, modo_fundo="NENHUM", model_complexity=1),
+    dict(nome="MINIMA", escala_inferencia=0.5,  desenhar_landmarks=False, modo_fundo="NENHUM", model_complexity=0),
+]
+
+
+class AgendadorFrames:
+    """
+    Ritmo do loop principal com prazos absolutos no relogio monotonico.
+
+    O prazo do proximo frame e sempre 'prazo anterior + periodo' (nao
+    'agora + sobra'), entao o erro do sleep nao se acumula. Se um frame
+    passar do prazo, o agendador pula para o proximo slot em vez de tentar
+    recuperar o atraso com frames sem espera.
+
+    Com 'aplicar' (callback que recebe o dict do nivel), tambem ajusta a
+    qualidade: desce um nivel quando o trabalho do frame fica acima do
+    orcamento por 'frames_para_descer' frames seguidos e sobe quando ha folga
+    por 'frames_para_subir' frames seguidos (subir e bem mais lento que
+    descer, para nao ficar oscilando).
+
+    Com a fonte de frames (iniciar_frame(timestamp) + esperar(aguardar_frame)),
+    o prazo fica ancorado na chegada dos frames: a espera termina assim que
+    chega um frame capturado pelo menos (1 - tolerancia_frame) periodo depois
+    do ultimo, e o prazo seguinte conta dali. Dormir ate o prazo e depois
+    ainda esperar a camera no ler() envelhecia o frame em ate um periodo.
+    Camera mais rapida que fps_alvo: os frames cedo demais sao pulados (o
+    limite de fps continua valendo). Camera mais lenta: espera ate o prazo.
+
+    O trabalho conta a partir de iniciar_frame() (chamar quando a captura
+    entrega o frame): a espera pela camera nao e custo de CPU e baixar a
+    qualidade nao a diminui. Uma camera a 15 fps no escuro nao pode levar
+    o jogo ate MINIMA com a CPU parada.
+    """
+
+    def __init__(self, fps_alvo, aplicar=None, niveis=NIVEIS_QUALIDADE, nivel_inicial=0,
+                 adaptativo=True, limite_acima=0.9, limite_folga=0.6,
+                 frames_para_descer=15, frames_para_subir=150, janela=300, tolerancia_frame=0.25):
+        self.periodo = 1.0 / fps_alvo
+        self.aplicar = aplicar
+        self.niveis = niveis
+        self.nivel = nivel_inicial
+        self.adaptativo = adaptativo and aplicar is not None
+        self.limite_acima = limite_acima
+        self.limite_folga = limite_folga
+        self.frames_para_descer = frames_para_descer
+        self.frames_para_subir = frames_para_subir
+        self.tolerancia_frame = tolerancia_frame # Fracao do periodo (jitter do timestamp da camera)
+
+        self.jitter = deque(maxlen=janela)    # acordou - prazo (s)
+        self.trabalho = deque(maxlen=janela)  # tempo do frame sem contar a espera (s)
+        self.frames = 0
+        self.prazos_perdidos = 0
+        self.acordados_pelo_frame = 0 # Esperas encerradas antes do prazo por um frame novo
+        self.mudancas = [] # (frame, nivel, motivo)
+
+        self._prazo = None
+        self._inicio_frame = None
+        self._timestamp_frame = None # Captura do frame atual (iniciar_frame)
+        self._acima = 0
+        self._folga = 0
+
+        if aplicar is not None:
+            aplicar(self.niveis[self.nivel])
+
+    @property
+    def qualidade(self):
+        return self.niveis[self.nivel]["nome"]
+
+    def iniciar_frame(self, timestamp_frame=None):
+        """Chamar quando o frame da camera chegar: o trabalho do frame conta daqui."""
+        self._inicio_frame = time.monotonic()
+        self._timestamp_frame = timestamp_frame
+
+    def esperar(self, aguardar_frame=None):
+        """
+        Chamar uma vez por frame, no fim. Dorme ate o prazo do proximo frame.
+        aguardar_frame(timeout, depois_de) -> bool (da fonte): acorda antes se o proximo frame chegar.
+        """
+        agora = time.monotonic()
+        if self._prazo is None:
+            self._prazo = agora + self.periodo
+            self._inicio_frame = agora
+            return
+
+        trabalho = agora - self._inicio_frame
+        self.trabalho.append(trabalho)
+        self.frames += 1
+        if self.adaptativo:
+            self._avaliar(trabalho)
+
+        if (agora < self._prazo and aguardar_frame is not None and self._timestamp_frame is not None
+                and aguardar_frame(self._prazo - agora,
+                                   self._timestamp_frame + self.periodo * (1 - self.tolerancia_frame))):
+            # Proximo frame chegou antes do prazo: processa ja; o prazo seguinte conta da chegada dele
+            acordou = time.monotonic()
+            self.acordados_pelo_frame += 1
+            self._prazo = acordou + self.periodo
+        elif agora < self._prazo:
+            restante = self._prazo - time.monotonic()
+            if restante > 0:
+                time.sleep(restante)
+            acordou = time.monotonic()
+            self.jitter.append(acordou - self._prazo)
+            self._prazo += self.periodo
+        else:
+            # Perdeu o prazo: comeca ja e re-ancora no proximo slot livre
+            self.prazos_perdidos += 1
+            acordou = agora
+            slots = int((agora - self._prazo) / self.periodo) + 1
+            self._prazo += slots * self.periodo
+        self._inicio_frame = acordou
+
+    def _avaliar(self, trabalho):
+        if trabalho > self.periodo * self.limite_acima:
+            self._acima += 1
+            self._folga = 0
+        elif trabalho < self.periodo * self.limite_folga:
+            self._folga += 1
+            self._acima = 0
+        else:
+            self._acima = self._folga = 0
+
+        if self._acima >= self.frames_para_descer and self.nivel < len(self.niveis) - 1:
+            self._mudar(self.nivel + 1, f"{self._acima} frames acima de {self.limite_acima:.0%} do orcamento")
+        elif self._folga >= self.frames_para_subir and self.nivel > 0:
+            self._mudar(self.nivel - 1, f"{self._folga} frames com folga")
+
+    def _mudar(self, nivel, motivo):
+        self.nivel = nivel
+        self._acima = self._folga = 0
+        self.mudancas.append((self.frames, nivel, motivo))
+        print(f"Qualidade -> {self.qualidade} (nivel {nivel}): {motivo}")
+        self.aplicar(self.niveis[nivel])
+
+    def estado(self):
+        """Resumo para log/HUD: nivel atual, jitter e trabalho em ms, prazos perdidos."""
+        estado = {"qualidade": self.qualidade, "nivel": self.nivel, "frames": self.frames,
+                  "prazos_perdidos": self.prazos_perdidos, "acordados_pelo_frame": self.acordados_pelo_frame,
+                  "mudancas": len(self.mudancas)}
+        if self.jitter:
+            jitter_ms = np.fromiter(self.jitter, np.float64, len(self.jitter)) * 1000
+            estado["jitter_p50_ms"] = round(float(np.percentile(jitter_ms, 50)), 2)
+            estado["jitter_p95_ms"] = round(float(np.percentile(jitter_ms, 95)), 2)
+        if self.trabalho:
+            trabalho_ms = np.fromiter(self.trabalho, np.float64, len(self.trabalho)) * 1000
+            estado["trabalho_p95_ms"] = round(float(np.percentile(trabalho_ms, 95)), 2)
+        return estado
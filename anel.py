@@ -0,0 +1,118 @@
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class AnelFrames:
+    """
+    Ring buffer de frames em multiprocessing.shared_memory (um escritor, um leitor).
+
+    Layout do bloco: seq de cada slot (int64), timestamp de cada slot (float64),
+    ultimo seq escrito (int64) e depois os slots com os frames.
+
+    O escritor marca o slot com seq -1 enquanto copia e so depois publica o
+    seq novo; o leitor copia o slot e confere se o seq nao mudou no meio
+    (se mudou, o escritor deu a volta no anel e ele tenta de novo).
+    Nada e serializado: entre processos so passa o nome do bloco.
+
+    Para mandar para outro processo, passe o proprio objeto em Process(args=...):
+    o filho reabre o bloco pelo nome (criar=False).
+    """
+
+    def __init__(self, forma, slots=4, nome=None, criar=True, evento=None):
+        self.forma = tuple(forma)
+        self.slots = slots
+        self.criar = criar
+        self.evento = evento # multiprocessing.Event: acorda o leitor (opcional)
+
+        tamanho_frame = int(np.prod(self.forma))
+        inicio_frames = (16 * slots + 8 + 63) // 64 * 64 # Frames alinhados em 64 bytes
+        tamanho = inicio_frames + slots * tamanho_frame
+        self.shm = shared_memory.SharedMemory(name=nome, create=criar, size=tamanho if criar else 0)
+        self.nome = self.shm.name
+
+        buf = self.shm.buf
+        self._seqs = np.ndarray((slots,), np.int64, buf, 0)
+        self._tempos = np.ndarray((slots,), np.float64, buf, 8 * slots)
+        self._ultimo = np.ndarray((1,), np.int64, buf, 16 * slots)
+        self.frames = np.ndarray((slots,) + self.forma, np.uint8, buf, inicio_frames)
+        if criar:
+            self._seqs.fill(0)
+            self._ultimo[0] = 0
+
+    def __reduce__(self):
+        return (AnelFrames, (self.forma, self.slots, self.nome, False, self.evento))
+
+    @property
+    def ultimo_seq(self):
+        return int(self._ultimo[0])
+
+    def escrever(self, frame, timestamp):
+        seq = int(self._ultimo[0]) + 1
+        i = seq % self.slots
+        self._seqs[i] = -1
+        np.copyto(self.frames[i], frame)
+        self._tempos[i] = timestamp
+        self._seqs[i] = seq
+        self._ultimo[0] = seq
+        if self.evento is not None:
+            self.evento.set()
+        return seq
+
+    def ler(self, ultimo_lido=0, timeout=0.1, destino=None):
+        """
+        Copia o frame mais novo com seq > ultimo_lido (para 'destino', se vier um buffer).
+        Retorna (frame, timestamp, seq) ou None se nada novo chegou no timeout.
+        """
+        limite = time.monotonic() + timeout
+        while True:
+            seq = int(self._ultimo[0])
+            if seq > ultimo_lido:
+                i = seq % self.slots
+                if destino is not None:
+                    frame = destino
+                    np.copyto(frame, self.frames[i])
+                else:
+                    frame = self.frames[i].copy()
+                timestamp = float(self._tempos[i])
+                if self._seqs[i] == seq:
+                    return frame, timestamp, seq
+                continue # Sobrescrito durante a copia: pega o mais novo de novo
+
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                return None
+            if self.evento is not None:
+                self.evento.clear()
+                if int(self._ultimo[0]) == seq: # Nada chegou entre o teste e o clear
+                    self.evento.wait(restante)
+            else:
+                time.sleep(min(restante, 0.002))
+
+    def aguardar(self, ultimo_lido=0, timeout=0.1, depois_de=0.0):
+        """
+        Espera ate 'timeout' s por um frame com seq > ultimo_lido capturado a
+        partir de 'depois_de' (relogio monotonico), sem copiar. True se chegou.
+        """
+        limite = time.monotonic() + timeout
+        while True:
+            seq = int(self._ultimo[0])
+            if seq > ultimo_lido and float(self._tempos[seq % self.slots]) >= depois_de:
+                return True
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                return False
+            if self.evento is not None:
+                self.evento.clear()
+                if int(self._ultimo[0]) == seq:
+                    self.evento.wait(restante)
+            else:
+                time.sleep(min(restante, 0.002))
+
+    def fechar(self):
+        # As views numpy precisam sumir antes de fechar o bloco
+        self._seqs = self._tempos = self._ultimo = self.frames = None
+        self.shm.close()
+        if self.criar:
+            self.shm.unlink()
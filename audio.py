@@ -0,0 +1,95 @@
+"""
+Som do jogo (pygame.mixer), carregado so quando alguem entra no JOGO.
+
+Importar o pygame, abrir o mixer e decodificar os mp3 atrasava a primeira
+imagem da camera, e so o jogo usa som. iniciar() faz isso numa thread;
+enquanto carrega (ou sem pygame / sem os arquivos) o jogo roda sem som.
+Se a musica foi pedida durante a carga, ela comeca assim que terminar.
+
+estado: "desligado" -> "carregando" -> "pronto" (ou "sem som")
+"""
+import os
+import threading
+
+
+class AudioJogo:
+    def __init__(self, pasta="assets", musica="musica2.mp3", ponto="ponto.mp3", volume=0.3):
+        self.pasta = pasta
+        self.musica = musica
+        self.arquivo_ponto = ponto
+        self.volume = volume
+        self.estado = "desligado"
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pygame = None # So depois de carregado
+        self._som_ponto = None
+        self._musica_pedida = False
+
+    def iniciar(self):
+        """Comeca a carregar em segundo plano (so na primeira chamada)."""
+        with self._lock:
+            if self.estado != "desligado":
+                return
+            self.estado = "carregando"
+        self._thread = threading.Thread(target=self._carregar, name="audio-jogo", daemon=True)
+        self._thread.start()
+
+    def _carregar(self):
+        try:
+            import pygame
+        except ImportError:
+            print("----------------------------------------------------")
+            print("AVISO: Pygame nao encontrado. O jogo vai rodar sem som.")
+            print("Para instalar, rode: python -m pip install pygame")
+            print("----------------------------------------------------")
+            self.estado = "sem som"
+            return
+
+        try:
+            pygame.mixer.init()
+            pygame.mixer.music.load(os.path.join(self.pasta, self.musica)) # Fundo do Jogo
+            pygame.mixer.music.set_volume(self.volume)
+            som_ponto = pygame.mixer.Sound(os.path.join(self.pasta, self.arquivo_ponto)) # Som de ponto
+            som_ponto.set_volume(self.volume)
+        except Exception as e:
+            print(f"Aviso: Nao foi possivel carregar arquivos de som ({self.pasta}/{self.musica}, "
+                  f"{self.pasta}/{self.arquivo_ponto}): {e}")
+            print("O jogo funcionara sem som.")
+            if pygame.mixer.get_init():
+                pygame.mixer.quit()
+            self.estado = "sem som"
+            return
+
+        with self._lock:
+            self._pygame = pygame
+            self._som_ponto = som_ponto
+            self.estado = "pronto"
+            if self._musica_pedida:
+                pygame.mixer.music.play(-1)
+
+    def tocar_musica(self):
+        """Musica de fundo em loop (se ainda estiver carregando, comeca quando terminar)."""
+        with self._lock:
+            self._musica_pedida = True
+            if self._pygame is not None and not self._pygame.mixer.music.get_busy():
+                self._pygame.mixer.music.play(-1)
+
+    def parar_musica(self):
+        with self._lock:
+            self._musica_pedida = False
+            if self._pygame is not None:
+                self._pygame.mixer.music.stop()
+
+    def ponto(self):
+        if self._som_ponto is not None:
+            self._som_ponto.play()
+
+    def encerrar(self):
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        with self._lock:
+            if self._pygame is not None:
+                self._pygame.mixer.quit()
+                self._pygame = None
+                self._som_ponto = None
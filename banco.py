@@ -0,0 +1,336 @@
+import sqlite3
+import threading
+import time
+
+# O mysql.connector so e importado quando o primeiro score for enviado
+# (importar ele atrasava a abertura da camera, e muita sessao nem salva nada)
+_mysql = None
+
+
+def importar_conector():
+    """mysql.connector (com o pooling), importado na primeira chamada. ImportError se nao estiver instalado."""
+    global _mysql
+    if _mysql is None:
+        import mysql.connector
+        import mysql.connector.pooling
+        _mysql = mysql.connector
+    return _mysql
+
+# Mesmo banco que a galeria PHP usa
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root', 
+    'password': '', # Senha vazia (padrão XAMPP/WAMP)
+    'database': 'flappy_game_db'
+}
+
+
+def garantir_colunas_derivados(cursor):
+    """Cria as colunas thumb_path / web_path (derivados.py) e video_path (clipe.py) no highscores (tabelas antigas nao tem)."""
+    cursor.execute("SHOW COLUMNS FROM highscores LIKE 'thumb_path'")
+    if not cursor.fetchall():
+        cursor.execute("ALTER TABLE highscores ADD COLUMN thumb_path VARCHAR(255) NULL, "
+                       "ADD COLUMN web_path VARCHAR(255) NULL")
+    cursor.execute("SHOW COLUMNS FROM highscores LIKE 'video_path'")
+    if not cursor.fetchall():
+        cursor.execute("ALTER TABLE highscores ADD COLUMN video_path VARCHAR(255) NULL")
+
+
+# Consultas da galeria / ranking (ORDER BY score DESC, id DESC), do arquivamento
+# (created_at) e da reconciliacao com fotos/ (image_path)
+INDICES = {
+    "idx_score_id": ("score", "id"),
+    "idx_created_at": ("created_at",),
+    "idx_image_path": ("image_path",),
+}
+
+
+def garantir_indices(cursor):
+    """Cria os indices que faltam no highscores (compara pelas colunas). Retorna os nomes criados."""
+    cursor.execute("SHOW INDEX FROM highscores")
+    campos = cursor.column_names
+    por_indice = {}
+    for linha in cursor.fetchall():
+        linha = dict(zip(campos, linha))
+        por_indice.setdefault(linha["Key_name"], []).append((linha["Seq_in_index"], linha["Column_name"]))
+    existentes = {tuple(coluna for _, coluna in sorted(colunas)) for colunas in por_indice.values()}
+
+    criados = []
+    for nome, colunas in INDICES.items():
+        # Um indice que comeca com as mesmas colunas ja serve
+        if not any(existente[:len(colunas)] == colunas for existente in existentes):
+            cursor.execute(f"CREATE INDEX {nome} ON highscores ({', '.join(colunas)})")
+            criados.append(nome)
+    return criados
+
+
+class SpoolLocal:
+    """
+    Fila duravel em SQLite. Todo score passa por aqui ANTES de ir para o MySQL,
+    entao nada se perde se o XAMPP estiver desligado ou o app fechar.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL") # fsync a cada commit
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pendentes ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " score INTEGER NOT NULL,"
+            " image_path TEXT NOT NULL,"
+            " created_at TEXT NOT NULL)"
+        )
+        # Spools de versoes anteriores: colunas das miniaturas (derivados.py) e do clipe (clipe.py)
+        colunas = {linha[1] for linha in self._conn.execute("PRAGMA table_info(pendentes)")}
+        for coluna in ("thumb_path", "web_path", "video_path"):
+            if coluna not in colunas:
+                self._conn.execute(f"ALTER TABLE pendentes ADD COLUMN {coluna} TEXT")
+        self._conn.commit()
+
+    def adicionar(self, score, image_path, created_at, thumb_path=None, web_path=None, video_path=None):
+        with self._lock:
+            self._conn.execute("INSERT INTO pendentes (score, image_path, created_at, thumb_path, web_path, video_path)"
+                               " VALUES (?, ?, ?, ?, ?, ?)",
+                               (score, image_path, created_at, thumb_path, web_path, video_path))
+            self._conn.commit()
+
+    def proximos(self, limite):
+        with self._lock:
+            return self._conn.execute("SELECT id, score, image_path, created_at, thumb_path, web_path, video_path"
+                                      " FROM pendentes ORDER BY id LIMIT ?", (limite,)).fetchall()
+
+    def rejeitar(self, linha, erro):
+        """Tira do pendentes um score que o MySQL recusou (dado invalido, nao queda) e guarda em 'rejeitados'."""
+        id_linha, score, image_path, created_at, thumb_path, web_path, video_path = linha
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rejeitados ("
+                " id INTEGER PRIMARY KEY, score INTEGER, image_path TEXT, created_at TEXT,"
+                " thumb_path TEXT, web_path TEXT, video_path TEXT, erro TEXT, rejeitado_em TEXT)"
+            )
+            self._conn.execute("INSERT OR REPLACE INTO rejeitados VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               (*linha, erro, time.strftime("%Y-%m-%d %H:%M:%S")))
+            self._conn.execute("DELETE FROM pendentes WHERE id = ?", (id_linha,))
+            self._conn.commit()
+
+    def remover(self, ids):
+        if not ids:
+            return
+        with self._lock:
+            self._conn.executemany("DELETE FROM pendentes WHERE id = ?", [(i,) for i in ids])
+            self._conn.commit()
+
+    def quantidade(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pendentes").fetchone()[0]
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
+
+
+class EscritorPlacar:
+    """
+    Escreve os scores no MySQL em segundo plano.
+
+    - Usa um pool de conexoes persistente (nada de connect() por score).
+    - Junta os pendentes num INSERT de varias linhas.
+    - Se o banco cair ou nao estiver utilizavel (conexao, banco/tabela que
+      nao existe, sem permissao para o ALTER...), os scores ficam no spool e
+      sao reenviados com backoff exponencial quando ele voltar.
+    - So quando o problema e o dado (IntegrityError, DataError) o lote e
+      enviado linha a linha e as recusadas vao para a tabela 'rejeitados'
+      do spool, para nao travar os scores que vem depois delas.
+    - A thread (e o import do mysql.connector) so comeca no primeiro score,
+      ou logo de cara se o spool tiver pendentes de execucoes anteriores.
+
+    estado: "aguardando" -> "carregando" -> "pronto" / "fora do ar" (ou "sem conector")
+    """
+
+    def __init__(self, db_config, caminho_spool="spool_placar.db", tamanho_lote=50,
+                 backoff_inicial=1.0, backoff_max=30.0):
+        self.db_config = db_config
+        self.tamanho_lote = tamanho_lote
+        self.backoff_inicial = backoff_inicial
+        self.backoff_max = backoff_max
+
+        self.spool = SpoolLocal(caminho_spool)
+        self.estado = "aguardando"
+        self._mysql = None
+        self._pool = None
+        self._erros_linha = () # (IntegrityError, DataError), depois do import
+        self._banco_fora = False # So avisa uma vez por queda
+        self.rejeitados = 0
+
+        self._acordar = threading.Event()
+        self._rodando = True
+        self._thread = None
+        self._lock_thread = threading.Lock()
+        self._thread_terminou = False
+        self._fechar_spool_ao_sair = False # encerrar() desistiu de esperar: a thread fecha o spool
+
+        pendentes = self.spool.quantidade()
+        if pendentes:
+            print(f"Spool: {pendentes} score(s) pendente(s) de execucoes anteriores serao reenviados.")
+            self._iniciar()
+
+    def _iniciar(self):
+        with self._lock_thread:
+            if self._thread is None and self._rodando:
+                self.estado = "carregando"
+                self._thread = threading.Thread(target=self._loop_escrita, name="escritor-placar", daemon=True)
+                self._thread.start()
+
+    def registrar(self, score, image_filename, thumb_path=None, web_path=None, video_path=None):
+        """Grava no spool (duravel) e acorda a thread de escrita."""
+        created_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.spool.adicionar(score, image_filename, created_at, thumb_path, web_path, video_path)
+        self._iniciar()
+        self._acordar.set()
+
+    def _obter_conexao(self):
+        if self._pool is None:
+            pool = self._mysql.pooling.MySQLConnectionPool(pool_name="placar", pool_size=2, **self.db_config)
+            cnx = pool.get_connection()
+            try:
+                cursor = cnx.cursor()
+                garantir_colunas_derivados(cursor)
+                cursor.close()
+            finally:
+                cnx.close()
+            self._pool = pool # So depois da migracao: se o ALTER falhar, tenta de novo na proxima vez
+        return self._pool.get_connection()
+
+    def _enviar_lote(self, lote):
+        cnx = self._obter_conexao()
+        try:
+            cursor = cnx.cursor()
+            valores = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(lote))
+            sql = ("INSERT INTO highscores (score, image_path, created_at, thumb_path, web_path, video_path) "
+                   f"VALUES {valores}")
+            dados = []
+            for _, score, image_path, created_at, thumb_path, web_path, video_path in lote:
+                dados.extend((score, image_path, created_at, thumb_path, web_path, video_path))
+            cursor.execute(sql, dados)
+            cnx.commit()
+            cursor.close()
+        finally:
+            cnx.close() # Devolve para o pool
+
+    def _descarregar(self):
+        """Envia tudo que estiver no spool. Retorna False se o banco falhou."""
+        while True:
+            lote = self.spool.proximos(self.tamanho_lote)
+            if not lote:
+                return True
+            try:
+                self._enviar_lote(lote)
+            except self._erros_linha:
+                # O banco recusou algum dado do lote: acha a(s) linha(s) ruim(ns)
+                if not self._enviar_uma_a_uma(lote):
+                    return False
+                continue
+            except self._mysql.Error as err:
+                self._banco_caiu(err)
+                return False
+            self._enviado(lote)
+
+    def _enviar_uma_a_uma(self, lote):
+        for linha in lote:
+            try:
+                self._enviar_lote([linha])
+            except self._erros_linha as err:
+                self.spool.rejeitar(linha, str(err))
+                self.rejeitados += 1
+                print(f"❌ Score {linha[1]} ({linha[2]}) recusado pelo MySQL: {err}. "
+                      f"Guardado na tabela 'rejeitados' de '{self.spool.caminho}'.")
+                continue
+            except self._mysql.Error as err:
+                self._banco_caiu(err)
+                return False
+            self._enviado([linha])
+        return True
+
+    def _enviado(self, lote):
+        self.spool.remover([linha[0] for linha in lote])
+        self.estado = "pronto"
+        if self._banco_fora:
+            print("✅ Banco de dados voltou! Reenviando scores do spool.")
+            self._banco_fora = False
+        for _, score, image_path, *_ in lote:
+            print(f"✅ SUCESSO! Score {score} e imagem {image_path} salvos no banco de dados.")
+
+    def _banco_caiu(self, err):
+        if not self._banco_fora:
+            print(f"❌ ERRO AO INSERIR NO MYSQL: {err}")
+            print("Verifique se o XAMPP (MySQL) esta rodando e se o banco/tabela existem. "
+                  "Os scores ficam guardados no spool local.")
+        self._banco_fora = True
+        self.estado = "fora do ar"
+        self._pool = None # Recria o pool na proxima tentativa
+
+    def _loop_escrita(self):
+        try:
+            self._escrever()
+        finally:
+            with self._lock_thread:
+                self._thread_terminou = True
+                fechar = self._fechar_spool_ao_sair
+            if fechar:
+                self.spool.fechar()
+
+    def _escrever(self):
+        try:
+            self._mysql = importar_conector()
+        except ImportError:
+            print("----------------------------------------------------")
+            print("AVISO: mysql-connector-python nao encontrado.")
+            print("O app vai rodar, mas NAO VAI SALVAR scores no banco (ficam no spool local).")
+            print("Para instalar, rode: python -m pip install mysql-connector-python")
+            print("----------------------------------------------------")
+            self.estado = "sem conector"
+            return
+        erros = self._mysql.errors
+        self._erros_linha = (erros.IntegrityError, erros.DataError) # O resto (conexao, schema, permissao): backoff
+
+        backoff = self.backoff_inicial
+        while self._rodando:
+            if self._descarregar():
+                backoff = self.backoff_inicial
+                self._acordar.wait(timeout=5.0)
+                self._acordar.clear()
+            else:
+                # Banco fora: novos scores nao encurtam o backoff (so o encerrar)
+                limite = time.monotonic() + backoff
+                while self._rodando and time.monotonic() < limite:
+                    self._acordar.wait(timeout=limite - time.monotonic())
+                    self._acordar.clear()
+                backoff = min(backoff * 2, self.backoff_max)
+
+    def encerrar(self):
+        """Ultima tentativa de envio; o que sobrar fica no spool para a proxima execucao."""
+        with self._lock_thread:
+            self._rodando = False
+        self._acordar.set()
+        thread_viva = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            with self._lock_thread:
+                # Ainda no meio de um envio (MySQL lento): o spool continua dela, que fecha ao terminar
+                thread_viva = not self._thread_terminou
+                self._fechar_spool_ao_sair = thread_viva
+            if not thread_viva and self._mysql is not None and not self._banco_fora:
+                self._descarregar()
+            self._thread = None
+        if self.rejeitados:
+            print(f"Spool: {self.rejeitados} score(s) recusados pelo MySQL estao na tabela 'rejeitados'.")
+        if thread_viva:
+            print(f"Spool: envio ao MySQL ainda em andamento; o que nao for enviado fica em '{self.spool.caminho}'.")
+            return
+        pendentes = self.spool.quantidade()
+        if pendentes:
+            print(f"Spool: {pendentes} score(s) ficaram guardados em '{self.spool.caminho}'.")
+        self.spool.fechar()
@@ -0,0 +1,107 @@
+"""
+Buffers de frame pre-alocados, para o loop nao alocar um 1280x720x3 novo a
+cada etapa (flip, cvtColor, resize, leitura da camera...). Quem precisa de
+um buffer pede ao pool e passa para o OpenCV via dst=:
+
+    img = cv2.flip(img_raw, 1, dst=pool.obter(img_raw.shape))
+
+O buffer volta para o pool sozinho quando ninguem mais usa: o pool olha a
+contagem de referencias (sys.getrefcount) e so reaproveita um array que
+so ele segura. Quem guarda o frame (fila do salvamento, gravador, frame
+pendente da inferencia) simplesmente segura a referencia, e o pool cria
+outro enquanto isso. Depois do aquecimento, o pool ja tem buffers
+suficientes e nao aloca mais nada.
+
+--alocacoes liga o ContadorAlocacoes, que conta quadros inteiros alocados
+por frame (dentro ou fora do pool) e avisa quando algum frame alocar.
+"""
+import sys
+import threading
+import tracemalloc
+
+import numpy as np
+
+
+class PoolFrames:
+    def __init__(self):
+        self._buffers = {} # (forma, dtype) -> [arrays]
+        self._lock = threading.Lock()
+        self.alocacoes = 0 # Buffers criados (cresce no aquecimento, depois deveria parar)
+
+    def obter(self, forma, dtype=np.uint8):
+        """Buffer livre (conteudo indefinido) com essa forma; cria um se todos estiverem em uso."""
+        chave = (tuple(forma), np.dtype(dtype))
+        with self._lock:
+            lista = self._buffers.setdefault(chave, [])
+            for i in range(len(lista)):
+                # 2 = a lista + o argumento do getrefcount: ninguem mais (nem uma view) usa este buffer
+                if sys.getrefcount(lista[i]) == 2:
+                    return lista[i]
+            buffer = np.empty(chave[0], chave[1])
+            lista.append(buffer)
+            self.alocacoes += 1
+            return buffer
+
+    def estatisticas(self):
+        with self._lock:
+            return {"buffers": sum(len(lista) for lista in self._buffers.values()),
+                    "formas": len(self._buffers), "alocacoes": self.alocacoes}
+
+
+class ContadorAlocacoes:
+    """
+    Modo de depuracao: quantos quadros inteiros foram alocados em cada frame.
+
+    Usa o tracemalloc (o numpy e o OpenCV registram os dados dos arrays nele):
+    o pico de memoria durante o frame, acima do que havia no comeco, dividido
+    pelo tamanho de um quadro. Pega tanto o pool crescendo quanto um .copy()
+    ou cvtColor sem dst= esquecido, em qualquer thread. Alocacoes que nascem
+    e morrem uma depois da outra contam uma vez so, entao o numero e um piso,
+    mas um loop sem alocacoes fica em zero. Avisos pontuais sao esperados na
+    primeira visita a cada tela (widgets renderizados uma vez, interface.py)
+    e quando uma foto e salva; um aviso a cada frame e regressao.
+
+    O tracemalloc deixa o Python mais lento: so para depuracao.
+    """
+
+    def __init__(self, bytes_quadro, aquecimento=60, ativo=False):
+        self.bytes_quadro = bytes_quadro
+        self.aquecimento = aquecimento # Frames iniciais (pool crescendo) que nao geram aviso
+        self.ativo = False
+        self.frames = 0
+        self.frames_com_alocacao = 0 # Depois do aquecimento
+        self.total = 0
+        self.maximo = 0
+        self._inicio = 0
+        if ativo:
+            self.ativar()
+
+    def ativar(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.ativo = True
+
+    def novo_frame(self):
+        if not self.ativo:
+            return
+        tracemalloc.reset_peak()
+        self._inicio = tracemalloc.get_traced_memory()[0]
+
+    def fim_frame(self):
+        """Retorna quantos quadros foram alocados neste frame (0 desligado)."""
+        if not self.ativo:
+            return 0
+        pico = tracemalloc.get_traced_memory()[1]
+        quadros = int(round((pico - self._inicio) / self.bytes_quadro))
+        self.frames += 1
+        if self.frames > self.aquecimento and quadros:
+            self.frames_com_alocacao += 1
+            self.total += quadros
+            self.maximo = max(self.maximo, quadros)
+            print(f"Alocacoes: frame {self.frames} alocou ~{quadros} quadro(s) "
+                  f"({(pico - self._inicio) / 1e6:.1f} MB no pico)")
+        return quadros
+
+    def resumo(self):
+        return (f"{self.frames_com_alocacao} de {max(0, self.frames - self.aquecimento)} frames alocaram "
+                f"(total ~{self.total} quadros, max {self.maximo} por frame; aquecimento {self.aquecimento} frames)")
@@ -0,0 +1,155 @@
+"""
+Cache dos assets ja processados (Sprite de sprites.py: passaro, canos e moldura).
+
+Sem cache, toda inicializacao faz imread + resize + a analise de alfa de
+cada PNG. Com cache, cada asset vira uma pasta em cache_assets/ com os
+arrays em .npy e um meta.json; a chave e o hash do PNG + o tamanho pedido
+(+ VERSAO, se o formato dos arrays mudar). Os .npy sao abertos com
+np.load(mmap_mode='r'): carregar e quase instantaneo e as cabines do
+quiosques.py no mesmo PC dividem as mesmas paginas de memoria.
+
+Trocou um PNG em assets/? O hash muda, a entrada e refeita sozinha e a
+antiga e apagada.
+
+    python cache_assets.py            # compara a inicializacao com e sem cache
+    python cache_assets.py --limpar   # apaga o cache
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+
+import cv2
+import numpy as np
+
+from sprites import Sprite
+
+VERSAO = 2 # Mude se Sprite.estado() mudar
+PASTA_PADRAO = "cache_assets"
+TIPOS = {"sprite": Sprite}
+
+
+def hash_arquivo(caminho):
+    with open(caminho, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def ler_png(caminho, tamanho):
+    """PNG com alfa, redimensionado para tamanho=(largura, altura)."""
+    imagem = cv2.imread(caminho, -1)
+    if imagem is None:
+        raise IOError(f"Nao foi possivel carregar '{caminho}'")
+    if tamanho is not None and (imagem.shape[1], imagem.shape[0]) != tuple(tamanho):
+        imagem = cv2.resize(imagem, tuple(tamanho))
+    return imagem
+
+
+class CacheAssets:
+    def __init__(self, pasta=PASTA_PADRAO, ativo=True):
+        self.pasta = pasta
+        self.ativo = ativo
+        self.acertos = 0
+        self.gerados = 0
+        self.tempo = 0.0 # s gastos carregando / gerando
+
+    def sprite(self, caminho, tamanho=None):
+        return self._obter("sprite", caminho, tamanho)
+
+    def _obter(self, tipo, caminho, tamanho):
+        inicio = time.perf_counter()
+        classe = TIPOS[tipo]
+        try:
+            if not self.ativo:
+                return classe(ler_png(caminho, tamanho))
+
+            if not os.path.exists(caminho):
+                raise IOError(f"Nao foi possivel carregar '{caminho}'")
+            prefixo = f"{tipo}_{os.path.splitext(os.path.basename(caminho))[0]}_"
+            if tamanho is not None:
+                prefixo += f"{tamanho[0]}x{tamanho[1]}_"
+            entrada = os.path.join(self.pasta, f"{prefixo}v{VERSAO}_{hash_arquivo(caminho)[:16]}")
+
+            if os.path.isdir(entrada):
+                try:
+                    objeto = self._ler(classe, entrada)
+                    self.acertos += 1
+                    return objeto
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Cache de '{caminho}' invalido ({e}); refazendo.")
+                    shutil.rmtree(entrada, ignore_errors=True)
+
+            objeto = classe(ler_png(caminho, tamanho))
+            self._gravar(objeto, entrada, prefixo)
+            self.gerados += 1
+            # Le de volta do cache: o processo tambem passa a usar as paginas compartilhadas
+            return self._ler(classe, entrada)
+        finally:
+            self.tempo += time.perf_counter() - inicio
+
+    @staticmethod
+    def _ler(classe, entrada):
+        with open(os.path.join(entrada, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {nome: np.load(os.path.join(entrada, f"{nome}.npy"), mmap_mode="r") for nome in meta["arrays"]}
+        return classe.do_estado(arrays, meta)
+
+    def _gravar(self, objeto, entrada, prefixo):
+        """Grava numa pasta temporaria e renomeia (outra cabine pode estar gerando o mesmo asset)."""
+        os.makedirs(self.pasta, exist_ok=True)
+        temporaria = f"{entrada}.tmp{os.getpid()}"
+        os.makedirs(temporaria, exist_ok=True)
+        arrays, meta = objeto.estado()
+        meta["arrays"] = list(arrays)
+        for nome, array in arrays.items():
+            np.save(os.path.join(temporaria, f"{nome}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(temporaria, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        try:
+            os.rename(temporaria, entrada)
+        except OSError:
+            shutil.rmtree(temporaria, ignore_errors=True) # Outro processo chegou antes: vale o dele
+            return
+
+        # Versoes antigas do mesmo asset (PNG trocado ou VERSAO nova). So o prefixo nao basta:
+        # 'sprite_pipe_' tambem e o comeco de 'sprite_pipe_cima_...' e de 'sprite_pipe_150x600_...'
+        mesmo_asset = re.compile(re.escape(prefixo) + r"v\d+_[0-9a-f]{16}")
+        for nome in os.listdir(self.pasta):
+            antiga = os.path.join(self.pasta, nome)
+            if mesmo_asset.fullmatch(nome) and antiga != entrada:
+                shutil.rmtree(antiga, ignore_errors=True)
+
+    def resumo(self):
+        return f"{self.tempo * 1000:.1f} ms ({self.acertos} do cache, {self.gerados} gerado(s))"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache dos sprites (passaro, canos e moldura)")
+    parser.add_argument("--assets", default="assets")
+    parser.add_argument("--pasta", default=PASTA_PADRAO)
+    parser.add_argument("--limpar", action="store_true", help="apaga o cache e sai")
+    args = parser.parse_args()
+
+    if args.limpar:
+        shutil.rmtree(args.pasta, ignore_errors=True)
+        print(f"Cache '{args.pasta}' apagado.")
+        raise SystemExit
+
+    # Mesmos assets e tamanhos do flappyDedo.py
+    assets = [("sprite", "passaro.png", (85, 60)), ("sprite", "pipe_cima.png", (150, 600)),
+              ("sprite", "pipe_baixo.png", (150, 600)), ("sprite", "moldura_evento.png", (1280, 720))]
+
+    def carregar_todos(cache):
+        for tipo, nome, tamanho in assets:
+            getattr(cache, tipo)(os.path.join(args.assets, nome), tamanho)
+        return cache
+
+    sem = min(carregar_todos(CacheAssets(args.pasta, ativo=False)).tempo for _ in range(3))
+    shutil.rmtree(args.pasta, ignore_errors=True)
+    gerando = carregar_todos(CacheAssets(args.pasta)).tempo
+    com = min(carregar_todos(CacheAssets(args.pasta)).tempo for _ in range(3))
+    print(f"Sem cache:           {sem * 1000:7.1f} ms")
+    print(f"Gerando o cache:     {gerando * 1000:7.1f} ms (so na primeira vez / quando um PNG muda)")
+    print(f"Com cache (mmap):    {com * 1000:7.1f} ms ({sem / max(com, 1e-9):.0f}x)")
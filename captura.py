@@ -0,0 +1,123 @@
+import threading
+import time
+
+import cv2
+
+from buffers import PoolFrames
+
+
+class CapturaCamera:
+    """
+    Le a camera (cv2.VideoCapture) numa thread propria e guarda SEMPRE o frame
+    mais novo num slot unico. Frames antigos que ninguem leu sao descartados
+    (nao entram em fila), entao o loop principal nunca processa imagem velha.
+
+    Cada frame e lido direto num buffer do pool (cap.read(image=...)); o
+    buffer de um frame descartado volta para o pool sozinho.
+    """
+
+    def __init__(self, fonte=0, largura=1280, altura=720, fps=30, pool=None):
+        self.fonte = fonte
+        self.pool = pool if pool is not None else PoolFrames()
+        self.cap = cv2.VideoCapture(fonte)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, largura)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, altura)
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        # Pede para o driver nao acumular frames (nem todo backend respeita)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        # Slot unico: (frame, timestamp de captura, numero de sequencia)
+        self._frame = None
+        self._timestamp = 0.0
+        self._seq = 0
+        self._ok = True
+        self._cond = threading.Condition()
+
+        # Contadores
+        self.frames_capturados = 0
+        self.frames_descartados = 0 # sobrescritos antes de serem lidos
+        self.frames_duplicados = 0  # lidos de novo (a camera nao mandou um novo a tempo)
+        self._ultimo_seq_lido = 0
+
+        self._rodando = False
+        self._thread = None
+
+    def iniciar(self):
+        if self._rodando:
+            return self
+        self._rodando = True
+        self._thread = threading.Thread(target=self._loop_captura, name="captura-camera", daemon=True)
+        self._thread.start()
+        return self
+
+    def _loop_captura(self):
+        forma = None # So se sabe depois do primeiro frame (a camera pode ignorar a resolucao pedida)
+        while self._rodando:
+            if forma is None:
+                success, frame = self.cap.read()
+            else:
+                # Se a camera mudar de resolucao, o OpenCV aloca outro e a forma e atualizada abaixo
+                success, frame = self.cap.read(image=self.pool.obter(forma))
+            if success:
+                forma = frame.shape
+            timestamp = time.monotonic()
+
+            with self._cond:
+                if not success:
+                    self._ok = False
+                    self._cond.notify_all()
+                    break
+
+                # Se o frame anterior nao foi lido, ele e descartado
+                if self._seq > self._ultimo_seq_lido:
+                    self.frames_descartados += 1
+
+                self._frame = frame
+                self._timestamp = timestamp
+                self._seq += 1
+                self.frames_capturados += 1
+                self._cond.notify_all()
+
+        self._rodando = False
+
+    def ler(self, timeout=0.1):
+        """
+        Retorna (success, frame, timestamp, seq) com o frame mais novo.
+        Espera ate 'timeout' segundos por um frame que ainda nao foi lido;
+        se nao chegar, devolve o ultimo de novo (conta como duplicado).
+        """
+        with self._cond:
+            if self._ok and self._seq <= self._ultimo_seq_lido:
+                self._cond.wait_for(lambda: self._seq > self._ultimo_seq_lido or not self._ok, timeout)
+
+            if self._frame is None:
+                return self._ok, None, 0.0, 0
+
+            if self._seq == self._ultimo_seq_lido:
+                self.frames_duplicados += 1
+            self._ultimo_seq_lido = self._seq
+            return self._ok, self._frame, self._timestamp, self._seq
+
+    def aguardar_frame(self, timeout, depois_de=0.0):
+        """
+        Espera ate 'timeout' s por um frame ainda nao lido capturado a partir de
+        'depois_de' (time.monotonic), sem pegar ele. True se chegou (ou a camera parou).
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: (self._seq > self._ultimo_seq_lido and self._timestamp >= depois_de) or not self._ok, timeout)
+
+    def estatisticas(self):
+        with self._cond:
+            return {
+                "capturados": self.frames_capturados,
+                "descartados": self.frames_descartados,
+                "duplicados": self.frames_duplicados,
+            }
+
+    def parar(self):
+        self._rodando = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.cap.release()
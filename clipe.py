@@ -0,0 +1,214 @@
+"""
+Clipe da partida do Flappy Dedo (alem da foto do game over).
+
+Enquanto o jogo roda, os ultimos 'segundos' de frames renderizados ficam na
+memoria ja comprimidos em JPEG (anel de tamanho fixo: ~120 JPEGs pequenos,
+alguns MB). No game over o anel vai para a thread do codificador, que grava
+o video em fotos/ ao lado da foto (mesmo nome, .mp4 ou .avi), com arquivo
+temporario + rename como as fotos. O nome vai para o banco (video_path)
+junto com a foto; a galeria so mostra o link quando o arquivo ja existe.
+
+O loop principal so reduz o frame para um buffer do pool e entrega:
+- a compressao JPEG e a codificacao do video rodam em threads proprias;
+- se a compressao atrasar, o frame e descartado (frames_descartados);
+- se ja houver clipes demais esperando o codificador, o clipe novo e
+  descartado (clipes_descartados) e a foto vai para o banco sem video.
+"""
+import os
+import queue
+import threading
+from collections import deque
+
+import cv2
+
+from buffers import PoolFrames
+
+# Em ordem de preferencia: H.264 toca em qualquer navegador, mas nem todo
+# OpenCV tem; o MJPEG em .avi sempre funciona
+CODECS = (("avc1", ".mp4"), ("mp4v", ".mp4"), ("MJPG", ".avi"))
+
+
+def escolher_codec(pasta, tamanho, fps):
+    """Primeiro (fourcc, extensao) de CODECS que o OpenCV desta maquina consegue gravar."""
+    for fourcc, extensao in CODECS:
+        teste = os.path.join(pasta, f".teste_codec{extensao}")
+        escritor = cv2.VideoWriter(teste, cv2.VideoWriter_fourcc(*fourcc), fps, tamanho)
+        ok = escritor.isOpened()
+        escritor.release()
+        if os.path.exists(teste):
+            os.remove(teste)
+        if ok:
+            return fourcc, extensao
+    return None, None
+
+
+class GravadorClipe:
+    def __init__(self, pasta, segundos=8, fps=15, tamanho=(640, 360), qualidade_jpeg=75,
+                 max_clipes_pendentes=2, pool=None):
+        self.pasta = pasta
+        self.fps = fps
+        self.tamanho = tamanho # (largura, altura) do video
+        self.qualidade_jpeg = qualidade_jpeg
+        self.max_clipes_pendentes = max_clipes_pendentes
+        self.pool = pool if pool is not None else PoolFrames()
+        os.makedirs(self.pasta, exist_ok=True)
+
+        self.fourcc = None # Escolhidos pela thread do codificador (escolher_codec)
+        self.extensao = None
+        self._codec_pronto = threading.Event()
+
+        self._anel = deque(maxlen=int(segundos * fps)) # (jpeg, relogio); so a thread de compressao mexe
+        self._fila_compressao = queue.Queue() # Frames (limitados no adicionar) e as marcas "fim" / "limpar"
+        self._limite_compressao = 2
+        self._fila_codificacao = queue.Queue() # Limitada pelo max_clipes_pendentes
+        self._proximo_relogio = None # Amostragem em 'fps' (o jogo roda a 30)
+        self._frames_no_clipe = 0
+        self._pendentes = 0 # Clipes entregues que o codificador ainda nao terminou
+        self._lock = threading.Lock()
+
+        self.frames_descartados = 0
+        self.clipes_gravados = 0
+        self.clipes_descartados = 0
+        self.clipes_com_erro = 0
+
+        self._thread_compressao = threading.Thread(target=self._loop_compressao, name="clipe-compressao", daemon=True)
+        self._thread_compressao.start()
+        self._thread_codificacao = threading.Thread(target=self._loop_codificacao, name="clipe-codificacao", daemon=True)
+        self._thread_codificacao.start()
+
+    # ------------------- Loop principal -------------------
+    def adicionar(self, img, relogio):
+        """Frame renderizado do jogo. Nunca espera: se a compressao estiver atrasada, descarta."""
+        if self._codec_pronto.is_set() and self.fourcc is None:
+            return # Sem codec: clipes desligados
+        periodo = 1.0 / self.fps
+        if self._proximo_relogio is not None and relogio < self._proximo_relogio:
+            return
+        if self._proximo_relogio is None or relogio - self._proximo_relogio > periodo:
+            self._proximo_relogio = relogio + periodo
+        else:
+            self._proximo_relogio += periodo
+
+        if self._fila_compressao.qsize() >= self._limite_compressao:
+            self.frames_descartados += 1
+            return
+        # A 'img' e reaproveitada no proximo frame: o resize ja copia (e reduz) para um buffer do pool
+        forma = (self.tamanho[1], self.tamanho[0], 3)
+        pequeno = cv2.resize(img, self.tamanho, dst=self.pool.obter(forma), interpolation=cv2.INTER_AREA)
+        self._fila_compressao.put(("frame", pequeno, relogio))
+        self._frames_no_clipe += 1
+
+    def reiniciar(self):
+        """Partida nova: o que estava no anel nao entra no proximo clipe."""
+        self._proximo_relogio = None
+        if self._frames_no_clipe:
+            self._frames_no_clipe = 0
+            self._fila_compressao.put(("limpar",))
+
+    def finalizar(self, nome_foto):
+        """
+        Fecha o clipe da partida (chamar no game over). Retorna o nome do
+        video (mesma base da foto) para ir ao banco, ou None se nao houver clipe.
+        """
+        self._proximo_relogio = None
+        if not self._frames_no_clipe or not self._codec_pronto.is_set() or self.fourcc is None:
+            return None
+        self._frames_no_clipe = 0
+        with self._lock:
+            if self._pendentes >= self.max_clipes_pendentes:
+                self.clipes_descartados += 1
+                self._fila_compressao.put(("limpar",))
+                print(f"Aviso: codificador de clipes atrasado, clipe de {nome_foto} descartado.")
+                return None
+            self._pendentes += 1
+        nome_video = os.path.splitext(nome_foto)[0] + self.extensao
+        self._fila_compressao.put(("fim", nome_video))
+        return nome_video
+
+    # ------------------- Threads -------------------
+    def _loop_compressao(self):
+        while True:
+            item = self._fila_compressao.get()
+            if item is None:
+                break
+            if item[0] == "frame":
+                ok, jpeg = cv2.imencode(".jpg", item[1], [cv2.IMWRITE_JPEG_QUALITY, self.qualidade_jpeg])
+                if ok:
+                    self._anel.append((jpeg, item[2]))
+            elif item[0] == "fim":
+                self._fila_codificacao.put((item[1], list(self._anel)))
+                self._anel.clear()
+            else: # "limpar"
+                self._anel.clear()
+            del item # Devolve o buffer ao pool antes de esperar o proximo
+
+    def _loop_codificacao(self):
+        self.fourcc, self.extensao = escolher_codec(self.pasta, self.tamanho, self.fps)
+        if self.fourcc is None:
+            print("Aviso: nenhum codec de video disponivel no OpenCV; clipes do jogo desligados.")
+        self._codec_pronto.set()
+
+        while True:
+            item = self._fila_codificacao.get()
+            if item is None:
+                break
+            nome_video, frames = item
+            try:
+                if self._gravar(nome_video, frames):
+                    self.clipes_gravados += 1
+                    print(f"Clipe salvo em: {os.path.join(self.pasta, nome_video)}")
+                else:
+                    self.clipes_descartados += 1
+            except Exception as e:
+                self.clipes_com_erro += 1
+                print(f"❌ ERRO ao gravar o clipe {nome_video}: {e}")
+            finally:
+                with self._lock:
+                    self._pendentes -= 1
+
+    def _gravar(self, nome_video, frames):
+        """Grava o clipe (tmp + fsync + replace). False se nao havia frame nenhum."""
+        if not frames:
+            # Ex: a partida acabou antes do primeiro frame passar pela compressao
+            print(f"Aviso: clipe {nome_video} sem nenhum frame, nada gravado.")
+            return False
+        caminho = os.path.join(self.pasta, nome_video)
+        # A extensao fica no fim: o VideoWriter escolhe o container por ela
+        temporario = os.path.join(self.pasta, f".{os.path.splitext(nome_video)[0]}.tmp{self.extensao}")
+        escritor = cv2.VideoWriter(temporario, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, self.tamanho)
+        if not escritor.isOpened():
+            raise IOError(f"nao foi possivel abrir o VideoWriter ({self.fourcc})")
+        try:
+            # Tempo real: a cada 1/fps entra o frame mais recente ate ali
+            # (repete se faltou frame descartado, pula se veio mais de um)
+            periodo = 1.0 / self.fps
+            t, fim = frames[0][1], frames[-1][1]
+            i, jpeg_atual, quadro = 0, None, None
+            while t <= fim + 1e-6:
+                while i < len(frames) and frames[i][1] <= t + 1e-6:
+                    jpeg_atual = frames[i][0]
+                    i += 1
+                    quadro = None
+                if quadro is None:
+                    quadro = cv2.imdecode(jpeg_atual, cv2.IMREAD_COLOR)
+                escritor.write(quadro)
+                t += periodo
+        finally:
+            escritor.release()
+        with open(temporario, "r+b") as f:
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+        return True
+
+    # ------------------- Fim -------------------
+    def estatisticas(self):
+        return {"gravados": self.clipes_gravados, "descartados": self.clipes_descartados,
+                "com_erro": self.clipes_com_erro, "frames_descartados": self.frames_descartados,
+                "codec": self.fourcc}
+
+    def encerrar(self):
+        """Espera os clipes que ja estavam na fila (chamar antes de sair)."""
+        self._fila_compressao.put(None)
+        self._thread_compressao.join()
+        self._fila_codificacao.put(None)
+        self._thread_codificacao.join()
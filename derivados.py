@@ -0,0 +1,154 @@
+"""
+Versoes menores das fotos para a galeria (a original de 1280x720 fica so para baixar).
+
+Para cada fotos/<nome>.jpg:
+    fotos/miniaturas/<nome>.webp + .jpg   (320 px de largura; tabelas e listas)
+    fotos/web/<nome>.webp + .jpg          (960 px; podio e lightbox)
+
+O banco guarda o caminho do JPEG (relativo a fotos/); o WebP tem o mesmo nome
+com outra extensao e a galeria usa <picture> com o JPEG de reserva.
+
+Fotos que ja existiam (processa em paralelo, pula o que ja esta em dia):
+
+    python derivados.py [fotos] [--processos N] [--forcar] [--sem-banco]
+
+Depois grava os caminhos no highscores e no snapshot da galeria (placar.json),
+senao as paginas continuariam mostrando a original.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from banco import DB_CONFIG, garantir_colunas_derivados
+from placar import CAMINHO_PADRAO, PlacarMemoria
+from salvamento import gravar_atomico
+
+TAMANHOS = {"miniaturas": 320, "web": 960} # pasta -> largura
+EXTENSOES_FOTO = (".jpg", ".jpeg", ".png") # Originais aceitos em fotos/
+QUALIDADE_WEBP = 80
+QUALIDADE_JPEG = 85
+
+
+def caminhos_derivados(nome_arquivo):
+    """{'miniaturas': 'miniaturas/x.jpg', 'web': 'web/x.jpg'} (relativos a pasta das fotos)."""
+    base = os.path.splitext(nome_arquivo)[0]
+    return {pasta: f"{pasta}/{base}.jpg" for pasta in TAMANHOS}
+
+
+def em_dia(pasta_fotos, nome_arquivo):
+    """True se todos os derivados existem e sao mais novos que a original."""
+    try:
+        original = os.stat(os.path.join(pasta_fotos, nome_arquivo)).st_mtime
+        for relativo in caminhos_derivados(nome_arquivo).values():
+            for caminho in (relativo, relativo[:-4] + ".webp"):
+                if os.stat(os.path.join(pasta_fotos, caminho)).st_mtime < original:
+                    return False
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def gerar_derivados(imagem, pasta_fotos, nome_arquivo):
+    """
+    Gera miniatura e versao web (WebP + JPEG) da imagem ja pronta (com moldura).
+    Retorna o dict de caminhos_derivados.
+    """
+    caminhos = caminhos_derivados(nome_arquivo)
+    altura, largura = imagem.shape[:2]
+    # Do maior para o menor: cada reducao parte da anterior (menos pixels para ler)
+    origem = imagem
+    for pasta, largura_alvo in sorted(TAMANHOS.items(), key=lambda item: -item[1]):
+        if largura_alvo < largura:
+            tamanho = (largura_alvo, round(altura * largura_alvo / largura))
+            origem = cv2.resize(origem, tamanho, interpolation=cv2.INTER_AREA)
+        os.makedirs(os.path.join(pasta_fotos, pasta), exist_ok=True)
+        relativo = caminhos[pasta]
+        for extensao, parametros in ((".webp", [cv2.IMWRITE_WEBP_QUALITY, QUALIDADE_WEBP]),
+                                     (".jpg", [cv2.IMWRITE_JPEG_QUALITY, QUALIDADE_JPEG])):
+            ok, dados = cv2.imencode(extensao, origem, parametros)
+            if not ok:
+                raise IOError(f"cv2.imencode({extensao}) falhou")
+            gravar_atomico(os.path.join(pasta_fotos, relativo[:-4] + extensao), dados.tobytes())
+    return caminhos
+
+
+# ------------------- Reprocessamento em lote -------------------
+def _processar_arquivo(pasta_fotos, nome_arquivo, forcar):
+    if not forcar and em_dia(pasta_fotos, nome_arquivo):
+        return nome_arquivo, None, "em dia"
+    imagem = cv2.imread(os.path.join(pasta_fotos, nome_arquivo), cv2.IMREAD_COLOR)
+    if imagem is None:
+        return nome_arquivo, None, "ilegivel"
+    return nome_arquivo, gerar_derivados(imagem, pasta_fotos, nome_arquivo), "gerado"
+
+
+def listar_fotos(pasta_fotos):
+    with os.scandir(pasta_fotos) as entradas:
+        for entrada in entradas:
+            if entrada.is_file() and entrada.name.lower().endswith(EXTENSOES_FOTO) and not entrada.name.startswith("."):
+                yield entrada.name
+
+
+def atualizar_banco(db_config, linhas, tamanho_lote=200):
+    """Grava miniatura/web das fotos reprocessadas nas linhas do highscores."""
+    import mysql.connector
+
+    cnx = mysql.connector.connect(**db_config)
+    try:
+        cursor = cnx.cursor()
+        garantir_colunas_derivados(cursor)
+        sql = "UPDATE highscores SET thumb_path = %s, web_path = %s WHERE image_path = %s"
+        for i in range(0, len(linhas), tamanho_lote):
+            cursor.executemany(sql, linhas[i:i + tamanho_lote])
+            cnx.commit()
+        cursor.close()
+    finally:
+        cnx.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera miniaturas e versoes web das fotos existentes")
+    parser.add_argument("pasta", nargs="?", default="fotos")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(), help="processos em paralelo")
+    parser.add_argument("--forcar", action="store_true", help="refaz mesmo o que ja esta em dia")
+    parser.add_argument("--sem-banco", action="store_true", help="nao grava os caminhos no highscores")
+    parser.add_argument("--placar", default=CAMINHO_PADRAO, help="snapshot da galeria a atualizar")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    contagem = {"gerado": 0, "em dia": 0, "ilegivel": 0}
+    linhas = []
+    with ProcessPoolExecutor(max_workers=args.processos) as executor:
+        # chunksize: muitos arquivos pequenos, menos idas e voltas entre processos
+        nomes = list(listar_fotos(args.pasta))
+        resultados = executor.map(_processar_arquivo, [args.pasta] * len(nomes), nomes,
+                                  [args.forcar] * len(nomes), chunksize=16)
+        for nome, caminhos, situacao in resultados:
+            contagem[situacao] += 1
+            if situacao == "ilegivel":
+                print(f"Aviso: nao foi possivel ler '{nome}'.")
+            if situacao != "ilegivel":
+                caminhos = caminhos or caminhos_derivados(nome)
+                linhas.append((caminhos["miniaturas"], caminhos["web"], nome))
+
+    print(f"{len(nomes)} foto(s) em {time.perf_counter() - inicio:.1f}s: {contagem['gerado']} gerada(s), "
+          f"{contagem['em dia']} ja em dia, {contagem['ilegivel']} ilegivel(is).")
+
+    if not linhas:
+        return
+    if not args.sem_banco:
+        try:
+            atualizar_banco(DB_CONFIG, linhas)
+            print(f"{len(linhas)} linha(s) do highscores atualizada(s).")
+        except Exception as e:
+            print(f"Aviso: nao foi possivel atualizar o banco ({e}); rode de novo quando ele voltar.")
+    if os.path.exists(args.placar):
+        PlacarMemoria(args.placar).completar_derivados({nome: (miniatura, web) for miniatura, web, nome in linhas})
+        print(f"Snapshot da galeria atualizado ({args.placar}).")
+
+
+if __name__ == "__main__":
+    main()
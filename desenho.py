@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+
+
+class CanvasDesenho:
+    """
+    Canvas da tela de DESENHO com mascara de tinta incremental.
+
+    - Cada traco (cv2.line) marca um retangulo sujo.
+    - So os retangulos sujos tem a mascara recalculada (pixel != branco).
+    - A tela e dividida em blocos; so blocos com tinta sao compostos na
+      imagem da camera. Canvas vazio = custo quase zero.
+    """
+
+    BRANCO = (255, 255, 255)
+
+    def __init__(self, largura, altura, tamanho_bloco=80):
+        self.largura = largura
+        self.altura = altura
+        self.bloco = tamanho_bloco
+        self.canvas = np.full((altura, largura, 3), 255, np.uint8) # Canvas Branco
+        self.mascara = np.zeros((altura, largura), bool)           # True = tem tinta
+        self.blocos_y = (altura + tamanho_bloco - 1) // tamanho_bloco
+        self.blocos_x = (largura + tamanho_bloco - 1) // tamanho_bloco
+        self.blocos_com_tinta = np.zeros((self.blocos_y, self.blocos_x), bool)
+        self.retangulos_sujos = []
+
+    def limpar(self):
+        self.canvas.fill(255)
+        self.mascara.fill(False)
+        self.blocos_com_tinta.fill(False)
+        self.retangulos_sujos.clear()
+
+    def linha(self, p1, p2, cor, espessura):
+        cv2.line(self.canvas, p1, p2, cor, espessura)
+        margem = espessura // 2 + 2
+        x1 = max(0, min(p1[0], p2[0]) - margem)
+        y1 = max(0, min(p1[1], p2[1]) - margem)
+        x2 = min(self.largura, max(p1[0], p2[0]) + margem + 1)
+        y2 = min(self.altura, max(p1[1], p2[1]) + margem + 1)
+        if x1 < x2 and y1 < y2:
+            self.retangulos_sujos.append((x1, y1, x2, y2))
+
+    def _atualizar_mascara(self):
+        b = self.bloco
+        for x1, y1, x2, y2 in self.retangulos_sujos:
+            # Recalcula a mascara so no retangulo do traco
+            roi = self.canvas[y1:y2, x1:x2]
+            np.any(roi != 255, axis=2, out=self.mascara[y1:y2, x1:x2])
+
+            # Reavalia os blocos tocados (a borracha pode ter zerado algum)
+            for by in range(y1 // b, (y2 - 1) // b + 1):
+                for bx in range(x1 // b, (x2 - 1) // b + 1):
+                    self.blocos_com_tinta[by, bx] = self.mascara[by * b:(by + 1) * b, bx * b:(bx + 1) * b].any()
+        self.retangulos_sujos.clear()
+
+    def compor(self, img):
+        """Copia a tinta do canvas para a imagem (no lugar) e retorna a imagem."""
+        if self.retangulos_sujos:
+            self._atualizar_mascara()
+
+        b = self.bloco
+        for by in np.flatnonzero(self.blocos_com_tinta.any(axis=1)):
+            linha = self.blocos_com_tinta[by]
+            y1, y2 = by * b, min(self.altura, (by + 1) * b)
+            # Junta blocos vizinhos com tinta numa faixa so
+            bx = 0
+            while bx < self.blocos_x:
+                if not linha[bx]:
+                    bx += 1
+                    continue
+                inicio = bx
+                while bx < self.blocos_x and linha[bx]:
+                    bx += 1
+                x1, x2 = inicio * b, min(self.largura, bx * b)
+                np.copyto(img[y1:y2, x1:x2], self.canvas[y1:y2, x1:x2],
+                          where=self.mascara[y1:y2, x1:x2, None])
+        return img
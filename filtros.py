@@ -0,0 +1,249 @@
+"""
+Filtros do cursor (ponta do indicador da mao de navegacao).
+
+Todos tem a mesma interface: filtrar((x, y), t) -> (x, y) e reiniciar().
+'t' e o timestamp do landmark (captura do frame), em segundos; os filtros so
+devem ser chamados quando chega landmark NOVO (nao a cada frame desenhado).
+
+Modo de medicao (compara filtros em tracos gravados ou sinteticos):
+
+    python filtros.py sessao.sessao
+    python filtros.py --sintetico
+"""
+import argparse
+import math
+
+import numpy as np
+
+
+class FiltroEMA:
+    """O filtro antigo (EMA_ALPHA fixo por amostra), mantido para comparacao."""
+
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.reiniciar()
+
+    def reiniciar(self):
+        self._ultimo = None
+
+    def filtrar(self, ponto, t):
+        if self._ultimo is None:
+            self._ultimo = (float(ponto[0]), float(ponto[1]))
+        else:
+            a = self.alpha
+            self._ultimo = (a * ponto[0] + (1 - a) * self._ultimo[0], a * ponto[1] + (1 - a) * self._ultimo[1])
+        return self._ultimo
+
+
+def _alfa(corte_hz, dt):
+    tau = 1.0 / (2 * math.pi * corte_hz)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class FiltroOneEuro:
+    """
+    One Euro filter (Casiez et al.): passa-baixa cujo corte sobe com a
+    velocidade. Parado = corte baixo (sem tremida); rapido = corte alto
+    (pouco atraso). min_corte em Hz, beta = quanto a velocidade abre o corte.
+    """
+
+    def __init__(self, min_corte=1.0, beta=0.02, corte_derivada=1.0):
+        self.min_corte = min_corte
+        self.beta = beta
+        self.corte_derivada = corte_derivada
+        self.reiniciar()
+
+    def reiniciar(self):
+        self._t = None
+        self._x = self._y = 0.0
+        self._dx = self._dy = 0.0 # Velocidade filtrada (px/s), usada tambem pelo preditor
+
+    @property
+    def velocidade(self):
+        return self._dx, self._dy
+
+    def filtrar(self, ponto, t):
+        x, y = float(ponto[0]), float(ponto[1])
+        if self._t is None:
+            self._t, self._x, self._y = t, x, y
+            return self._x, self._y
+        if t <= self._t: # Mesmo landmark de novo
+            return self._x, self._y
+
+        dt = t - self._t
+        self._t = t
+        a_d = _alfa(self.corte_derivada, dt)
+        self._dx += a_d * ((x - self._x) / dt - self._dx)
+        self._dy += a_d * ((y - self._y) / dt - self._dy)
+
+        corte = self.min_corte + self.beta * math.hypot(self._dx, self._dy)
+        a = _alfa(corte, dt)
+        self._x += a * (x - self._x)
+        self._y += a * (y - self._y)
+        return self._x, self._y
+
+
+class PreditorVelocidade:
+    """
+    Envolve outro filtro e extrapola a posicao filtrada com velocidade
+    constante por 'latencia' segundos (captura -> tela), para o cursor nao
+    ficar para tras do dedo. 'maximo' limita o salto (px) em mudancas bruscas.
+    """
+
+    def __init__(self, filtro, latencia=0.0, corte_velocidade=2.0, maximo=120.0):
+        self.filtro = filtro
+        self.latencia = latencia
+        self.corte_velocidade = corte_velocidade
+        self.maximo = maximo
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.filtro.reiniciar()
+        self._anterior = None
+        self._v = (0.0, 0.0)
+
+    def filtrar(self, ponto, t):
+        x, y = self.filtro.filtrar(ponto, t)
+        if hasattr(self.filtro, "velocidade"):
+            vx, vy = self.filtro.velocidade
+        elif self._anterior is not None and t > self._anterior[2]:
+            xa, ya, ta = self._anterior
+            a = _alfa(self.corte_velocidade, t - ta)
+            vx = self._v[0] + a * ((x - xa) / (t - ta) - self._v[0])
+            vy = self._v[1] + a * ((y - ya) / (t - ta) - self._v[1])
+        else:
+            vx, vy = self._v
+        self._v = (vx, vy)
+        self._anterior = (x, y, t)
+
+        dx, dy = vx * self.latencia, vy * self.latencia
+        salto = math.hypot(dx, dy)
+        if salto > self.maximo:
+            dx, dy = dx * self.maximo / salto, dy * self.maximo / salto
+        return x + dx, y + dy
+
+
+FILTROS = {
+    "ema": lambda: FiltroEMA(0.3),
+    "one_euro": lambda: FiltroOneEuro(),
+    "one_euro+predicao": lambda: PreditorVelocidade(FiltroOneEuro()),
+}
+
+
+def criar_filtro(nome):
+    if nome not in FILTROS:
+        raise ValueError(f"Filtro de cursor invalido: {nome} (use um de {list(FILTROS)})")
+    return FILTROS[nome]()
+
+
+# ------------------- Medicao -------------------
+def aplicar(filtro, traco):
+    """traco: array (n, 3) com t, x, y. Retorna (n, 2) filtrado."""
+    filtro.reiniciar()
+    return np.array([filtro.filtrar((x, y), t) for t, x, y in traco])
+
+
+def medir(filtro, traco, referencia=None, latencia=0.0, limiar_repouso=60.0, max_atraso=0.3):
+    """
+    latencia: tempo (s) entre a captura e o frame aparecer na tela; a saida do
+              filtro para o landmark de 't' e vista em 't + latencia'.
+    atraso_ms: atraso do cursor NA TELA: deslocamento no tempo que melhor alinha
+               a saida com a referencia (a propria entrada, ou a verdade no traco
+               sintetico), mais a latencia.
+    tremida_px: RMS do movimento da saida entre amostras com a mao parada
+                (velocidade da referencia < limiar_repouso px/s).
+    erro_px: RMS da distancia entre a saida e a referencia no momento da exibicao.
+    """
+    t = traco[:, 0]
+    saida = aplicar(filtro, traco)
+    ref = traco[:, 1:] if referencia is None else referencia
+
+    # Reamostra num passo fixo de 1 ms e procura o deslocamento de menor erro
+    grade = np.arange(t[0], t[-1], 0.001)
+    ref_g = np.stack([np.interp(grade, t, ref[:, 0]), np.interp(grade, t, ref[:, 1])], 1)
+    sai_g = np.stack([np.interp(grade, t, saida[:, 0]), np.interp(grade, t, saida[:, 1])], 1)
+    deslocamentos = np.arange(-int(max_atraso * 1000), int(max_atraso * 1000) + 1, 2)
+    erros = []
+    for d in deslocamentos:
+        if d >= 0:
+            diff = sai_g[d:] - ref_g[:len(ref_g) - d]
+        else:
+            diff = sai_g[:d] - ref_g[-d:]
+        erros.append(np.mean(np.sum(diff * diff, axis=1)))
+    atraso_ms = float(deslocamentos[int(np.argmin(erros))]) + latencia * 1000
+
+    dt = np.diff(t)
+    vel_ref = np.hypot(*np.diff(ref, axis=0).T) / np.maximum(dt, 1e-6)
+    passos = np.hypot(*np.diff(saida, axis=0).T)
+    repouso = vel_ref < limiar_repouso
+    tremida = float(np.sqrt(np.mean(passos[repouso] ** 2))) if repouso.any() else float("nan")
+    ref_exibicao = np.stack([np.interp(t + latencia, t, ref[:, 0]), np.interp(t + latencia, t, ref[:, 1])], 1)
+    erro = float(np.sqrt(np.mean(np.sum((saida - ref_exibicao) ** 2, axis=1))))
+    return {"atraso_ms": atraso_ms, "tremida_px": round(tremida, 2), "erro_px": round(erro, 1)}
+
+
+def traco_sintetico(segundos=30, fps=30, ruido_px=4.0, semente=0):
+    """Movimentos rapidos alternados com pausas, mais ruido. Retorna (traco, verdade)."""
+    rng = np.random.default_rng(semente)
+    t = np.arange(0, segundos, 1 / fps) + rng.normal(0, 0.002, int(segundos * fps)) # jitter do timestamp
+    t.sort()
+    verdade = np.zeros((len(t), 2))
+    alvo, inicio, origem = np.array([640.0, 360.0]), 0.0, np.array([640.0, 360.0])
+    for i, ti in enumerate(t):
+        if ti - inicio > 1.5: # Novo movimento a cada 1.5 s (0.4 s movendo, o resto parado)
+            origem, alvo, inicio = alvo, rng.uniform((100, 100), (1180, 620)), ti
+        u = min(1.0, (ti - inicio) / 0.4)
+        verdade[i] = origem + (alvo - origem) * (3 * u * u - 2 * u * u * u)
+    ruido = rng.normal(0, ruido_px, verdade.shape)
+    return np.column_stack([t, verdade + ruido]), verdade
+
+
+def traco_da_sessao(caminho):
+    """
+    Ponta do indicador da mao de navegacao (preferindo 'Right'), em pixels, por landmark.
+
+    Uma amostra por resultado da inferencia (nao por frame mostrado), no tempo
+    da captura: o mesmo resultado repetido em frames seguidos com relogios
+    novos distorceria o atraso e a tremida medidos.
+    """
+    from sessao import LeitorSessao
+
+    leitor = LeitorSessao(caminho)
+    largura, altura = leitor.cabecalho["largura"], leitor.cabecalho["altura"]
+    linhas = []
+    ultimo_seq = None
+    for relogio, seq, img_raw, resultado, _ in leitor:
+        if resultado is None or not resultado.multi_hand_landmarks or resultado.seq == ultimo_seq:
+            continue
+        ultimo_seq = resultado.seq
+        labels = [h.classification[0].label for h in resultado.multi_handedness]
+        mao = resultado.multi_hand_landmarks[labels.index("Right") if "Right" in labels else 0]
+        ponta = mao.landmark[8]
+        linhas.append((resultado.timestamp, ponta.x * largura, ponta.y * altura))
+    leitor.fechar()
+    return np.array(linhas)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara os filtros do cursor (atraso e tremida)")
+    parser.add_argument("sessao", nargs="?", help="arquivo .sessao gravado com landmarks")
+    parser.add_argument("--sintetico", action="store_true", help="usa um traco sintetico (com verdade conhecida)")
+    parser.add_argument("--latencia-ms", type=float, default=50.0, help="latencia captura -> tela (e do preditor)")
+    args = parser.parse_args()
+
+    referencia = None
+    if args.sessao and not args.sintetico:
+        traco = traco_da_sessao(args.sessao)
+        print(f"{len(traco)} landmarks de '{args.sessao}' (referencia = a propria entrada)")
+    else:
+        traco, referencia = traco_sintetico()
+        print(f"Traco sintetico: {len(traco)} amostras (referencia = posicao verdadeira)")
+
+    for nome in FILTROS:
+        filtro = criar_filtro(nome)
+        if isinstance(filtro, PreditorVelocidade):
+            filtro.latencia = args.latencia_ms / 1000
+        m = medir(filtro, traco, referencia, args.latencia_ms / 1000)
+        print(f"  {nome:18s} atraso {m['atraso_ms']:6.0f} ms  tremida {m['tremida_px']:5.2f} px  erro {m['erro_px']:6.1f} px")
+    m = medir(FiltroEMA(1.0), traco, referencia, args.latencia_ms / 1000)
+    print(f"  {'(sem filtro)':18s} atraso {m['atraso_ms']:6.0f} ms  tremida {m['tremida_px']:5.2f} px  erro {m['erro_px']:6.1f} px")
@@ -1,133 +1,138 @@
-import cv2
-import mediapipe as mp
-import math
 import time
-from collections import Counter, deque
+INICIO_PROCESSO = time.perf_counter() # Linha do tempo da inicializacao (ver linha_do_tempo)
+import argparse
+import cv2
 import numpy as np
 import os
 import random
 import shutil # Importado para copiar arquivos de imagem
-
-# --- Tenta importar o conector MySQL ---
-try:
-    import mysql.connector
-    db_ok = True
-except ImportError:
-    print("----------------------------------------------------")
-    print("AVISO: mysql-connector-python nao encontrado.")
-    print("O app vai rodar, mas NAO VAI SALVAR scores no banco.")
-    print("Para instalar, rode: python -m pip install mysql-connector-python")
-    print("----------------------------------------------------")
-    db_ok = False
-
-# --- Tenta importar e inicializar o Pygame (para o jogo) ---
-try:
-    import pygame
-    pygame.mixer.init()
-    
-    # --- MUDANÇA: Caminho dos Assets ---
-    ASSETS_PATH = "assets"
-    pygame.mixer.music.load(os.path.join(ASSETS_PATH, "musica2.mp3")) # Fundo do Jogo
-    pygame.mixer.music.set_volume(0.3)
-    ponto_sound = pygame.mixer.Sound(os.path.join(ASSETS_PATH, "ponto.mp3")) # Som de ponto
-    # --- Fim da mudança ---
-    
-    ponto_sound.set_volume(0.3)
-    pygame_ok = True
-except Exception as e:
-    print(f"Aviso: Nao foi possivel carregar arquivos de som (assets/musica2.mp3, assets/ponto.mp3): {e}")
-    print("O jogo funcionara sem som.")
-    pygame_ok = True # O jogo roda, mas sem som
-    ponto_sound = None
-    
-except ImportError:
-    print("----------------------------------------------------")
-    print("AVISO: Pygame nao encontrado. O Jogo nao funcionara.")
-    print("Para instalar, rode: python -m pip install pygame")
-    print("----------------------------------------------------")
-    pygame_ok = False
-    ponto_sound = None
+from captura import CapturaCamera
+from inferencia import InferenciaMaos
+from salvamento import SalvadorFotos
+from clipe import GravadorClipe
+from derivados import gerar_derivados
+from banco import EscritorPlacar, DB_CONFIG
+from placar import PlacarMemoria
+from cache_assets import CacheAssets
+from fundo import EfeitoFundo
+from desenho import CanvasDesenho
+from interface import TelaUI
+from landmarks import analisar_maos
+from gestos import MotorGestos, carregar_config
+from jogo import SimulacaoFlappy
+from filtros import FILTROS, criar_filtro
+from medicao import Instrumentacao, LinhaDoTempo
+from buffers import PoolFrames, ContadorAlocacoes
+from audio import AudioJogo
+from agendador import AgendadorFrames, NIVEIS_QUALIDADE
+from sessao import GravadorSessao, LeitorSessao, FonteReplay, InferenciaReplay, SaidaJanela, SaidaNula
+
+# ------------------- Inicialização -------------------
+# A câmera aparece primeiro; o resto carrega em segundo plano ou quando for usado:
+#   maos  - MediaPipe, aquecido na thread de inferência (inferencia.py)
+#   som   - pygame + mp3, na primeira entrada no JOGO (audio.py)
+#   banco - mysql.connector, no primeiro score salvo (banco.py)
+# Cada marca sai no console; quem ainda está carregando aparece no rodapé da tela.
+linha_do_tempo = LinhaDoTempo(INICIO_PROCESSO)
+linha_do_tempo.marcar("imports")
+estados_inicializacao = {"maos": "carregando", "som": "desligado", "banco": "aguardando"}
+
+ASSETS_PATH = "assets"
+# Sem pygame ou sem os arquivos de som, o jogo roda sem som
+audio_jogo = AudioJogo(ASSETS_PATH, musica="musica2.mp3", ponto="ponto.mp3", volume=0.3)
 
 
 # ------------------- Configurações iniciais -------------------
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=2,
-                       min_detection_confidence=0.7, min_tracking_confidence=0.7)
-mp_draw = mp.solutions.drawing_utils
-
-# Estilo de desenho
-estilo_ponto = mp_draw.DrawingSpec(color=(0, 200, 0), thickness=1, circle_radius=2)
-estilo_linha = mp_draw.DrawingSpec(color=(20, 120, 255), thickness=2)
-
-# Captura (1280x720)
-cap = cv2.VideoCapture(0)
+# True = MediaPipe roda numa thread e o loop desenha com o resultado mais recente
+# False = modo antigo (sincrono), para comparacao
+INFERENCIA_ASSINCRONA = True
+OPCOES_HANDS = dict(static_image_mode=False, max_num_hands=2,
+                    min_detection_confidence=0.7, min_tracking_confidence=0.7)
+# True = depois de achar a mão, o MediaPipe só recebe um recorte em volta dela
+# (volta para a tela inteira quando perde a mão ou na tela GESTOS, que precisa das duas)
+RASTREAMENTO_ROI = True
+
+# Desenho dos landmarks. O mediapipe é importado pela thread de inferência
+# (demora); aqui ele só é pedido quando já tem mão na tela.
+_desenho_maos = None
+
+def desenhar_mao(img, hand_lms):
+    global _desenho_maos
+    if _desenho_maos is None:
+        import mediapipe as mp
+        mp_draw = mp.solutions.drawing_utils
+        # Estilo de desenho
+        estilo_ponto = mp_draw.DrawingSpec(color=(0, 200, 0), thickness=1, circle_radius=2)
+        estilo_linha = mp_draw.DrawingSpec(color=(20, 120, 255), thickness=2)
+        _desenho_maos = (mp_draw, mp.solutions.hands.HAND_CONNECTIONS, estilo_ponto, estilo_linha)
+    mp_draw, conexoes, estilo_ponto, estilo_linha = _desenho_maos
+    mp_draw.draw_landmarks(img, hand_lms, conexoes, estilo_ponto, estilo_linha)
+
+# Captura (1280x720) - roda numa thread separada e sempre entrega o frame mais novo
+# (a câmera é aberta no main(), para o replay poder rodar sem ela)
 WIDTH, HEIGHT = 1280, 720
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, WIDTH)
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, HEIGHT)
-cap.set(cv2.CAP_PROP_FPS, 30)
-fps_target = 30
-tempo_por_frame = 1.0 / fps_target
+fps_target = 30 # O AgendadorFrames baixa a qualidade se o kiosk não der conta
+
+# Buffers de frame reaproveitados (buffers.py): captura, flip e inferência escrevem via dst=,
+# então o loop não aloca quadros novos depois do aquecimento. --alocacoes confere isso por frame.
+pool_frames = PoolFrames()
+contador_alocacoes = ContadorAlocacoes(WIDTH * HEIGHT * 3)
 
 # Pasta local (para TODAS as fotos)
 # O PHP vai ler direto desta pasta
 output_folder = "fotos" 
 os.makedirs(output_folder, exist_ok=True)
+sufixo_quiosque = "" # "_q1", "_q2"... no modo quiosque (quiosques.py), para os nomes não colidirem
 
 
 # ------------------- Configuração do Banco de Dados -------------------
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root', 
-    'password': '', # Senha vazia (padrão XAMPP/WAMP)
-    'database': 'flappy_game_db'
-}
+# (DB_CONFIG fica no banco.py, para as ferramentas de linha de comando usarem o mesmo)
+
+# Pool de conexoes + spool local (SQLite) para quando o MySQL estiver fora
+# Criado no main() (no modo quiosque cada cabine tem o seu spool)
+escritor_placar = None
+
+# Top / recentes / galeria em memoria, gravados em galeria/dados/placar.json
+# para a galeria PHP nao consultar o MySQL a cada visita
+placar_galeria = PlacarMemoria()
 
-def insert_score_to_db(score, image_filename):
+def insert_score_to_db(score, image_filename, thumb_path=None, web_path=None, video_path=None):
     """
-    Insere o score e o NOME do arquivo no banco de dados.
+    Registra o score e o NOME do arquivo (e das versões menores e do clipe, se gerados). A escrita no MySQL e feita em lote
+    pelo EscritorPlacar; se o banco estiver fora, fica guardado no spool.
+    O primeiro score é que carrega o conector do MySQL e o placar da galeria.
     """
-    if not db_ok:
-        print(f"Score {score} nao salvo (mysql-connector nao instalado).")
-        return
-
-    try:
-        cnx = mysql.connector.connect(**DB_CONFIG)
-        cursor = cnx.cursor()
-        
-        sql = "INSERT INTO highscores (score, image_path) VALUES (%s, %s)"
-        data = (score, image_filename)
-        
-        cursor.execute(sql, data)
-        cnx.commit()
-        
-        print(f"✅ SUCESSO! Score {score} e imagem {image_filename} salvos no banco de dados.")
-
-    except mysql.connector.Error as err:
-        print(f"❌ ERRO FATAL AO INSERIR NO MYSQL: {err}")
-        print("Verifique se o XAMPP (MySQL) esta rodando e se o banco/tabela existem.")
-    finally:
-        if 'cnx' in locals() and cnx.is_connected():
-            cursor.close()
-            cnx.close()
+    if escritor_placar.estado == "sem conector":
+        print(f"Score {score} guardado no spool (mysql-connector nao instalado).")
+    escritor_placar.registrar(score, image_filename, thumb_path, web_path, video_path)
+    placar_galeria.registrar(score, image_filename, thumb_path, web_path, video_path)
+    placar_galeria.carregar_em_segundo_plano(DB_CONFIG, escritor_placar.spool) # Só a primeira vez carrega
 # --- Fim da Configuração do DB ---
 
 
 # ------------------- Estado da aplicação (Geral) -------------------
 current_screen = "MENU"
 cursor_pos = (WIDTH // 2, HEIGHT // 2)
-last_cursor_pos = (WIDTH // 2, HEIGHT // 2)
-EMA_ALPHA = 0.3 
+# Filtro do cursor (filtros.py): "ema" (antigo), "one_euro" ou "one_euro+predicao"
+# A predição usa a latência captura -> tela medida no main()
+FILTRO_CURSOR = "one_euro+predicao"
+filtro_cursor = criar_filtro(FILTRO_CURSOR)
 click_frames = 0
 CLICK_THRESHOLD = 3
 CLICK_DISTANCE = 50
 
-# Estado: Gestos
-BUFFER_SIZE = 5
-gesture_buffer = deque(maxlen=BUFFER_SIZE)
+# Estado: Gestos (tabela em gestos.json; o motor roda em todo frame e as telas usam o gesto estável)
+motor_gestos = MotorGestos(carregar_config("gestos.json"))
+gesto_estavel = motor_gestos.estavel
 stable_gesture_text = ""
 
+@motor_gestos.assinar
+def _ao_mudar_gesto(anterior, novo, relogio):
+    global stable_gesture_text
+    stable_gesture_text = novo.texto
+
 # Estado: Desenho
-canvas = np.ones((HEIGHT, WIDTH, 3), dtype=np.uint8) * 255 # Canvas Branco
+canvas_desenho = CanvasDesenho(WIDTH, HEIGHT) # Canvas Branco com máscara de tinta incremental
 last_draw_point = None
 current_color = (0, 0, 0)  # Padrão Preto
 current_thickness = 12
@@ -140,39 +145,51 @@ photo_flash_start_time = 0
 TIMER_ARM_HOLD = 3 # 3 segundos segurando a mão
 TIMER_POSING = 3   # 3 segundos para a pose
 # --- Fim da mudança ---
+foto_preview_moldura = False # Mostra a moldura ao vivo na tela da Câmera
 
 # Estado: Jogo
+# (física, canos e pontos ficam na SimulacaoFlappy - jogo.py; aqui só o que é da tela)
 game_state = "START"
-game_bird_y = HEIGHT // 2
 BIRD_WIDTH, BIRD_HEIGHT = 85, 60
 BIRD_X_POS = (WIDTH // 2) - 150
-game_pipes = []
-game_pipe_speed = 20
+game_pipe_speed = 20  # pixels por tick (30 ticks/s, independente do FPS da câmera)
 game_pipe_gap = 220
 game_pipe_width = 150 # (Será atualizado pelos sprites)
-game_last_pipe_time = 0
 game_pipe_interval = 1.3
-game_score = 0
 game_start_time = 0
+game_ultimo_relogio = 0
+# O relogio dos frames é o time.monotonic() (um ajuste do relógio do PC não faz o dt dos filtros
+# e do jogo pular); o horário de verdade, só para o nome das fotos, é relogio + deslocamento_horario
+deslocamento_horario = 0.0
+
+def horario(relogio):
+    return relogio + deslocamento_horario
+# Fundo do jogo: "TINTA" (padrão), "ESCURECER", "CINZA", "SUBSTITUIR" ou "NENHUM"
+# Em kiosks mais fracos, "SUBSTITUIR" e "NENHUM" são os mais baratos
+MODO_FUNDO_JOGO = "TINTA"
+NIVEL_FUNDO_JOGO = 0.5 # 0.0 = só câmera, 1.0 = só a cor
+fundo_jogo = EfeitoFundo(WIDTH, HEIGHT, cor=(255, 230, 200), nivel=NIVEL_FUNDO_JOGO, modo=MODO_FUNDO_JOGO)
+desenhar_landmarks = True # Desligado nos níveis baixos de qualidade (agendador.py)
+# Clipe da partida (clipe.py): os últimos CLIPE_SEGUNDOS do jogo viram um vídeo em fotos/,
+# ao lado da foto do game over. Comprimido e gravado em segundo plano (nunca trava o jogo).
+CLIPES_JOGO = True
+CLIPE_SEGUNDOS = 8
+gravador_clipe = None # Criado no main() (não no replay)
 
 # ------------------- Carregar Sprites (Imagens) -------------------
-if 'ASSETS_PATH' not in locals(): ASSETS_PATH = "assets"
+# Sprites e moldura ja redimensionados e analisados ficam em cache_assets/ (.npy, mmap).
+# Refeito sozinho quando um PNG muda; CACHE_ASSETS = False volta a processar tudo na hora.
+CACHE_ASSETS = True
+cache_assets = CacheAssets(ativo=CACHE_ASSETS)
 try:
-    sprite_passaro = cv2.imread(os.path.join(ASSETS_PATH, "passaro.png"), -1)
-    sprite_cano_cima = cv2.imread(os.path.join(ASSETS_PATH, "pipe_cima.png"), -1)
-    sprite_cano_baixo = cv2.imread(os.path.join(ASSETS_PATH, "pipe_baixo.png"), -1)
-
-    if sprite_passaro is None or sprite_cano_cima is None or sprite_cano_baixo is None:
-        raise IOError("Nao foi possivel carregar um ou mais arquivos de sprite (passaro.png, pipe_cima.png, pipe_baixo.png)")
-    
     # Redimensiona o pássaro
-    sprite_passaro = cv2.resize(sprite_passaro, (BIRD_WIDTH, BIRD_HEIGHT))
+    sprite_passaro = cache_assets.sprite(os.path.join(ASSETS_PATH, "passaro.png"), (BIRD_WIDTH, BIRD_HEIGHT))
     
     # Força o redimensionamento dos canos
     PIPE_TARGET_WIDTH = 150  # Largura do cano
     PIPE_TARGET_HEIGHT = 600 # Altura do cano
-    sprite_cano_cima = cv2.resize(sprite_cano_cima, (PIPE_TARGET_WIDTH, PIPE_TARGET_HEIGHT))
-    sprite_cano_baixo = cv2.resize(sprite_cano_baixo, (PIPE_TARGET_WIDTH, PIPE_TARGET_HEIGHT))
+    sprite_cano_cima = cache_assets.sprite(os.path.join(ASSETS_PATH, "pipe_cima.png"), (PIPE_TARGET_WIDTH, PIPE_TARGET_HEIGHT))
+    sprite_cano_baixo = cache_assets.sprite(os.path.join(ASSETS_PATH, "pipe_baixo.png"), (PIPE_TARGET_WIDTH, PIPE_TARGET_HEIGHT))
     game_pipe_width, PIPE_HEIGHT = PIPE_TARGET_WIDTH, PIPE_TARGET_HEIGHT
 
     sprites_ok = True
@@ -188,16 +205,22 @@ except Exception as e:
     BIRD_WIDTH, BIRD_HEIGHT = 50, 50 
     game_pipe_width = 120 
 
+simulacao = SimulacaoFlappy(WIDTH, HEIGHT, BIRD_X_POS, BIRD_WIDTH, BIRD_HEIGHT, game_pipe_width,
+                            velocidade=game_pipe_speed, gap=game_pipe_gap, intervalo_canos=game_pipe_interval)
+
+def novo_jogo(relogio):
+    global game_start_time, game_ultimo_relogio
+    game_start_time = game_ultimo_relogio = relogio
+    simulacao.reiniciar(semente=random.randrange(2**31)) # random já semeado no main() (replay igual)
+    if gravador_clipe is not None:
+        gravador_clipe.reiniciar()
+
 # --- MUDANÇA: Carregar Moldura do Evento ---
 try:
-    sprite_moldura = cv2.imread(os.path.join(ASSETS_PATH, "moldura_evento.png"), -1)
-    if sprite_moldura is None:
-        raise IOError("Arquivo moldura_evento.png nao encontrado")
-    
-    # Garante que a moldura tenha o tamanho exato da tela
-    if sprite_moldura.shape[0] != HEIGHT or sprite_moldura.shape[1] != WIDTH:
-        print(f"Aviso: Redimensionando 'moldura_evento.png' de {sprite_moldura.shape} para {(HEIGHT, WIDTH)}.")
-        sprite_moldura = cv2.resize(sprite_moldura, (WIDTH, HEIGHT))
+    # Garante que a moldura tenha o tamanho exato da tela; vira um Sprite como os outros
+    # (o meio transparente e pulado). A thread de salvamento usa uma copia propria.
+    sprite_moldura = cache_assets.sprite(os.path.join(ASSETS_PATH, "moldura_evento.png"), (WIDTH, HEIGHT))
+    sprite_moldura_fotos = sprite_moldura.copia()
         
     frame_ok = True
     print("Moldura do evento carregada com sucesso!")
@@ -210,32 +233,14 @@ except Exception as e:
     print(f"----------------------------------------------------")
     frame_ok = False
 # --- Fim da Mudança ---
+print(f"Assets carregados em {cache_assets.resumo()}.")
+linha_do_tempo.marcar("assets")
 
-# ------------------- Funções de Detecção -------------------
-def distancia(p1, p2):
-    return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
-
-def detectar_dedos_vetorial(lm_list):
-    dedos = []
-    def dedo_estendido(p1, p2, p3):
-        v1 = (p2[0] - p1[0], p2[1] - p1[1])
-        v2 = (p3[0] - p2[0], p3[1] - p2[1])
-        dot = v1[0]*v2[0] + v1[1]*v2[1]
-        norm1 = math.hypot(v1[0], v1[1])
-        norm2 = math.hypot(v2[0], v2[1])
-        cos_angle = dot / (norm1 * norm2 + 1e-6)
-        angle = math.acos(min(1, max(-1, cos_angle)))
-        return angle < math.radians(30)
-
-    try:
-        dedos.append(int(dedo_estendido(lm_list[2], lm_list[3], lm_list[4])))   # polegar
-        dedos.append(int(dedo_estendido(lm_list[5], lm_list[6], lm_list[8])))   # indicador
-        dedos.append(int(dedo_estendido(lm_list[9], lm_list[10], lm_list[12]))) # medio
-        dedos.append(int(dedo_estendido(lm_list[13], lm_list[14], lm_list[16])))# anelar
-        dedos.append(int(dedo_estendido(lm_list[17], lm_list[18], lm_list[20])))# mindinho
-    except Exception:
-        dedos = [0,0,0,0,0]
-    return dedos
+# ------------------- Detecção (ver landmarks.py) -------------------
+# Ângulo máximo de dobra (graus) para considerar um dedo esticado
+LIMIAR_DEDO_GRAUS = 30
+ultimo_results = None
+maos = analisar_maos(None, WIDTH, HEIGHT, LIMIAR_DEDO_GRAUS)
 
 # ------------------- Funções de UI (Botões) -------------------
 BTN_MENU_GESTOS = (100, 150, 550, 300)
@@ -243,6 +248,7 @@ BTN_MENU_DESENHO = (730, 150, 1180, 300)
 BTN_MENU_FOTO = (100, 400, 550, 550)
 BTN_MENU_JOGO = (730, 400, 1180, 550)
 BTN_VOLTAR = (1030, 620, 1260, 700)
+BTN_FOTO_MOLDURA = (780, 620, 1010, 700)
 BTN_GAME_RESTART = (WIDTH // 2 - 200, HEIGHT // 2 + 100, WIDTH // 2 + 200, HEIGHT // 2 + 200)
 
 # Paleta de Desenho
@@ -258,100 +264,99 @@ BTN_DRAW_CLEAR = (PALETTE_X_START, 380, PALETTE_X_END, 430)
 BTN_DRAW_PHOTO = (PALETTE_X_START, 440, PALETTE_X_END, 490)
 
 
-def draw_button(img, rect, text, bg_color=(60, 120, 190), is_selected=False):
-    """Desenha um botão básico na tela"""
-    x1, y1, x2, y2 = rect
-    cv2.rectangle(img, (x1, y1), (x2, y2), bg_color, -1)
-    
-    border_color = (0, 255, 255) if is_selected else (255, 255, 255)
-    border_thickness = 4 if is_selected else 3
-    cv2.rectangle(img, (x1, y1), (x2, y2), border_color, border_thickness) # Borda
-    
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    scale = 1.3
-    thickness = 3
-    text_size = cv2.getTextSize(text, font, scale, thickness)[0]
-    if text_size[0] > (x2 - x1 - 20): 
-        scale = 1.0 
-        text_size = cv2.getTextSize(text, font, scale, thickness)[0]
-        
-    tx = x1 + (x2 - x1 - text_size[0]) // 2
-    ty = y1 + (y2 - y1 + text_size[1]) // 2
-    cv2.putText(img, text, (tx, ty), font, scale, (255, 255, 255), thickness)
+# Cores da paleta: id do botão -> (cor BGR, espessura)
+CORES_DESENHO = {
+    "vermelho": ((0, 0, 255), 12),
+    "verde": ((0, 255, 0), 12),
+    "azul": ((255, 0, 0), 12),
+    "amarelo": ((0, 255, 255), 12),
+    "preto": ((0, 0, 0), 12),
+    "borracha": ((255, 255, 255), 40), # BRANCO
+}
 
-def is_cursor_in_rect(cursor_xy, rect):
-    x, y = cursor_xy
-    x1, y1, x2, y2 = rect
-    return x1 < x < x2 and y1 < y < y2
+# Widgets fixos de cada tela: renderizados uma vez, depois só copiados.
+# O mesmo registro é usado para saber qual botão está sob o cursor.
+ui_menu = (TelaUI()
+           .adicionar_texto("titulo", "GESTURE SUITE", (50, 80), 2.5, 8, 3)
+           .adicionar_botao("gestos", BTN_MENU_GESTOS, "Gestos")
+           .adicionar_botao("desenho", BTN_MENU_DESENHO, "Desenho")
+           .adicionar_botao("foto", BTN_MENU_FOTO, "Camera")
+           .adicionar_botao("jogo", BTN_MENU_JOGO, "Jogo"))
+
+ui_gestos = TelaUI().adicionar_botao("voltar", BTN_VOLTAR, "Voltar")
+
+ui_desenho = (TelaUI()
+              .adicionar_botao("vermelho", BTN_DRAW_RED, "Vermelho", bg_color=(0,0,255))
+              .adicionar_botao("verde", BTN_DRAW_GREEN, "Verde", bg_color=(0,255,0))
+              .adicionar_botao("azul", BTN_DRAW_BLUE, "Azul", bg_color=(255,0,0))
+              .adicionar_botao("amarelo", BTN_DRAW_YELLOW, "Amarelo", bg_color=(0,255,255))
+              .adicionar_botao("preto", BTN_DRAW_BLACK, "Preto", bg_color=(50,50,50))
+              .adicionar_botao("borracha", BTN_DRAW_ERASER, "Borracha", bg_color=(200,200,200))
+              .adicionar_botao("limpar", BTN_DRAW_CLEAR, "Limpar")
+              .adicionar_botao("foto", BTN_DRAW_PHOTO, "Foto")
+              .adicionar_botao("voltar", BTN_VOLTAR, "Voltar"))
+
+ui_foto = TelaUI().adicionar_botao("voltar", BTN_VOLTAR, "Voltar")
+if frame_ok:
+    ui_foto.adicionar_botao("moldura", BTN_FOTO_MOLDURA, "Moldura") # Preview com moldura
+
+ui_jogo = TelaUI().adicionar_botao("sair", BTN_VOLTAR, "Sair")
+ui_game_over = TelaUI().adicionar_botao("reiniciar", BTN_GAME_RESTART, "REINICIAR", bg_color=(0, 200, 0))
 
 # ------------------- Funções de Sprite -------------------
 def draw_sprite(background, sprite, x, y):
     """
-    Desenha um sprite (imagem PNG com alfa) sobre o background.
+    Desenha um sprite (Sprite pre-processado, ver sprites.py) sobre o background.
     x, y é a posição do canto SUPERIOR ESQUERDO do sprite.
     """
-    try:
-        h, w, channels = sprite.shape
-    except ValueError:
-        return 
-        
-    x, y = int(x), int(y) 
-
-    if channels < 4:
-        return 
-
-    alpha = sprite[:, :, 3] / 255.0 
-    
-    y1, y2 = max(0, y), min(HEIGHT, y + h)
-    x1, x2 = max(0, x), min(WIDTH, x + w)
-    
-    sprite_y1, sprite_y2 = max(0, -y), min(h, HEIGHT - y)
-    sprite_x1, sprite_x2 = max(0, -x), min(w, WIDTH - x)
+    sprite.desenhar(background, x, y)
 
-    if y1 >= y2 or x1 >= x2 or sprite_y1 >= sprite_y2 or sprite_x1 >= sprite_x2:
-        return
+# (a colisão agora é vetorizada na SimulacaoFlappy, jogo.py)
+# --- Fim das funções de Sprite ---
 
-    roi = background[y1:y2, x1:x2]
-    sprite_cut = sprite[sprite_y1:sprite_y2, sprite_x1:sprite_x2]
-    alpha_cut = alpha[sprite_y1:sprite_y2, sprite_x1:sprite_x2]
-    
-    alpha_3d = cv2.merge([alpha_cut, alpha_cut, alpha_cut])
-    alpha_inv_3d = 1.0 - alpha_3d
+# ------------------- Salvamento de Fotos (segundo plano) -------------------
+def aplicar_moldura(imagem):
+    """Preview ao vivo (loop principal)."""
+    sprite_moldura.desenhar(imagem, 0, 0)
 
-    roi_bg = cv2.multiply(alpha_inv_3d, roi.astype(float))
-    sprite_fg = cv2.multiply(alpha_3d, sprite_cut[:,:,:3].astype(float))
-    
-    background[y1:y2, x1:x2] = cv2.add(roi_bg, sprite_fg).astype(np.uint8)
+def aplicar_moldura_foto(imagem):
+    """Thread de salvamento (o Sprite não pode ser desenhado por duas threads ao mesmo tempo)."""
+    sprite_moldura_fotos.desenhar(imagem, 0, 0)
 
-def check_collision(bird_rect, pipe_rect):
-    """Verifica colisão de Bounding Box (AABB)"""
-    bx1, by1, bx2, by2 = bird_rect
-    px1, py1, px2, py2 = pipe_rect
-    
-    if bx1 > px2 or bx2 < px1: return False
-    if by1 > py2 or by2 < py1: return False
-    return True
-# --- Fim das funções de Sprite ---
+salvador = None # Criado no main() (no replay as fotos vão para outra pasta, sem banco)
 
-# ------------------- Loop principal -------------------
-while True:
-    start_time_frame = time.time()
-    
-    success, img_raw = cap.read()
-    if not success:
-        print("Erro ao abrir câmera.")
-        break
+# Tempo por estágio (--metricas). Desligada custa só um 'if' por marca.
+instr = Instrumentacao()
 
-    img = cv2.flip(img_raw, 1)
-    
-    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    results = hands.process(img_rgb)
+# ------------------- Passo (um frame) -------------------
+def passo(img_raw, results, relogio):
+    """
+    Processa UM frame: detecção, máquina de estados e renderização.
+    img_raw: frame cru da câmera (sem espelhar); results: resultado do MediaPipe;
+    relogio: horário do frame (time.monotonic() ao vivo, o valor gravado no replay).
+    Retorna a imagem para mostrar. Não mostra nada nem espera tecla, então pode
+    rodar sem janela (replay / benchmark).
+    """
+    global cursor_pos, click_frames, current_screen, gesto_estavel, stable_gesture_text
+    global last_draw_point, current_color, current_thickness
+    global photo_app_state, photo_timer_start_time, photo_flash_start_time, foto_preview_moldura
+    global game_state, game_ultimo_relogio
+    global maos, ultimo_results
+
+    img = cv2.flip(img_raw, 1, dst=pool_frames.obter(img_raw.shape))
+    instr.marca("flip")
+
+    # Landmarks -> arrays (todas as mãos de uma vez), só quando chega resultado novo
+    resultado_novo = results is not ultimo_results
+    if resultado_novo:
+        maos = analisar_maos(results.multi_hand_landmarks, WIDTH, HEIGHT, LIMIAR_DEDO_GRAUS)
+        ultimo_results = results
+    instr.marca("landmarks")
 
     click_detected = False
     pinch_dist = 999
     is_pinching = False
-    lm_list_nav = None
-    dedos_nav = [0,0,0,0,0]
+    mascara_nav = None # Dedos da mão de navegação (5 bits), None = sem mão
     nav_hand_index = -1
     
     # --- Lógica de Detecção de Mão (Mão de Navegação) ---
@@ -365,23 +370,19 @@ while True:
             
         handLms_nav = results.multi_hand_landmarks[nav_hand_index]
         
-        if not (current_screen == "DESENHO" and photo_app_state != "IDLE"):
-             mp_draw.draw_landmarks(img, handLms_nav, mp_hands.HAND_CONNECTIONS, estilo_ponto, estilo_linha)
+        if desenhar_landmarks and not (current_screen == "DESENHO" and photo_app_state != "IDLE"):
+             desenhar_mao(img, handLms_nav)
 
-        lm_list_nav = []
-        for lm in handLms_nav.landmark:
-            lm_list_nav.append((int(lm.x * WIDTH), int(lm.y * HEIGHT)))
+        # Filtro só roda com landmark novo, no tempo da captura (não a cada frame desenhado)
+        if resultado_novo:
+            x, y = filtro_cursor.filtrar(maos.ponto(nav_hand_index, 8), results.timestamp) # Ponta do indicador
+            cursor_pos = (min(max(int(x), 0), WIDTH - 1), min(max(int(y), 0), HEIGHT - 1))
         
-        raw_cursor_pos = lm_list_nav[8] # Ponta do indicador
-        cursor_pos = (int(EMA_ALPHA * raw_cursor_pos[0] + (1 - EMA_ALPHA) * last_cursor_pos[0]),
-                      int(EMA_ALPHA * raw_cursor_pos[1] + (1 - EMA_ALPHA) * last_cursor_pos[1]))
-        last_cursor_pos = cursor_pos
-        
-        dedos_nav = detectar_dedos_vetorial(lm_list_nav)
+        mascara_nav = maos.mascara(nav_hand_index)
         
         # Trava de clique (pinça)
         if photo_app_state == "IDLE": 
-            pinch_dist = distancia(lm_list_nav[4], lm_list_nav[8]) 
+            pinch_dist = maos.pinca[nav_hand_index]
             is_pinching = (pinch_dist < CLICK_DISTANCE)
             
             if is_pinching:
@@ -395,7 +396,10 @@ while True:
 
     else:
         click_frames = 0
-        
+        filtro_cursor.reiniciar() # Mão sumiu: não suaviza o salto quando ela voltar
+
+    gesto_estavel = motor_gestos.atualizar(mascara_nav, relogio)
+    instr.marca("deteccao")
     # --- Fim da Lógica de Detecção ---
 
 
@@ -404,75 +408,48 @@ while True:
     # ----------------------------------------------------
 
     if current_screen == "MENU":
-        cv2.putText(img, "GESTURE SUITE", (50, 80), cv2.FONT_HERSHEY_SIMPLEX, 2.5, (0,0,0), 8)
-        cv2.putText(img, "GESTURE SUITE", (50, 80), cv2.FONT_HERSHEY_SIMPLEX, 2.5, (255, 255, 255), 3)
-
-        draw_button(img, BTN_MENU_GESTOS, "Gestos")
-        draw_button(img, BTN_MENU_DESENHO, "Desenho")
-        draw_button(img, BTN_MENU_FOTO, "Camera")
-        
-        if pygame_ok and sprites_ok:
-            draw_button(img, BTN_MENU_JOGO, "Jogo")
+        if not sprites_ok:
+            ui_menu.definir_botao("jogo", "Jogo (OFF)", (100, 100, 100))
+        elif estados_inicializacao["maos"] == "carregando":
+            ui_menu.definir_botao("jogo", "Jogo (carregando)", (110, 110, 140))
         else:
-            draw_button(img, BTN_MENU_JOGO, "Jogo (OFF)", bg_color=(100,100,100)) 
+            ui_menu.definir_botao("jogo", "Jogo", (60, 120, 190))
+        ui_menu.desenhar(img)
 
         if click_detected:
-            if is_cursor_in_rect(cursor_pos, BTN_MENU_GESTOS):
+            botao = ui_menu.botao_em(cursor_pos)
+            if botao == "gestos":
                 current_screen = "GESTOS"
             
-            elif is_cursor_in_rect(cursor_pos, BTN_MENU_DESENHO):
+            elif botao == "desenho":
                 current_screen = "DESENHO"
-                canvas.fill(255) # Limpa com BRANCO
+                canvas_desenho.limpar() # Limpa com BRANCO
                 last_draw_point = None
                 photo_app_state = "IDLE" 
             
-            elif is_cursor_in_rect(cursor_pos, BTN_MENU_FOTO):
+            elif botao == "foto":
                 current_screen = "FOTO"
                 photo_app_state = "IDLE"
                 photo_timer_start_time = 0 
             
-            elif is_cursor_in_rect(cursor_pos, BTN_MENU_JOGO) and pygame_ok and sprites_ok:
+            elif botao == "jogo" and sprites_ok:
                 current_screen = "JOGO"
                 game_state = "START"
-                game_bird_y = HEIGHT // 2
-                game_pipes = []
-                game_score = 0
-                game_start_time = time.time()
-                if pygame_ok and pygame.mixer.music.get_busy() == False:
-                    pygame.mixer.music.play(-1) 
+                novo_jogo(relogio)
+                audio_jogo.iniciar() # Só carrega na primeira vez; enquanto isso o jogo roda sem som
+                audio_jogo.tocar_musica()
 
     # --- TELA DE GESTOS ---
     elif current_screen == "GESTOS":
-        draw_button(img, BTN_VOLTAR, "Voltar")
+        ui_gestos.desenhar(img)
 
-        total_fingers = 0
+        total_fingers = maos.total_dedos()
         if results.multi_hand_landmarks:
             for i, handLms in enumerate(results.multi_hand_landmarks):
-                lm_list = []
-                for lm in handLms.landmark:
-                    lm_list.append((int(lm.x * WIDTH), int(lm.y * HEIGHT)))
-                
-                dedos = detectar_dedos_vetorial(lm_list)
-                total_fingers += sum(dedos)
-                
-                if i != nav_hand_index:
-                     mp_draw.draw_landmarks(img, handLms, mp_hands.HAND_CONNECTIONS, estilo_ponto, estilo_linha)
-
-        if dedos_nav == [0, 0, 0, 0, 0]: current_gesture_text = "Punho Fechado"
-        elif dedos_nav == [0, 1, 0, 0, 0]: current_gesture_text = "Apontando (1)"
-        elif dedos_nav == [0, 1, 1, 0, 0]: current_gesture_text = "Paz (2)"
-        elif dedos_nav == [1, 0, 0, 0, 0]: current_gesture_text = "Joia"
-        elif dedos_nav == [1, 1, 1, 1, 1]: current_gesture_text = "Mao Aberta (5)"
-        else: current_gesture_text = ""
-        
-        gesture_buffer.append(current_gesture_text)
-        if len(gesture_buffer) == BUFFER_SIZE:
-            count_data = Counter(gesture_buffer)
-            if count_data: 
-                most_common = count_data.most_common(1)[0]
-                if most_common[1] > BUFFER_SIZE // 2: 
-                    stable_gesture_text = most_common[0]
+                if i != nav_hand_index and desenhar_landmarks:
+                     desenhar_mao(img, handLms)
 
+        # stable_gesture_text é atualizado pelo evento do motor de gestos (_ao_mudar_gesto)
         if stable_gesture_text:
             cv2.putText(img, stable_gesture_text, (50, 100), cv2.FONT_HERSHEY_SIMPLEX, 2.5, (0,0,0), 8)
             cv2.putText(img, stable_gesture_text, (50, 100), cv2.FONT_HERSHEY_SIMPLEX, 2.5, (255, 255, 255), 3)
@@ -480,10 +457,11 @@ while True:
         cv2.putText(img, f"Total de Dedos: {total_fingers}", (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 2.0, (0,0,0), 8)
         cv2.putText(img, f"Total de Dedos: {total_fingers}", (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 2.0, (255, 255, 255), 3)
 
-        if click_detected and is_cursor_in_rect(cursor_pos, BTN_VOLTAR):
+        if click_detected and ui_gestos.botao_em(cursor_pos) == "voltar":
             current_screen = "MENU"
-            gesture_buffer.clear()
+            motor_gestos.reiniciar() # Votação recomeça do zero (como o gesture_buffer.clear() antigo)
             stable_gesture_text = ""
+            gesto_estavel = motor_gestos.estavel
 
     # --- TELA DE DESENHO ---
     elif current_screen == "DESENHO":
@@ -491,19 +469,13 @@ while True:
         overlay_text = ""
         countdown_text = ""
         
-        # Lógica de máscara para canvas BRANCO
-        img_gray = cv2.cvtColor(canvas, cv2.COLOR_BGR2GRAY)
-        _, mask = cv2.threshold(img_gray, 254, 255, cv2.THRESH_BINARY_INV) 
-
-        img_bg = cv2.bitwise_and(img, img, mask=cv2.bitwise_not(mask))
-        img_fg = cv2.bitwise_and(canvas, canvas, mask=mask)
-        img_with_drawing = cv2.add(img_bg, img_fg)
-        
-        img_display = img_with_drawing.copy()
+        # Copia só a tinta do canvas para a câmera (no lugar, só nos blocos com tinta)
+        img_with_drawing = canvas_desenho.compor(img)
+        img_display = img_with_drawing # Botões/textos são desenhados por cima
 
         # Lógica de estado da Câmera
         if photo_app_state == "ARMING": 
-            time_elapsed = time.time() - photo_timer_start_time
+            time_elapsed = relogio - photo_timer_start_time
             countdown_value = 3 - int(time_elapsed)
             
             if countdown_value > 0:
@@ -511,104 +483,63 @@ while True:
                 overlay_text = "Prepare-se..."
             else:
                 photo_app_state = "POSING"
-                photo_timer_start_time = time.time()
+                photo_timer_start_time = relogio
                 print("Armado! Faca a pose...")
         
         elif photo_app_state == "POSING": 
-            time_elapsed = time.time() - photo_timer_start_time
+            time_elapsed = relogio - photo_timer_start_time
             countdown_value = TIMER_POSING - int(time_elapsed)
             
             if countdown_value > 0:
                 countdown_text = str(countdown_value)
                 overlay_text = "Faca a pose!"
             else:
-                # --- MUDANÇA V2: Salvar foto do Desenho ---
-                filename_base = f"foto_desenho_{int(time.time())}.jpg"
-                
-                # --- MUDANÇA: Aplicar Moldura ---
-                imagem_final = img_with_drawing.copy() # Pega a imagem com desenho
-                if frame_ok:
-                    draw_sprite(imagem_final, sprite_moldura, 0, 0)
-                # --- Fim da mudança ---
-
-                local_path = os.path.join(output_folder, filename_base)
-                cv2.imwrite(local_path, imagem_final) # Salva a imagem com moldura
-                print(f"Foto Desenho salva em: {local_path}")
-                
-                # Envia para o Banco de Dados (com score 0)
-                insert_score_to_db(0, filename_base)
-                # --- Fim da Mudança V2 ---
+                # Salva a imagem com desenho (moldura + arquivo + banco em segundo plano)
+                # Cópia feita agora, antes dos botões serem desenhados por cima
+                filename_base = f"foto_desenho_{int(horario(relogio))}{sufixo_quiosque}.jpg"
+                salvador.salvar(img_with_drawing.copy(), filename_base, score=0)
                 
                 photo_app_state = "CAPTURED"
-                photo_flash_start_time = time.time()
+                photo_flash_start_time = relogio
         
         if photo_app_state == "CAPTURED":
             overlay_text = "FOTO CAPTURADA!"
-            if time.time() - photo_flash_start_time < 0.5:
+            if relogio - photo_flash_start_time < 0.5:
                 cv2.rectangle(img_display, (0, 0), (WIDTH, HEIGHT), (255, 255, 255), -1)
             else:
                 photo_app_state = "IDLE" 
                 
         # Desenha a paleta de cores (na img_display)
-        draw_button(img_display, BTN_DRAW_RED, "Vermelho", bg_color=(0,0,255), is_selected=(current_color == (0,0,255)))
-        draw_button(img_display, BTN_DRAW_GREEN, "Verde", bg_color=(0,255,0), is_selected=(current_color == (0,255,0)))
-        draw_button(img_display, BTN_DRAW_BLUE, "Azul", bg_color=(255,0,0), is_selected=(current_color == (255,0,0)))
-        draw_button(img_display, BTN_DRAW_YELLOW, "Amarelo", bg_color=(0,255,255), is_selected=(current_color == (0,255,255)))
-        draw_button(img_display, BTN_DRAW_BLACK, "Preto", bg_color=(50,50,50), is_selected=(current_color == (0,0,0) and current_thickness == 12))
-        draw_button(img_display, BTN_DRAW_ERASER, "Borracha", bg_color=(200,200,200), is_selected=(current_color == (255,255,255)))
-        draw_button(img_display, BTN_DRAW_CLEAR, "Limpar")
-        draw_button(img_display, BTN_DRAW_PHOTO, "Foto") 
-        draw_button(img_display, BTN_VOLTAR, "Voltar")
+        cor_selecionada = None
+        for id_cor, (cor, espessura) in CORES_DESENHO.items():
+            if cor == current_color and espessura == current_thickness:
+                cor_selecionada = id_cor
+        ui_desenho.desenhar(img_display, selecionado=cor_selecionada)
         
+        botao = ui_desenho.botao_em(cursor_pos)
+
         # Lógica de clique (só funciona se não estiver tirando foto)
         if click_detected and photo_app_state == "IDLE":
-            if is_cursor_in_rect(cursor_pos, BTN_VOLTAR):
+            if botao == "voltar":
                 current_screen = "MENU"
-            
-            elif is_cursor_in_rect(cursor_pos, BTN_DRAW_RED):
-                current_color = (0, 0, 255) # BGR
-                current_thickness = 12
-            elif is_cursor_in_rect(cursor_pos, BTN_DRAW_GREEN):
-                current_color = (0, 255, 0)
-                current_thickness = 12
-            elif is_cursor_in_rect(cursor_pos, BTN_DRAW_BLUE):
-                current_color = (255, 0, 0)
-                current_thickness = 12
-            elif is_cursor_in_rect(cursor_pos, BTN_DRAW_YELLOW):
-                current_color = (0, 255, 255)
-                current_thickness = 12
-            elif is_cursor_in_rect(cursor_pos, BTN_DRAW_BLACK):
-                current_color = (0, 0, 0) # PRETO
-                current_thickness = 12
-            elif is_cursor_in_rect(cursor_pos, BTN_DRAW_ERASER):
-                current_color = (255, 255, 255) # BRANCO
-                current_thickness = 40 
-            elif is_cursor_in_rect(cursor_pos, BTN_DRAW_CLEAR):
-                canvas.fill(255) # BRANCO
-            elif is_cursor_in_rect(cursor_pos, BTN_DRAW_PHOTO):
+            elif botao in CORES_DESENHO:
+                current_color, current_thickness = CORES_DESENHO[botao]
+            elif botao == "limpar":
+                canvas_desenho.limpar() # BRANCO
+            elif botao == "foto":
                 print("Botão de Foto clicado!")
                 photo_app_state = "ARMING"
-                photo_timer_start_time = time.time()
+                photo_timer_start_time = relogio
         
         # Proteção para não desenhar sobre a UI
-        is_on_ui = (
-            is_cursor_in_rect(cursor_pos, BTN_VOLTAR) or
-            is_cursor_in_rect(cursor_pos, BTN_DRAW_RED) or
-            is_cursor_in_rect(cursor_pos, BTN_DRAW_GREEN) or
-            is_cursor_in_rect(cursor_pos, BTN_DRAW_BLUE) or
-            is_cursor_in_rect(cursor_pos, BTN_DRAW_YELLOW) or
-            is_cursor_in_rect(cursor_pos, BTN_DRAW_BLACK) or
-            is_cursor_in_rect(cursor_pos, BTN_DRAW_ERASER) or
-            is_cursor_in_rect(cursor_pos, BTN_DRAW_CLEAR) or
-            is_cursor_in_rect(cursor_pos, BTN_DRAW_PHOTO)
-        )
+        is_on_ui = botao is not None
         
         can_draw = is_pinching and not is_on_ui and photo_app_state == "IDLE"
 
         if can_draw:
             if last_draw_point is None:
                 last_draw_point = cursor_pos
-            cv2.line(canvas, last_draw_point, cursor_pos, current_color, current_thickness)
+            canvas_desenho.linha(last_draw_point, cursor_pos, current_color, current_thickness)
             last_draw_point = cursor_pos
         else:
             last_draw_point = None
@@ -632,8 +563,12 @@ while True:
         overlay_text = ""
         countdown_text = ""
         
+        # Preview com moldura (antes dos textos, para eles ficarem por cima)
+        if foto_preview_moldura and frame_ok:
+            aplicar_moldura(img)
+
         # --- MUDANÇA: Lógica de "Armar" (3s segurando) e "Pose" (3s) (CORRIGIDO) ---
-        is_hand_open = (dedos_nav == [1, 1, 1, 1, 1])
+        is_hand_open = (gesto_estavel.nome == "mao_aberta")
         
         if photo_app_state == "IDLE":
             overlay_text = "Segure a mao aberta por 3s"
@@ -641,9 +576,9 @@ while True:
             if is_hand_open:
                 # Se a mão está aberta, inicia o timer (se não tiver começado)
                 if photo_timer_start_time == 0:
-                    photo_timer_start_time = time.time()
+                    photo_timer_start_time = relogio
                 
-                time_held = time.time() - photo_timer_start_time
+                time_held = relogio - photo_timer_start_time
                 # Usa o TIMER_ARM_HOLD (que é 3)
                 countdown_value = TIMER_ARM_HOLD - int(time_held) 
                 
@@ -654,7 +589,7 @@ while True:
                 # Se segurou pelos 3 segundos
                 if time_held >= TIMER_ARM_HOLD:
                     photo_app_state = "POSING"
-                    photo_timer_start_time = time.time() # Reseta o timer para a pose
+                    photo_timer_start_time = relogio # Reseta o timer para a pose
                     print("Armado! Faca a pose...")
                     
             else:
@@ -665,40 +600,26 @@ while True:
         # ESTADO 2: Contando 3s para a "Pose"
         # Este bloco agora roda mesmo se a mão desaparecer
         elif photo_app_state == "POSING": 
-            time_elapsed = time.time() - photo_timer_start_time
+            time_elapsed = relogio - photo_timer_start_time
             countdown_value = TIMER_POSING - int(time_elapsed)
             
             if countdown_value > 0:
                 countdown_text = str(countdown_value)
                 overlay_text = "Faca a pose!"
             else:
-                # --- MUDANÇA V2: Salvar foto "Normal" ---
-                filename_base = f"foto_normal_{int(time.time())}.jpg"
-                img_clean_flipped = cv2.flip(img_raw, 1) 
-                
-                # --- MUDANÇA: Aplicar Moldura ---
-                imagem_final = img_clean_flipped.copy() # Pega a imagem limpa
-                if frame_ok:
-                    draw_sprite(imagem_final, sprite_moldura, 0, 0)
-                # --- Fim da mudança ---
-
-                local_path = os.path.join(output_folder, filename_base)
-                cv2.imwrite(local_path, imagem_final) # Salva a imagem com moldura
-                print(f"Foto salva em: {local_path}")
-                    
-                # Envia para o Banco de Dados (com score 0)
-                insert_score_to_db(0, filename_base)
-                # --- Fim da Mudança V2 ---
+                # Salva a imagem limpa (espelhada na thread de salvamento)
+                filename_base = f"foto_normal_{int(horario(relogio))}{sufixo_quiosque}.jpg"
+                salvador.salvar(img_raw, filename_base, score=0, espelhar=True)
                 
                 photo_app_state = "CAPTURED"
-                photo_flash_start_time = time.time()
+                photo_flash_start_time = relogio
         
         # ESTADO 3: A foto foi tirada, mostrar feedback
         if photo_app_state == "CAPTURED":
         # --- Fim da mudança ---
             
             overlay_text = "FOTO CAPTURADA!"
-            if time.time() - photo_flash_start_time < 0.5:
+            if relogio - photo_flash_start_time < 0.5:
                 cv2.rectangle(img, (0, 0), (WIDTH, HEIGHT), (255, 255, 255), -1)
             else:
                 current_screen = "MENU"
@@ -716,17 +637,19 @@ while True:
             cv2.putText(img, countdown_text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0,0,0), thickness + 10)
             cv2.putText(img, countdown_text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0,0,255), thickness)
         
-        draw_button(img, BTN_VOLTAR, "Voltar")
-        if click_detected and is_cursor_in_rect(cursor_pos, BTN_VOLTAR):
+        ui_foto.desenhar(img, selecionado="moldura" if foto_preview_moldura else None)
+        botao = ui_foto.botao_em(cursor_pos) if click_detected else None
+        if botao == "voltar":
             current_screen = "MENU"
             photo_app_state = "IDLE" 
+        elif botao == "moldura" and photo_app_state == "IDLE":
+            foto_preview_moldura = not foto_preview_moldura
             
     # --- TELA DO JOGO ---
-    elif current_screen == "JOGO" and pygame_ok:
+    elif current_screen == "JOGO":
         
-        # Fundo azul 50/50
-        light_blue_bg = np.full_like(img, (255, 230, 200)) # BGR: Azul claro
-        img = cv2.addWeighted(img, 0.5, light_blue_bg, 0.5, 0)
+        # Fundo azul claro (LUT pré-calculada, sem alocar por frame)
+        img = fundo_jogo.aplicar(img)
         
         # Lógica do Jogo
         if game_state == "START":
@@ -735,109 +658,41 @@ while True:
             
             if click_detected: # Começa com clique
                 game_state = "PLAYING"
-                game_start_time = time.time()
-                game_score = 0
-                game_pipes = []
-                game_bird_y = HEIGHT // 2
+                novo_jogo(relogio)
 
         elif game_state == "PLAYING":
-            
-            # Dificuldade Progressiva
-            difficulty_level = game_score // 5
-            current_pipe_speed = min(30, game_pipe_speed + difficulty_level * 2) 
-            current_pipe_gap = max(120, game_pipe_gap - difficulty_level * 10) 
-            
-            # Controle: Seguir o Dedo
-            if results.multi_hand_landmarks:
-                game_bird_y = cursor_pos[1]
-            
-            # Lógica dos Canos
-            current_time = time.time()
-            if current_time - game_last_pipe_time > game_pipe_interval:
-                h = random.randint(150, HEIGHT - 150 - current_pipe_gap)
-                game_pipes.append({"x": WIDTH, "height": h})
-                game_last_pipe_time = current_time
-
-            new_pipes = []
-            for pipe in game_pipes:
-                pipe["x"] -= current_pipe_speed
-                x, h = pipe["x"], pipe["height"]
-                
-                # Desenho de Canos (Sprite ou fallback)
+
+            # Física em ticks fixos: anda o tempo real desde o último frame
+            # Controle: Seguir o Dedo (sem mão, o pássaro fica onde está)
+            alvo_y = cursor_pos[1] if results.multi_hand_landmarks else None
+            pontos_ganhos, colidiu = simulacao.atualizar(relogio - game_ultimo_relogio, alvo_y)
+            game_ultimo_relogio = relogio
+
+            if pontos_ganhos:
+                audio_jogo.ponto()
+
+            # Canos (Sprite ou fallback)
+            for x, h, gap in simulacao.canos():
                 if sprites_ok:
-                    pipe_cima_y = h - PIPE_HEIGHT 
-                    draw_sprite(img, sprite_cano_cima, x, pipe_cima_y)
-                    pipe_baixo_y = h + current_pipe_gap
-                    draw_sprite(img, sprite_cano_baixo, x, pipe_baixo_y)
+                    draw_sprite(img, sprite_cano_cima, x, h - PIPE_HEIGHT)
+                    draw_sprite(img, sprite_cano_baixo, x, h + gap)
                 else:
                     cv2.rectangle(img, (x, 0), (x + game_pipe_width, h), (0, 200, 0), -1)
-                    cv2.rectangle(img, (x, h + current_pipe_gap), (x + game_pipe_width, HEIGHT), (0, 200, 0), -1)
+                    cv2.rectangle(img, (x, h + gap), (x + game_pipe_width, HEIGHT), (0, 200, 0), -1)
 
-                # Lógica de Colisão (Sprite)
-                bird_rect = (BIRD_X_POS, game_bird_y - BIRD_HEIGHT // 2, 
-                             BIRD_X_POS + BIRD_WIDTH, game_bird_y + BIRD_HEIGHT // 2)
-                pipe_cima_rect = (x, 0, x + game_pipe_width, h)
-                pipe_baixo_rect = (x, h + current_pipe_gap, x + game_pipe_width, HEIGHT)
-
-                if (check_collision(bird_rect, pipe_cima_rect) or check_collision(bird_rect, pipe_baixo_rect)) and \
-                   game_state != "GAME_OVER":
-                    
-                    # --- MUDANÇA V2: Salvar Score e Imagem ---
-                    filename_base = f"foto_gameover_score_{game_score}_{int(time.time())}.jpg"
-                    img_clean_flipped = cv2.flip(img_raw, 1) # Salva a imagem limpa
-                    
-                    # --- MUDANÇA: Aplicar Moldura ---
-                    imagem_final = img_clean_flipped.copy() # Pega a imagem limpa
-                    if frame_ok:
-                        draw_sprite(imagem_final, sprite_moldura, 0, 0)
-                    # --- Fim da mudança ---
-
-                    local_path = os.path.join(output_folder, filename_base)
-                    cv2.imwrite(local_path, imagem_final) # Salva a imagem com moldura
-                    print(f"Foto Game Over salva em: {local_path}")
-                        
-                    # Envia para o Banco de Dados
-                    insert_score_to_db(game_score, filename_base)
-                    # --- Fim da Mudança V2 ---
-
-                    game_state = "GAME_OVER"
-                    if pygame_ok: pygame.mixer.music.stop()
-
-                # Pontuação
-                if x + game_pipe_width < BIRD_X_POS and "counted" not in pipe:
-                    game_score += 1
-                    pipe["counted"] = True
-                    if ponto_sound:
-                        ponto_sound.play()
-
-                if x + game_pipe_width > 0:
-                    new_pipes.append(pipe)
-            game_pipes = new_pipes
-
-            # Checa colisão com teto/chão
-            if (game_bird_y - BIRD_HEIGHT // 2 <= 0 or game_bird_y + BIRD_HEIGHT // 2 >= HEIGHT) and game_state != "GAME_OVER":
-                
-                # --- MUDANÇA V2: Salvar Score e Imagem ---
-                filename_base = f"foto_gameover_score_{game_score}_{int(time.time())}.jpg"
-                img_clean_flipped = cv2.flip(img_raw, 1) # Salva a imagem limpa
-                
-                # --- MUDANÇA: Aplicar Moldura ---
-                imagem_final = img_clean_flipped.copy() # Pega a imagem limpa
-                if frame_ok:
-                    draw_sprite(imagem_final, sprite_moldura, 0, 0)
-                # --- Fim da mudança ---
-                
-                local_path = os.path.join(output_folder, filename_base)
-                cv2.imwrite(local_path, imagem_final) # Salva a imagem com moldura
-                print(f"Foto Game Over salva em: {local_path}")
-                
-                insert_score_to_db(game_score, filename_base)
-                # --- Fim da Mudança V2 ---
+            # Colisão com cano, teto ou chão
+            if colidiu:
+                # Salva Score e Imagem limpa (em segundo plano)
+                filename_base = f"foto_gameover_score_{simulacao.pontos}_{int(horario(relogio))}{sufixo_quiosque}.jpg"
+                # O nome do clipe vai para o banco junto com a foto (o vídeo termina de gravar logo depois)
+                video = gravador_clipe.finalizar(filename_base) if gravador_clipe is not None else None
+                salvador.salvar(img_raw, filename_base, score=simulacao.pontos, espelhar=True, video=video)
 
                 game_state = "GAME_OVER"
-                if pygame_ok: pygame.mixer.music.stop()
-            
+                audio_jogo.parar_musica()
+
             # Desenhar Pássaro (Sprite)
+            game_bird_y = simulacao.passaro_y
             if sprites_ok:
                 bird_draw_y = game_bird_y - BIRD_HEIGHT // 2
                 draw_sprite(img, sprite_passaro, BIRD_X_POS, bird_draw_y)
@@ -845,31 +700,30 @@ while True:
                 cv2.circle(img, (BIRD_X_POS + BIRD_WIDTH // 2, game_bird_y), BIRD_WIDTH // 2, (0, 255, 255), -1)
             
             # Pontos
-            cv2.putText(img, f"Pontos: {game_score}", (50, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, (0,0,0), 8)
-            cv2.putText(img, f"Pontos: {game_score}", (50, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 5)
+            cv2.putText(img, f"Pontos: {simulacao.pontos}", (50, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, (0,0,0), 8)
+            cv2.putText(img, f"Pontos: {simulacao.pontos}", (50, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 5)
 
         elif game_state == "GAME_OVER":
             cv2.putText(img, "GAME OVER", (WIDTH // 2 - 280, HEIGHT // 2 - 150), cv2.FONT_HERSHEY_SIMPLEX, 3, (0, 0, 255), 10)
-            cv2.putText(img, f"Pontos: {game_score}", (WIDTH // 2 - 120, HEIGHT // 2 + 50), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 5)
+            cv2.putText(img, f"Pontos: {simulacao.pontos}", (WIDTH // 2 - 120, HEIGHT // 2 + 50), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 5)
             
-            draw_button(img, BTN_GAME_RESTART, "REINICIAR", bg_color=(0, 200, 0))
+            ui_game_over.desenhar(img)
             
             if click_detected:
-                if is_cursor_in_rect(cursor_pos, BTN_GAME_RESTART):
+                if ui_game_over.botao_em(cursor_pos) == "reiniciar":
                     game_state = "PLAYING"
-                    game_start_time = time.time()
-                    game_score = 0
-                    game_pipes = []
-                    game_bird_y = HEIGHT // 2
-                    if pygame_ok: pygame.mixer.music.play(-1) 
+                    novo_jogo(relogio)
+                    audio_jogo.tocar_musica()
             
         # Botão Voltar (sempre visível no jogo, incluindo Game Over)
-        draw_button(img, BTN_VOLTAR, "Sair")
+        ui_jogo.desenhar(img)
         
         # Checa clique no "Sair"
-        if click_detected and is_cursor_in_rect(cursor_pos, BTN_VOLTAR):
+        if click_detected and ui_jogo.botao_em(cursor_pos) == "sair":
             current_screen = "MENU"
-            if pygame_ok: pygame.mixer.music.stop() 
+            audio_jogo.parar_musica()
+
+    instr.marca("tela")
 
     # ------------------- Desenhar cursor (sempre por cima) -------------------
     if results.multi_hand_landmarks:
@@ -878,23 +732,223 @@ while True:
             cursor_color = (0, 255, 0) if not is_pinching else (0, 0, 255)
             cv2.circle(img, cursor_int, 15, cursor_color, -1)
             cv2.circle(img, cursor_int, 15, (255, 255, 255), 3)
+    instr.marca("cursor")
 
+    return img
 
-    # Mostrar Imagem Final
-    cv2.imshow("Gesture Suite v1.0", img)
-    
-    # --- Controle de FPS ---
-    elapsed_total = time.time() - start_time_frame
-    sleep_time = tempo_por_frame - elapsed_total
-    if sleep_time > 0:
-        time.sleep(sleep_time * 0.95) 
-
-    key = cv2.waitKey(1)
-    if key == 27 or key == ord('q'): # Pressione ESC ou 'q' para sair
-        break
-
-# limpeza
-cap.release()
-cv2.destroyAllWindows()
-if pygame_ok:
-    pygame.mixer.quit()
\ No newline at end of file
+
+# ------------------- Inicialização (estado dos subsistemas) -------------------
+def acompanhar_inicializacao(inferencia):
+    """Atualiza estados_inicializacao (chamado a cada frame) e marca cada mudança na linha do tempo."""
+    atuais = {"maos": inferencia.estado, "som": audio_jogo.estado, "banco": escritor_placar.estado}
+    for nome, estado in atuais.items():
+        if estados_inicializacao[nome] != estado:
+            estados_inicializacao[nome] = estado
+            linha_do_tempo.marcar(f"{nome}: {estado}")
+
+def desenhar_carregamento(img):
+    """Rodapé com o que ainda está carregando (só na tela, não vai para fotos nem gravação)."""
+    carregando = [nome for nome, estado in estados_inicializacao.items() if estado == "carregando"]
+    if carregando:
+        texto = f"Carregando: {', '.join(carregando)}..."
+        cv2.putText(img, texto, (10, HEIGHT - 45), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 4)
+        cv2.putText(img, texto, (10, HEIGHT - 45), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+
+
+# ------------------- Loop principal -------------------
+def main(argv=None, fonte=None, saida=None):
+    """
+    argv: argumentos (None = sys.argv). fonte/saida: usados pelo quiosques.py
+    para trocar a câmera e a janela por buffers em memória compartilhada.
+    """
+    global salvador, escritor_placar, sufixo_quiosque, filtro_cursor, gravador_clipe, deslocamento_horario
+
+    parser = argparse.ArgumentParser(description="Gesture Suite")
+    parser.add_argument("--gravar", metavar="ARQUIVO", help="grava a sessão (frames + landmarks) neste arquivo")
+    parser.add_argument("--sem-landmarks", action="store_true", help="com --gravar: grava só os frames")
+    parser.add_argument("--replay", metavar="ARQUIVO", help="roda uma sessão gravada, sem câmera")
+    parser.add_argument("--tempo-real", action="store_true", help="com --replay: respeita o tempo gravado")
+    parser.add_argument("--janela", action="store_true", help="com --replay: mostra a janela")
+    parser.add_argument("--semente", type=int, default=None, help="semente do random (jogo)")
+    parser.add_argument("--metricas", action="store_true", help="mede o tempo de cada estágio (tecla 'h' mostra o HUD)")
+    parser.add_argument("--exportar-metricas", metavar="ARQUIVO", help="salva p50/p95/p99 a cada 10s (.csv ou .json)")
+    parser.add_argument("--qualidade", choices=[n["nome"] for n in NIVEIS_QUALIDADE],
+                        help="fixa o nível de qualidade (desliga a qualidade adaptativa)")
+    parser.add_argument("--filtro-cursor", choices=list(FILTROS), default=FILTRO_CURSOR, help="filtro do cursor")
+    parser.add_argument("--camera", default="0", help="índice da câmera ou arquivo de vídeo (padrão: 0)")
+    parser.add_argument("--quiosque", type=int, default=None, help="número da cabine (spool e nomes de foto próprios)")
+    parser.add_argument("--alocacoes", action="store_true", help="depuração: conta quadros alocados por frame (lento)")
+    args = parser.parse_args(argv)
+
+    caminho_spool = "spool_placar.db"
+    if args.quiosque is not None:
+        sufixo_quiosque = f"_q{args.quiosque}"
+        caminho_spool = f"spool_placar{sufixo_quiosque}.db"
+    escritor_placar = EscritorPlacar(DB_CONFIG, caminho_spool=caminho_spool)
+    filtro_cursor = criar_filtro(args.filtro_cursor)
+
+    instr.ativo = args.metricas or bool(args.exportar_metricas)
+    instr.arquivo_exportacao = args.exportar_metricas
+    if args.alocacoes:
+        contador_alocacoes.ativar()
+
+    gravador = None
+    if args.replay:
+        leitor = LeitorSessao(args.replay)
+        fonte = FonteReplay(leitor, tempo_real=args.tempo_real)
+        if leitor.cabecalho["com_landmarks"]:
+            inferencia = InferenciaReplay(fonte)
+        else:
+            inferencia = InferenciaMaos(False, roi=RASTREAMENTO_ROI, pool=pool_frames, **OPCOES_HANDS) # Síncrono = determinístico
+        saida = SaidaJanela("Gesture Suite v1.0 (replay)") if args.janela else SaidaNula()
+        random.seed(leitor.cabecalho["semente"])
+        deslocamento_horario = leitor.cabecalho["deslocamento_horario"]
+        # No replay as fotos vão para outra pasta e não vão para o banco
+        salvador = SalvadorFotos("replay_fotos", aplicar_moldura=aplicar_moldura_foto if frame_ok else None)
+    else:
+        if fonte is None:
+            camera = int(args.camera) if args.camera.isdigit() else args.camera
+            fonte = CapturaCamera(camera, WIDTH, HEIGHT, fps_target, pool=pool_frames).iniciar()
+            linha_do_tempo.marcar("camera aberta")
+        # Volta na hora: o MediaPipe carrega na thread de inferência (estado "carregando")
+        inferencia = InferenciaMaos(INFERENCIA_ASSINCRONA, roi=RASTREAMENTO_ROI, pool=pool_frames, **OPCOES_HANDS)
+        if saida is None:
+            saida = SaidaJanela("Gesture Suite v1.0")
+        semente = args.semente if args.semente is not None else random.randrange(2**31)
+        random.seed(semente)
+        deslocamento_horario = time.time() - time.monotonic()
+        # O placar da galeria é recarregado do banco no primeiro score (insert_score_to_db);
+        # até lá a galeria continua servindo o último snapshot
+        salvador = SalvadorFotos(output_folder,
+                                 aplicar_moldura=aplicar_moldura_foto if frame_ok else None,
+                                 inserir_no_banco=insert_score_to_db,
+                                 gerar_derivados=gerar_derivados)
+        if CLIPES_JOGO:
+            gravador_clipe = GravadorClipe(output_folder, segundos=CLIPE_SEGUNDOS, pool=pool_frames)
+        if args.gravar:
+            gravador = GravadorSessao(args.gravar, WIDTH, HEIGHT, semente, com_landmarks=not args.sem_landmarks,
+                                      deslocamento_horario=deslocamento_horario)
+
+    def aplicar_qualidade(nivel):
+        global desenhar_landmarks
+        inferencia.escala = nivel["escala_inferencia"]
+        inferencia.definir_complexidade(nivel["model_complexity"])
+        desenhar_landmarks = nivel["desenhar_landmarks"]
+        fundo_jogo.configurar(modo=nivel["modo_fundo"] or MODO_FUNDO_JOGO)
+
+    # No replay a qualidade fica fixa (senão o resultado dependeria da máquina)
+    nomes_niveis = [n["nome"] for n in NIVEIS_QUALIDADE]
+    agendador = AgendadorFrames(fps_target, aplicar=aplicar_qualidade,
+                                nivel_inicial=nomes_niveis.index(args.qualidade) if args.qualidade else 0,
+                                adaptativo=not (args.qualidade or args.replay))
+
+    tempos_passo = []
+    inicio_total = time.perf_counter()
+
+    ultimo_seq_inferencia = -1
+    primeiro_frame = True
+
+    while True:
+        start_time_frame = time.monotonic()
+        instr.novo_frame(current_screen)
+        contador_alocacoes.novo_frame()
+        
+        success, img_raw, frame_timestamp, frame_seq = fonte.ler()
+        agendador.iniciar_frame(frame_timestamp) # A espera pela câmera não conta como trabalho do frame
+        instr.marca("captura")
+        if not success:
+            if not args.replay and args.quiosque is None: # No quiosque, o supervisor pediu para parar
+                print("Erro ao abrir câmera.")
+            break
+        if img_raw is None: # Câmera ainda abrindo
+            continue
+
+        inferencia.duas_maos = current_screen == "GESTOS" # A 2ª mão só é procurada na tela toda
+        inferencia.enviar(img_raw, frame_timestamp, frame_seq)
+        results = inferencia.resultado()
+        instr.marca("inferencia")
+        if results.seq != ultimo_seq_inferencia:
+            instr.registrar("hands.process", results.duracao) # Tempo na thread de inferência
+            ultimo_seq_inferencia = results.seq
+        relogio = fonte.relogio if args.replay else start_time_frame
+        if args.replay and fonte.latencia is not None and hasattr(filtro_cursor, "latencia"):
+            filtro_cursor.latencia = fonte.latencia # A mesma estimativa que o preditor usou ao vivo
+
+        if gravador is not None:
+            gravador.gravar(img_raw, results, relogio, frame_seq, getattr(filtro_cursor, "latencia", 0.0))
+            instr.marca("gravacao")
+
+        t_passo = time.perf_counter()
+        img = passo(img_raw, results, relogio)
+        tempos_passo.append(time.perf_counter() - t_passo)
+        if gravador_clipe is not None and current_screen == "JOGO" and game_state == "PLAYING":
+            gravador_clipe.adicionar(img, relogio) # Antes do HUD / rodapé, que não vão para o clipe
+            instr.marca("clipe")
+
+        # Mostrar Imagem Final
+        acompanhar_inicializacao(inferencia)
+        desenhar_carregamento(img)
+        instr.desenhar_hud(img)
+        if instr.ativo and instr.hud_visivel:
+            cv2.putText(img, f"Qualidade {agendador.qualidade} | prazos perdidos {agendador.prazos_perdidos}",
+                        (10, HEIGHT - 15), cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 255, 0), 1)
+        saida.mostrar(img)
+        if primeiro_frame:
+            linha_do_tempo.marcar("primeiro frame na tela")
+            primeiro_frame = False
+        instr.marca("imshow")
+
+        # Latência captura -> tela do landmark usado, para o preditor do cursor
+        # (no replay vem da sessão gravada, junto com cada frame)
+        if not args.replay and results.timestamp and hasattr(filtro_cursor, "latencia"):
+            latencia = min(0.2, max(0.0, time.monotonic() - results.timestamp))
+            filtro_cursor.latencia += 0.05 * (latencia - filtro_cursor.latencia)
+
+        key = saida.tecla()
+        instr.marca("waitKey")
+        contador_alocacoes.fim_frame()
+
+        # --- Controle de FPS --- (replay sem --tempo-real roda o mais rápido possível)
+        if not args.replay:
+            agendador.esperar(getattr(fonte, "aguardar_frame", None)) # Acorda com o frame novo da câmera
+            instr.marca("espera")
+        if key == 27 or key == ord('q'): # Pressione ESC ou 'q' para sair
+            break
+        if key == ord('h'): # Liga/desliga o HUD de métricas
+            instr.hud_visivel = not instr.hud_visivel
+
+    # limpeza
+    if instr.ativo:
+        instr.exportar()
+        for tela, estagio, p50, p95, p99, n in instr.percentis():
+            if tela == instr.TODAS:
+                print(f"  {estagio:16s} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  p99 {p99:7.2f} ms  ({n} amostras)")
+    if args.replay and tempos_passo:
+        total = time.perf_counter() - inicio_total
+        tempos_ms = np.array(tempos_passo) * 1000
+        print(f"Replay: {len(tempos_passo)} frames em {total:.2f}s ({len(tempos_passo) / total:.1f} fps) | "
+              f"passo: media {tempos_ms.mean():.2f} ms, p95 {np.percentile(tempos_ms, 95):.2f} ms, "
+              f"max {tempos_ms.max():.2f} ms")
+    print(f"Inicializacao: {linha_do_tempo.resumo()}")
+    print(f"Captura: {fonte.estatisticas()}")
+    if not args.replay:
+        print(f"Agendador: {agendador.estado()}")
+    print(f"Inferencia: {inferencia.estatisticas()}")
+    print(f"Buffers: {pool_frames.estatisticas()}")
+    if contador_alocacoes.ativo:
+        print(f"Alocacoes: {contador_alocacoes.resumo()}")
+    if gravador is not None:
+        gravador.fechar()
+    fonte.parar()
+    inferencia.parar()
+    if gravador_clipe is not None:
+        gravador_clipe.encerrar()
+        print(f"Clipes: {gravador_clipe.estatisticas()}")
+    salvador.encerrar() # Garante que nenhuma foto/score se perca
+    escritor_placar.encerrar()
+    saida.fechar()
+    audio_jogo.encerrar()
+
+
+if __name__ == "__main__":
+    main()
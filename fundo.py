@@ -0,0 +1,66 @@
+import cv2
+import numpy as np
+
+
+class EfeitoFundo:
+    """
+    Efeito de fundo da tela do JOGO, sem alocar nada por frame.
+
+    Modos (do mais caro para o mais barato):
+    - "CINZA":      camera em tons de cinza + tinta
+    - "TINTA":      mistura a camera com a cor (o antigo addWeighted 50/50)
+    - "ESCURECER":  so escurece a camera (nivel = quanto escurece)
+    - "SUBSTITUIR": ignora a camera e pinta a cor solida
+    - "NENHUM":     camera sem efeito
+
+    TINTA/ESCURECER/CINZA usam uma LUT de 256 entradas por canal
+    (out = v * (1 - nivel) + cor * nivel), calculada uma vez.
+    """
+
+    MODOS = ("NENHUM", "TINTA", "ESCURECER", "CINZA", "SUBSTITUIR")
+
+    def __init__(self, largura, altura, cor=(255, 230, 200), nivel=0.5, modo="TINTA"):
+        self.largura = largura
+        self.altura = altura
+        self.cor = cor
+        self._saida = np.empty((altura, largura, 3), np.uint8)
+        self._cinza = np.empty((altura, largura), np.uint8)
+        self._camada = np.empty((altura, largura, 3), np.uint8)
+        self._lut = None
+        self.configurar(modo, nivel)
+
+    def configurar(self, modo=None, nivel=None):
+        if modo is not None:
+            if modo not in self.MODOS:
+                raise ValueError(f"Modo de fundo invalido: {modo} (use um de {self.MODOS})")
+            self.modo = modo
+        if nivel is not None:
+            self.nivel = min(1.0, max(0.0, float(nivel)))
+
+        # Camada constante (usada no modo SUBSTITUIR)
+        self._camada[:] = self.cor
+
+        # LUT por canal
+        cor_lut = (0, 0, 0) if self.modo == "ESCURECER" else self.cor
+        v = np.arange(256, dtype=np.float32)
+        lut = np.empty((1, 256, 3), np.uint8)
+        for c in range(3):
+            lut[0, :, c] = np.clip(v * (1 - self.nivel) + cor_lut[c] * self.nivel + 0.5, 0, 255)
+        self._lut = lut
+
+    def aplicar(self, img):
+        """
+        Retorna a imagem com o efeito. O resultado fica num buffer interno,
+        reaproveitado no proximo frame (nao guardar a referencia).
+        """
+        if self.modo == "NENHUM":
+            return img
+        if self.modo == "SUBSTITUIR":
+            np.copyto(self._saida, self._camada)
+        elif self.modo == "CINZA":
+            cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=self._cinza)
+            cv2.cvtColor(self._cinza, cv2.COLOR_GRAY2BGR, dst=self._saida)
+            cv2.LUT(self._saida, self._lut, dst=self._saida)
+        else: # TINTA / ESCURECER
+            cv2.LUT(img, self._lut, dst=self._saida)
+        return self._saida
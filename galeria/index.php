@@ -9,53 +9,64 @@ $DB_CONFIG = [
     'database' => 'flappy_game_db'
 ];
 
+require_once __DIR__ . '/placar.php'; // ler_placar(), colunas_highscores(), foto_html(), clipe_html()
+
 $podium_scores = [];
 $gallery_images = [];
 $db_error = null;
 
-try {
-    // Tenta estabelecer a conexão
-    $conn = new mysqli(
-        $DB_CONFIG['host'], 
-        $DB_CONFIG['user'], 
-        $DB_CONFIG['password'], 
-        $DB_CONFIG['database']
-    );
-
-    // Verifica se houve erro na conexão
-    if ($conn->connect_error) {
-        throw new Exception("Falha na conexão com o MySQL: " . $conn->connect_error);
-    }
+// Snapshot do jogo (placar.py): pódio e galeria sem consultar o MySQL
+$placar = ler_placar();
+if ($placar) {
+    $podium_scores = array_slice($placar['top'], 0, 3);
+    $gallery_images = $placar['galeria'];
+} else {
+    try {
+        // Tenta estabelecer a conexão
+        $conn = new mysqli(
+            $DB_CONFIG['host'], 
+            $DB_CONFIG['user'], 
+            $DB_CONFIG['password'], 
+            $DB_CONFIG['database']
+        );
+
+        // Verifica se houve erro na conexão
+        if ($conn->connect_error) {
+            throw new Exception("Falha na conexão com o MySQL: " . $conn->connect_error);
+        }
 
-    // --------------------------------------------------------
-    // 2. BUSCA NO BANCO DE DADOS (DUAS BUSCAS SEPARADAS)
-    // --------------------------------------------------------
+        // --------------------------------------------------------
+        // 2. BUSCA NO BANCO DE DADOS (DUAS BUSCAS SEPARADAS)
+        // --------------------------------------------------------
     
-    // QUERY 1: PÓDIO (Top 3 scores do Jogo)
-    $sql_podium = "SELECT score, image_path FROM highscores WHERE score > 0 ORDER BY score DESC LIMIT 3";
-    $result_podium = $conn->query($sql_podium);
+        $colunas = colunas_highscores($conn, ['score', 'image_path', 'thumb_path', 'web_path', 'video_path']);
+
+        // QUERY 1: PÓDIO (Top 3 scores do Jogo)
+        $sql_podium = "SELECT $colunas FROM highscores WHERE score > 0 ORDER BY score DESC LIMIT 3";
+        $result_podium = $conn->query($sql_podium);
     
-    if ($result_podium && $result_podium->num_rows > 0) {
-        while($row = $result_podium->fetch_assoc()) {
-            $podium_scores[] = $row;
+        if ($result_podium && $result_podium->num_rows > 0) {
+            while($row = $result_podium->fetch_assoc()) {
+                $podium_scores[] = $row;
+            }
         }
-    }
 
-    // QUERY 2: GALERIA (Fotos normais/desenho, score = 0)
-    $sql_gallery = "SELECT score, image_path FROM highscores WHERE score = 0 ORDER BY id DESC LIMIT 50";
-    $result_gallery = $conn->query($sql_gallery);
+        // QUERY 2: GALERIA (Fotos normais/desenho, score = 0)
+        $sql_gallery = "SELECT $colunas FROM highscores WHERE score = 0 ORDER BY id DESC LIMIT 50";
+        $result_gallery = $conn->query($sql_gallery);
     
-    if ($result_gallery && $result_gallery->num_rows > 0) {
-        while($row = $result_gallery->fetch_assoc()) {
-            $gallery_images[] = $row;
+        if ($result_gallery && $result_gallery->num_rows > 0) {
+            while($row = $result_gallery->fetch_assoc()) {
+                $gallery_images[] = $row;
+            }
         }
-    }
 
-    $conn->close();
+        $conn->close();
 
-} catch (Exception $e) {
-    $db_error = $e->getMessage();
-    error_log("Erro no Ranking: " . $db_error);
+    } catch (Exception $e) {
+        $db_error = $e->getMessage();
+        error_log("Erro no Ranking: " . $db_error);
+    }
 }
 ?>
 
@@ -106,39 +117,42 @@ try {
 
                     <!-- Pódio 2 (Esquerda) -->
                     <div class="podium-item rank-2">
-                        <?php if ($rank_2): $image_path = "../fotos/" . $rank_2['image_path']; ?>
+                        <?php if ($rank_2): ?>
                             <div class="podium-image-box">
-                                <img src="<?php echo $image_path; ?>" alt="Score <?php echo $rank_2['score']; ?>" class="podium-image">
+                                <?php echo foto_html($rank_2, 'web_path', 'podium-image', "Score " . $rank_2['score']); ?>
                             </div>
                             <div class="item-info">
                                 <span class="rank">2º</span>
                                 <p class="votes"><?php echo $rank_2['score']; ?> Pontos</p>
+                                <?php echo clipe_html($rank_2); ?>
                             </div>
                         <?php endif; ?>
                     </div>
 
                     <!-- Pódio 1 (Centro) -->
                     <div class="podium-item rank-1">
-                        <?php if ($rank_1): $image_path = "../fotos/" . $rank_1['image_path']; ?>
+                        <?php if ($rank_1): ?>
                             <div class="podium-image-box">
-                                <img src="<?php echo $image_path; ?>" alt="Score <?php echo $rank_1['score']; ?>" class="podium-image">
+                                <?php echo foto_html($rank_1, 'web_path', 'podium-image', "Score " . $rank_1['score']); ?>
                             </div>
                             <div class="item-info">
                                 <span class="rank">1º</span>
                                 <p class="votes"><?php echo $rank_1['score']; ?> Pontos</p>
+                                <?php echo clipe_html($rank_1); ?>
                             </div>
                         <?php endif; ?>
                     </div>
 
                     <!-- Pódio 3 (Direita) -->
                     <div class="podium-item rank-3">
-                         <?php if ($rank_3): $image_path = "../fotos/" . $rank_3['image_path']; ?>
+                         <?php if ($rank_3): ?>
                             <div class="podium-image-box">
-                                <img src="<?php echo $image_path; ?>" alt="Score <?php echo $rank_3['score']; ?>" class="podium-image">
+                                <?php echo foto_html($rank_3, 'web_path', 'podium-image', "Score " . $rank_3['score']); ?>
                             </div>
                             <div class="item-info">
                                 <span class="rank">3º</span>
                                 <p class="votes"><?php echo $rank_3['score']; ?> Pontos</p>
+                                <?php echo clipe_html($rank_3); ?>
                             </div>
                         <?php endif; ?>
                     </div>
@@ -158,7 +172,7 @@ try {
                         <?php $image_path = "../fotos/" . $item['image_path']; ?> 
                         <!-- MUDANÇA: Adicionado <a> para download -->
                         <div class="gallery-item">
-                            <img src="<?php echo $image_path; ?>" alt="Foto da Galeria" class="gallery-image">
+                            <?php echo foto_html($item, 'thumb_path', 'gallery-image', "Foto da Galeria"); ?>
                             <!-- Botão de Download Adicionado -->
                             <a href="<?php echo $image_path; ?>" download class="download-btn" title="Baixar foto">
                                 <svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path><polyline points="7 10 12 15 17 10"></polyline><line x1="12" y1="15" x2="12" y2="3"></line></svg>
@@ -0,0 +1,71 @@
+<?php
+// --------------------------------------------------------
+// Snapshot do placar (gerado pelo placar.py do jogo)
+// --------------------------------------------------------
+// O jogo mantem o top, os ultimos jogos e a galeria em memoria e grava
+// dados/placar.json a cada score (escrita atomica). As paginas leem daqui
+// e so vao ao MySQL se o arquivo nao existir ou para paginas alem do snapshot.
+// Aqui ficam tambem as funcoes usadas pelas duas paginas (colunas_highscores, foto_html, clipe_html).
+
+const PLACAR_FORMATO = 1;
+const POR_PAGINA = 50;
+
+function ler_placar() {
+    $caminho = __DIR__ . '/dados/placar.json';
+    if (!is_file($caminho)) {
+        return null;
+    }
+    $dados = json_decode(file_get_contents($caminho), true);
+    if (!is_array($dados) || ($dados['formato'] ?? null) !== PLACAR_FORMATO) {
+        return null;
+    }
+    return $dados;
+}
+
+// Lista de colunas para o SELECT do highscores. As colunas dos derivados e do clipe
+// (thumb_path, web_path, video_path) sao criadas pelo jogo na primeira conexao
+// (banco.garantir_colunas_derivados); num banco ainda nao migrado elas viram NULL
+// em vez de quebrar a consulta.
+const COLUNAS_OPCIONAIS = ['thumb_path', 'web_path', 'video_path'];
+
+function colunas_highscores($conn, $colunas) {
+    $existentes = [];
+    $result = $conn->query("SHOW COLUMNS FROM highscores");
+    if ($result) {
+        while ($row = $result->fetch_assoc()) {
+            $existentes[$row['Field']] = true;
+        }
+    }
+    $partes = [];
+    foreach ($colunas as $coluna) {
+        $partes[] = (in_array($coluna, COLUNAS_OPCIONAIS) && !isset($existentes[$coluna])) ? "NULL AS $coluna" : $coluna;
+    }
+    return implode(', ', $partes);
+}
+
+// Miniatura / versao web (geradas pelo derivados.py) com WebP e o JPEG de reserva.
+// Sem derivado (fotos antigas ainda nao reprocessadas) usa a original.
+function foto_html($item, $coluna, $classe, $alt) {
+    $original = "../fotos/" . $item['image_path'];
+    $grande = !empty($item['web_path']) ? "../fotos/" . $item['web_path'] : $original;
+    $atributos = 'alt="' . htmlspecialchars($alt) . '" class="' . $classe . '" loading="lazy"'
+               . ' data-grande="' . htmlspecialchars($grande) . '" data-original="' . htmlspecialchars($original) . '"';
+    if (empty($item[$coluna])) {
+        return '<img src="' . htmlspecialchars($original) . '" ' . $atributos . '>';
+    }
+    $jpg = "../fotos/" . $item[$coluna];
+    $webp = substr($jpg, 0, -4) . ".webp";
+    return '<picture><source srcset="' . htmlspecialchars($webp) . '" type="image/webp">'
+         . '<img src="' . htmlspecialchars($jpg) . '" ' . $atributos . '></picture>';
+}
+
+// Clipe da partida (clipe.py do jogo). O nome vai para o banco junto com a foto,
+// mas o video termina de gravar alguns segundos depois: so mostra o link se ja existir.
+function clipe_html($item, $classe = 'download-btn-table') {
+    if (empty($item['video_path']) || !is_file(__DIR__ . '/../fotos/' . $item['video_path'])) {
+        return '';
+    }
+    return '<a href="../fotos/' . htmlspecialchars($item['video_path']) . '" target="_blank" class="' . $classe . '" title="Ver o clipe da partida">'
+         . '<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><polygon points="6 3 20 12 6 21 6 3"></polygon></svg>'
+         . '</a>';
+}
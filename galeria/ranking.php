@@ -9,58 +9,86 @@ $DB_CONFIG = [
     'database' => 'flappy_game_db'
 ];
 
+require_once __DIR__ . '/placar.php'; // ler_placar(), colunas_highscores(), foto_html(), clipe_html()
+
 $all_scores = [];
 $db_error = null;
 
 // --- MUDANÇA: Lógica de Ordenação ---
 // Verifica o parâmetro na URL. O padrão é 'top'.
 $sort_mode = $_GET['sort'] ?? 'top'; 
-$page_title = "Ranking Geral";
-
-try {
-    // Tenta estabelecer a conexão
-    $conn = new mysqli(
-        $DB_CONFIG['host'], 
-        $DB_CONFIG['user'], 
-        $DB_CONFIG['password'], 
-        $DB_CONFIG['database']
-    );
-
-    // Verifica se houve erro na conexão
-    if ($conn->connect_error) {
-        throw new Exception("Falha na conexão com o MySQL: " . $conn->connect_error);
+$page_title = ($sort_mode === 'recent') ? "Ranking (Últimos Jogos)" : "Ranking (Top Scores)";
+
+// Paginação: POR_PAGINA linhas por vez (nada de carregar a tabela inteira)
+$pagina = max(1, (int)($_GET['pagina'] ?? 1));
+$offset = ($pagina - 1) * POR_PAGINA;
+$total_jogos = 0;
+
+// Primeiro o snapshot do jogo (sem MySQL); ele cobre as primeiras páginas
+$placar = ler_placar();
+$lista = null;
+if ($placar) {
+    $lista = ($sort_mode === 'recent') ? $placar['recentes'] : $placar['top'];
+    $total_jogos = $placar['total_jogos'];
+    if ($offset + POR_PAGINA <= count($lista) || count($lista) >= $total_jogos) {
+        $all_scores = array_slice($lista, $offset, POR_PAGINA);
+    } else {
+        $lista = null; // Página além do snapshot: busca no banco
     }
+}
 
-    // --------------------------------------------------------
-    // 2. BUSCA NO BANCO DE DADOS (TODOS OS SCORES)
-    // --------------------------------------------------------
-    
-    // Busca apenas scores MAIORES que 0
-    $sql_all = "SELECT score, image_path, created_at FROM highscores WHERE score > 0";
+if ($lista === null) {
+    try {
+        // Tenta estabelecer a conexão
+        $conn = new mysqli(
+            $DB_CONFIG['host'], 
+            $DB_CONFIG['user'], 
+            $DB_CONFIG['password'], 
+            $DB_CONFIG['database']
+        );
+
+        // Verifica se houve erro na conexão
+        if ($conn->connect_error) {
+            throw new Exception("Falha na conexão com o MySQL: " . $conn->connect_error);
+        }
 
-    // Adiciona a ordenação baseada no $sort_mode
-    if ($sort_mode === 'recent') {
-        $sql_all .= " ORDER BY id DESC"; // 'id DESC' = Mais recentes primeiro
-        $page_title = "Ranking (Últimos Jogos)";
-    } else {
-        $sql_all .= " ORDER BY score DESC, id DESC"; // 'score DESC' = Top scores
-        $page_title = "Ranking (Top Scores)";
-    }
+        // --------------------------------------------------------
+        // 2. BUSCA NO BANCO DE DADOS (UMA PÁGINA DE SCORES)
+        // --------------------------------------------------------
+    
+        // Busca apenas scores MAIORES que 0
+        $colunas = colunas_highscores($conn, ['score', 'image_path', 'thumb_path', 'web_path', 'video_path', 'created_at']);
+        $sql_all = "SELECT $colunas FROM highscores WHERE score > 0";
+
+        // Adiciona a ordenação baseada no $sort_mode
+        if ($sort_mode === 'recent') {
+            $sql_all .= " ORDER BY id DESC"; // 'id DESC' = Mais recentes primeiro
+        } else {
+            $sql_all .= " ORDER BY score DESC, id DESC"; // 'score DESC' = Top scores
+        }
+        $sql_all .= " LIMIT " . POR_PAGINA . " OFFSET " . $offset;
 
-    $result_all = $conn->query($sql_all);
+        $result_all = $conn->query($sql_all);
     
-    if ($result_all && $result_all->num_rows > 0) {
-        while($row = $result_all->fetch_assoc()) {
-            $all_scores[] = $row;
+        if ($result_all && $result_all->num_rows > 0) {
+            while($row = $result_all->fetch_assoc()) {
+                $all_scores[] = $row;
+            }
         }
-    }
 
-    $conn->close();
+        if (!$placar) {
+            $result_total = $conn->query("SELECT COUNT(*) AS total FROM highscores WHERE score > 0");
+            $total_jogos = $result_total ? (int)$result_total->fetch_assoc()['total'] : 0;
+        }
 
-} catch (Exception $e) {
-    $db_error = $e->getMessage();
-    error_log("Erro no Ranking Geral: " . $db_error);
+        $conn->close();
+
+    } catch (Exception $e) {
+        $db_error = $e->getMessage();
+        error_log("Erro no Ranking Geral: " . $db_error);
+    }
 }
+$total_paginas = max(1, (int)ceil($total_jogos / POR_PAGINA));
 // --- Fim da Mudança ---
 ?>
 
@@ -126,10 +154,10 @@ try {
                         <?php if (count($all_scores) > 0): ?>
                             <?php foreach ($all_scores as $index => $item): ?>
                                 <tr>
-                                    <td class="rank-number"><?php echo $index + 1; ?></td>
+                                    <td class="rank-number"><?php echo $offset + $index + 1; ?></td>
                                     <td class="player-score"><?php echo $item['score']; ?> Pontos</td>
                                     <td class="player-image">
-                                        <img src="../fotos/<?php echo $item['image_path']; ?>" alt="Score <?php echo $item['score']; ?>" class="table-image">
+                                        <?php echo foto_html($item, 'thumb_path', 'table-image', "Score " . $item['score']); ?>
                                     </td>
                                     <td class="player-date"><?php echo date("d/m/Y H:i", strtotime($item['created_at'])); ?></td>
                                     <!-- MUDANÇA: Botão de Download na Tabela -->
@@ -137,6 +165,7 @@ try {
                                         <a href="../fotos/<?php echo $item['image_path']; ?>" download="<?php echo $item['image_path']; ?>" class="download-btn-table" title="Baixar foto">
                                             <svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path><polyline points="7 10 12 15 17 10"></polyline><line x1="12" y1="15" x2="12" y2="3"></line></svg>
                                         </a>
+                                        <?php echo clipe_html($item); ?>
                                     </td>
                                     <!-- Fim da Mudança -->
                                 </tr>
@@ -150,6 +179,19 @@ try {
                 </table>
             </div>
 
+            <!-- Paginação -->
+            <?php if ($total_paginas > 1): ?>
+                <div class="sort-toggle-container">
+                    <?php if ($pagina > 1): ?>
+                        <a href="ranking.php?sort=<?php echo urlencode($sort_mode); ?>&pagina=<?php echo $pagina - 1; ?>" class="sort-toggle-btn">« Anterior</a>
+                    <?php endif; ?>
+                    <span class="sort-toggle-btn active">Página <?php echo $pagina; ?> de <?php echo $total_paginas; ?></span>
+                    <?php if ($pagina < $total_paginas): ?>
+                        <a href="ranking.php?sort=<?php echo urlencode($sort_mode); ?>&pagina=<?php echo $pagina + 1; ?>" class="sort-toggle-btn">Próxima »</a>
+                    <?php endif; ?>
+                </div>
+            <?php endif; ?>
+
         </section>
     </main>
 
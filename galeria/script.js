@@ -4,6 +4,7 @@ document.addEventListener('DOMContentLoaded', function() {
     var modalImg = document.getElementById("modalImage");
     var captionText = document.getElementById("caption");
     var closeButton = document.querySelector(".close-button");
+    var downloadButton = document.getElementById("modalDownloadBtn");
 
     // 2. MUDANÇA: Seleciona as imagens do PÓDIO, GALERIA e da NOVA TABELA
     var images = document.querySelectorAll('.podium-image, .gallery-item img, .table-image');
@@ -12,7 +13,11 @@ document.addEventListener('DOMContentLoaded', function() {
     images.forEach(function(img) {
         img.onclick = function(){
             modal.style.display = "block";
-            modalImg.src = this.src;
+            // Pagina mostra a miniatura; o modal abre a versao web e o download e sempre a original
+            modalImg.src = this.dataset.grande || this.src;
+            if (downloadButton) {
+                downloadButton.href = this.dataset.original || this.src;
+            }
             
             // Tenta obter a pontuação do atributo alt
             var scoreText = "Foto da Galeria"; // Padrão
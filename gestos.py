@@ -0,0 +1,123 @@
+import json
+import os
+
+# Ordem dos dedos na mascara: bit 0 = polegar ... bit 4 = mindinho
+DEDOS = ("polegar", "indicador", "medio", "anelar", "mindinho")
+
+# Tabela usada se nao houver gestos.json. "dedos": polegar..mindinho, 1 = esticado,
+# 0 = dobrado, x = tanto faz. Em caso de conflito vale o primeiro da lista.
+CONFIG_PADRAO = {
+    "janela": 5,        # frames na votacao
+    "votos_entrar": 3,  # votos para um gesto virar o estavel (sem gesto estavel: entra em votos_entrar frames)
+    "votos_manter": 2,  # um gesto estavel so e trocado se tiver MENOS que isso ("nenhum" nao segura)
+    "gestos": [
+        {"nome": "punho", "texto": "Punho Fechado", "dedos": "00000"},
+        {"nome": "apontando", "texto": "Apontando (1)", "dedos": "01000"},
+        {"nome": "paz", "texto": "Paz (2)", "dedos": "01100"},
+        {"nome": "joia", "texto": "Joia", "dedos": "10000"},
+        {"nome": "mao_aberta", "texto": "Mao Aberta (5)", "dedos": "11111"},
+    ],
+}
+
+
+class Gesto:
+    __slots__ = ("id", "nome", "texto")
+
+    def __init__(self, id, nome, texto):
+        self.id = id
+        self.nome = nome
+        self.texto = texto
+
+    def __repr__(self):
+        return f"Gesto({self.nome!r})"
+
+
+NENHUM = Gesto(0, "", "")
+
+
+def compilar_tabela(gestos):
+    """Lista de gestos + tabela de 32 posicoes (mascara -> Gesto)."""
+    lista = [NENHUM]
+    tabela = [NENHUM] * 32
+    for item in gestos:
+        padrao = item["dedos"]
+        if len(padrao) != 5 or set(padrao) - set("01x"):
+            raise ValueError(f"Gesto '{item['nome']}': 'dedos' deve ter 5 caracteres 0/1/x (polegar..mindinho)")
+        gesto = Gesto(len(lista), item["nome"], item.get("texto", item["nome"]))
+        lista.append(gesto)
+        for mascara in range(32):
+            if tabela[mascara] is NENHUM and all(c == "x" or int(c) == (mascara >> i) & 1
+                                                 for i, c in enumerate(padrao)):
+                tabela[mascara] = gesto
+    return lista, tabela
+
+
+def carregar_config(caminho="gestos.json"):
+    if not os.path.exists(caminho):
+        return CONFIG_PADRAO
+    with open(caminho, encoding="utf-8") as f:
+        config = dict(CONFIG_PADRAO, **json.load(f))
+    print(f"Gestos carregados de '{caminho}' ({len(config['gestos'])} gestos).")
+    return config
+
+
+class MotorGestos:
+    """
+    Mascara de dedos -> gesto (consulta na tabela) -> votacao nos ultimos
+    'janela' frames -> gesto estavel.
+
+    A votacao guarda a contagem de cada gesto e um anel com os ids da janela:
+    a cada frame sai um voto e entra outro, sem montar Counter nem lista nova.
+    Um gesto entra com votos_entrar votos. So um gesto de verdade segura o
+    lugar (votos_manter): a janela comeca cheia de "nenhum" e, se ele
+    segurasse, o primeiro gesto levaria janela - votos_manter + 1 frames.
+    Quem quiser saber quando o gesto estavel muda usa assinar(funcao); a
+    funcao recebe (anterior, novo, relogio).
+    """
+
+    def __init__(self, config=None):
+        config = config or CONFIG_PADRAO
+        self.gestos, self._tabela = compilar_tabela(config["gestos"])
+        self.por_nome = {g.nome: g for g in self.gestos}
+        self.janela = config["janela"]
+        self.votos_entrar = config["votos_entrar"]
+        self.votos_manter = config["votos_manter"]
+        self._assinantes = []
+
+        self._votos = [0] * len(self.gestos)
+        self._anel = [0] * self.janela
+        self._pos = 0
+        self.reiniciar()
+
+    def assinar(self, funcao):
+        self._assinantes.append(funcao)
+        return funcao
+
+    def reiniciar(self):
+        for i in range(len(self._votos)):
+            self._votos[i] = 0
+        for i in range(self.janela):
+            self._anel[i] = 0
+        self._votos[0] = self.janela # Janela comeca cheia de "nenhum"
+        self.atual = NENHUM
+        self.estavel = NENHUM
+
+    def classificar(self, mascara):
+        return NENHUM if mascara is None else self._tabela[mascara]
+
+    def atualizar(self, mascara, relogio=0.0):
+        """mascara: int de 5 bits da mao de navegacao (None = sem mao). Retorna o gesto estavel."""
+        self.atual = gesto = self.classificar(mascara)
+
+        saindo = self._anel[self._pos]
+        self._anel[self._pos] = gesto.id
+        self._pos = (self._pos + 1) % self.janela
+        self._votos[saindo] -= 1
+        self._votos[gesto.id] += 1
+
+        if (gesto is not self.estavel and self._votos[gesto.id] >= self.votos_entrar
+                and (self.estavel is NENHUM or self._votos[self.estavel.id] < self.votos_manter)):
+            anterior, self.estavel = self.estavel, gesto
+            for funcao in self._assinantes:
+                funcao(anterior, gesto, relogio)
+        return self.estavel
@@ -0,0 +1,279 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from buffers import PoolFrames
+
+
+class ResultadoMaos:
+    """
+    Resultado de uma inferencia do MediaPipe, com os mesmos campos que o loop
+    principal ja usava (multi_hand_landmarks / multi_handedness) mais o
+    timestamp e a sequencia do frame de origem.
+    """
+    __slots__ = ("multi_hand_landmarks", "multi_handedness", "timestamp", "seq", "duracao")
+
+    def __init__(self, multi_hand_landmarks=None, multi_handedness=None, timestamp=0.0, seq=0, duracao=0.0):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+        self.timestamp = timestamp
+        self.seq = seq
+        self.duracao = duracao
+
+
+def criar_hands(**opcoes_hands):
+    # mediapipe so e importado aqui: o import + o modelo levam segundos, e a
+    # camera ja pode aparecer enquanto isso (ver InferenciaMaos)
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(**opcoes_hands)
+
+
+class InferenciaMaos:
+    """
+    Roda o mp_hands.Hands fora do loop de renderizacao.
+
+    - assincrono=True: uma thread processa sempre o frame mais novo. Se ela
+      estiver atrasada, os frames intermediarios sao pulados (sem fila).
+    - assincrono=False: processa na hora, igual ao comportamento antigo
+      (bom para comparar).
+
+    Os frames recebidos sao os CRUS da camera; o espelhamento e a conversao
+    para RGB sao feitos aqui dentro.
+
+    roi=True liga o rastreamento por regiao: depois que a mao de navegacao
+    e achada, so um quadrado em volta dela (com margem) e recortado, reduzido
+    para tamanho_roi x tamanho_roi e processado; os landmarks voltam para as
+    coordenadas da tela inteira. A busca na tela inteira volta quando a mao
+    some, a cada 'intervalo_busca' frames (para achar a mao direita se a
+    rastreada for a esquerda) e enquanto duas_maos=True (tela GESTOS).
+
+    No modo assincrono o MediaPipe e carregado (e aquecido com um frame
+    vazio) dentro da propria thread: o construtor volta na hora e, ate
+    'estado' virar "pronto", resultado() devolve um resultado sem maos.
+    """
+
+    def __init__(self, assincrono=True, roi=False, tamanho_roi=256, margem_roi=0.6,
+                 intervalo_busca=30, pool=None, **opcoes_hands):
+        self.assincrono = assincrono
+        self.pool = pool if pool is not None else PoolFrames() # Buffers do resize / RGB (dst=)
+        self.opcoes_hands = dict(opcoes_hands)
+        self.hands = None # Criados no _carregar()
+        self.hands_roi = None
+        self.estado = "carregando" # -> "pronto" (ou "erro")
+        self.tempo_carga = 0.0
+        self.escala = 1.0 # Escala do frame de entrada (qualidade adaptativa)
+        self._nova_complexidade = None
+
+        # Rastreamento por regiao: um Hands separado, para o tracking de cada
+        # modo nao se confundir com as coordenadas do outro
+        self.roi = roi
+        self.tamanho_roi = tamanho_roi
+        self.margem_roi = margem_roi
+        self.intervalo_busca = intervalo_busca
+        self.duas_maos = False
+        self._caixa_roi = None # (x1, y1, lado) no frame cru
+        self._frames_desde_busca = 0
+        self.frames_roi = 0
+        self.frames_tela_inteira = 0
+        self.rastreamento_perdido = 0
+
+        self._resultado = ResultadoMaos()
+        self._pendente = None # (frame, timestamp, seq)
+        self._cond = threading.Condition()
+
+        self.frames_processados = 0
+        self.frames_pulados = 0
+        self._ultimo_seq_enviado = -1
+
+        self._rodando = False
+        self._thread = None
+        if not self.assincrono:
+            self._carregar() # Sincrono (replay / comparacao): carrega na hora, como antes
+        else:
+            self._rodando = True
+            self._thread = threading.Thread(target=self._loop_inferencia, name="inferencia-maos", daemon=True)
+            self._thread.start()
+
+    def definir_complexidade(self, model_complexity):
+        """Troca o model_complexity do Hands (aplicado antes da proxima inferencia)."""
+        if self.opcoes_hands.get("model_complexity", 1) != model_complexity:
+            self._nova_complexidade = model_complexity
+
+    def _carregar(self):
+        inicio = time.perf_counter()
+        if self._nova_complexidade is not None: # Qualidade trocada antes de carregar
+            self.opcoes_hands["model_complexity"] = self._nova_complexidade
+            self._nova_complexidade = None
+        self.hands = criar_hands(**self.opcoes_hands)
+        if self.roi:
+            self.hands_roi = criar_hands(**dict(self.opcoes_hands, max_num_hands=1))
+        # O primeiro process() monta o grafo do MediaPipe (lento): faz agora, com um frame vazio
+        self.hands.process(np.zeros((self.tamanho_roi, self.tamanho_roi, 3), np.uint8))
+        self.tempo_carga = time.perf_counter() - inicio
+        self.estado = "pronto"
+
+    def _trocar_complexidade(self):
+        self.opcoes_hands["model_complexity"] = self._nova_complexidade
+        self._nova_complexidade = None
+        self.hands.close()
+        self.hands = criar_hands(**self.opcoes_hands)
+        if self.hands_roi is not None:
+            self.hands_roi.close()
+            self.hands_roi = criar_hands(**dict(self.opcoes_hands, max_num_hands=1))
+
+    def _tela_inteira(self, frame_raw):
+        self.frames_tela_inteira += 1
+        if self.escala != 1.0:
+            # Landmarks sao normalizados (0..1), entao reduzir a entrada nao muda as coordenadas
+            altura, largura = frame_raw.shape[:2]
+            tamanho = (max(1, round(largura * self.escala)), max(1, round(altura * self.escala)))
+            frame_raw = cv2.resize(frame_raw, tamanho, dst=self.pool.obter((tamanho[1], tamanho[0], 3)),
+                                   interpolation=cv2.INTER_AREA)
+        img_rgb = cv2.cvtColor(frame_raw, cv2.COLOR_BGR2RGB, dst=self.pool.obter(frame_raw.shape))
+        cv2.flip(img_rgb, 1, img_rgb) # Espelha no lugar, igual a imagem exibida
+        results = self.hands.process(img_rgb)
+        return results.multi_hand_landmarks, results.multi_handedness
+
+    def _na_roi(self, frame_raw):
+        self.frames_roi += 1
+        altura, largura = frame_raw.shape[:2]
+        x1, y1, lado = self._caixa_roi
+        recorte = frame_raw[y1:y1 + lado, x1:x1 + lado]
+        interpolacao = cv2.INTER_AREA if lado > self.tamanho_roi else cv2.INTER_LINEAR
+        forma_roi = (self.tamanho_roi, self.tamanho_roi, 3)
+        pequeno = cv2.resize(recorte, forma_roi[:2], dst=self.pool.obter(forma_roi), interpolation=interpolacao)
+        img_rgb = cv2.cvtColor(pequeno, cv2.COLOR_BGR2RGB, dst=self.pool.obter(forma_roi)) # So o recorte e convertido
+        cv2.flip(img_rgb, 1, img_rgb)
+        results = self.hands_roi.process(img_rgb)
+        if not results.multi_hand_landmarks:
+            return None, None
+
+        # Recorte espelhado -> tela inteira espelhada (normalizado 0..1).
+        # O z do MediaPipe tem a escala do x, entao segue a mesma conta.
+        x_espelhado = largura - x1 - lado
+        for mao in results.multi_hand_landmarks:
+            for lm in mao.landmark:
+                lm.x = (x_espelhado + lm.x * lado) / largura
+                lm.y = (y1 + lm.y * lado) / altura
+                lm.z = lm.z * lado / largura
+        return results.multi_hand_landmarks, results.multi_handedness
+
+    def _atualizar_caixa(self, multi_hand_landmarks, multi_handedness, largura, altura):
+        """Quadrado (no frame cru) em volta da mao de navegacao, ou None."""
+        if not multi_hand_landmarks:
+            return None
+        indice = 0
+        for i, info in enumerate(multi_handedness):
+            if info.classification[0].label == "Right": # Mesma escolha do loop principal
+                indice = i
+                break
+        xs = [lm.x for lm in multi_hand_landmarks[indice].landmark]
+        ys = [lm.y for lm in multi_hand_landmarks[indice].landmark]
+        # Landmarks estao espelhados; o recorte e feito no frame cru
+        x_min, x_max = (1.0 - max(xs)) * largura, (1.0 - min(xs)) * largura
+        y_min, y_max = min(ys) * altura, max(ys) * altura
+        lado = int(max(x_max - x_min, y_max - y_min) * (1 + 2 * self.margem_roi))
+        lado = max(lado, self.tamanho_roi // 2)
+        if lado >= min(largura, altura):
+            return None # Mao muito grande (perto da camera): tela inteira mesmo
+        cx, cy = (x_min + x_max) / 2, (y_min + y_max) / 2
+        x1 = min(max(int(cx - lado / 2), 0), largura - lado)
+        y1 = min(max(int(cy - lado / 2), 0), altura - lado)
+        return (x1, y1, lado)
+
+    def _processar(self, frame_raw, timestamp, seq):
+        if self._nova_complexidade is not None:
+            self._trocar_complexidade()
+
+        inicio = time.perf_counter()
+        if not self.roi:
+            multi_hand_landmarks, multi_handedness = self._tela_inteira(frame_raw)
+        else:
+            usar_roi = (self._caixa_roi is not None and not self.duas_maos
+                        and self._frames_desde_busca < self.intervalo_busca)
+            multi_hand_landmarks = None
+            if usar_roi:
+                self._frames_desde_busca += 1
+                multi_hand_landmarks, multi_handedness = self._na_roi(frame_raw)
+                if not multi_hand_landmarks:
+                    self.rastreamento_perdido += 1
+            if not multi_hand_landmarks:
+                # Perdeu a mao (ou hora de procurar na tela toda): busca no frame inteiro
+                self._frames_desde_busca = 0
+                multi_hand_landmarks, multi_handedness = self._tela_inteira(frame_raw)
+            altura, largura = frame_raw.shape[:2]
+            self._caixa_roi = self._atualizar_caixa(multi_hand_landmarks, multi_handedness, largura, altura)
+
+        resultado = ResultadoMaos(multi_hand_landmarks, multi_handedness,
+                                  timestamp, seq, time.perf_counter() - inicio)
+        with self._cond:
+            self._resultado = resultado
+            self.frames_processados += 1
+
+    def _loop_inferencia(self):
+        try:
+            self._carregar()
+        except Exception as e:
+            print(f"ERRO: nao foi possivel carregar o MediaPipe: {e}")
+            print("O app continua sem deteccao de maos.")
+            self.estado = "erro"
+            return
+
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pendente is not None or not self._rodando)
+                if not self._rodando:
+                    break
+                frame_raw, timestamp, seq = self._pendente
+                self._pendente = None
+            self._processar(frame_raw, timestamp, seq)
+
+    def enviar(self, frame_raw, timestamp, seq):
+        """Entrega um frame novo para inferencia."""
+        # Mesmo frame da camera (duplicado): nao precisa processar de novo
+        if seq == self._ultimo_seq_enviado:
+            return
+        self._ultimo_seq_enviado = seq
+
+        if not self.assincrono:
+            self._processar(frame_raw, timestamp, seq)
+            return
+
+        with self._cond:
+            # Worker atrasado: o frame que ainda estava esperando e pulado
+            # (enquanto o MediaPipe carrega nao conta, so fica o mais novo)
+            if self._pendente is not None and self.estado == "pronto":
+                self.frames_pulados += 1
+            self._pendente = (frame_raw, timestamp, seq)
+            self._cond.notify()
+
+    def resultado(self):
+        """Resultado mais recente (pode ser de um frame anterior ao exibido)."""
+        with self._cond:
+            return self._resultado
+
+    def estatisticas(self):
+        with self._cond:
+            return {
+                "processados": self.frames_processados,
+                "pulados": self.frames_pulados,
+                "roi": self.frames_roi,
+                "tela_inteira": self.frames_tela_inteira,
+                "rastreamento_perdido": self.rastreamento_perdido,
+                "ultima_duracao_ms": round(self._resultado.duracao * 1000, 1),
+                "carga_ms": round(self.tempo_carga * 1000),
+            }
+
+    def parar(self):
+        with self._cond:
+            self._rodando = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self.hands is not None:
+            self.hands.close()
+        if self.hands_roi is not None:
+            self.hands_roi.close()
@@ -0,0 +1,154 @@
+import cv2
+import numpy as np
+
+from sprites import Sprite
+
+
+def is_cursor_in_rect(cursor_xy, rect):
+    x, y = cursor_xy
+    x1, y1, x2, y2 = rect
+    return x1 < x < x2 and y1 < y < y2
+
+
+def _desenhar_botao(img, rect, text, bg_color, is_selected, cor_unica=None):
+    """
+    Mesmo desenho do antigo draw_button (usado para pre-renderizar).
+    cor_unica: pinta tudo com uma cor so (para gerar a mascara de alfa).
+    """
+    x1, y1, x2, y2 = rect
+    cv2.rectangle(img, (x1, y1), (x2, y2), cor_unica or bg_color, -1)
+
+    border_color = (0, 255, 255) if is_selected else (255, 255, 255)
+    border_color = cor_unica or border_color
+    border_thickness = 4 if is_selected else 3
+    cv2.rectangle(img, (x1, y1), (x2, y2), border_color, border_thickness) # Borda
+
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    scale = 1.3
+    thickness = 3
+    text_size = cv2.getTextSize(text, font, scale, thickness)[0]
+    if text_size[0] > (x2 - x1 - 20):
+        scale = 1.0
+        text_size = cv2.getTextSize(text, font, scale, thickness)[0]
+
+    tx = x1 + (x2 - x1 - text_size[0]) // 2
+    ty = y1 + (y2 - y1 + text_size[1]) // 2
+    cv2.putText(img, text, (tx, ty), font, scale, cor_unica or (255, 255, 255), thickness)
+
+
+def _renderizar(desenhar, x1, y1, x2, y2):
+    """
+    Chama 'desenhar(img, dx, dy)' numa camada BGRA do tamanho da caixa
+    (x1, y1, x2, y2) e devolve um Sprite. O alfa e desenhado com as mesmas
+    chamadas, entao so o que foi pintado fica visivel.
+    """
+    w, h = x2 - x1, y2 - y1
+    cor = np.zeros((h, w, 3), np.uint8)
+    alfa = np.zeros((h, w, 3), np.uint8)
+    desenhar(cor, -x1, -y1, None)
+    desenhar(alfa, -x1, -y1, (255, 255, 255))
+    alfa = alfa[:, :, 0]
+    # Bordas suavizadas (anti-aliasing) foram misturadas com o preto do fundo:
+    # desfaz essa mistura para o Sprite nao escurecer o contorno duas vezes
+    parcial = (alfa > 0) & (alfa < 255)
+    cor[parcial] = np.clip(cor[parcial].astype(np.float32) * 255 / alfa[parcial, None], 0, 255).astype(np.uint8)
+    camada = np.dstack([cor, alfa])
+    return Sprite(camada)
+
+
+class Botao:
+    MARGEM = 4 # A borda grossa passa um pouco do retangulo
+
+    def __init__(self, id, rect, texto, bg_color=(60, 120, 190)):
+        self.id = id
+        self.rect = rect
+        self.texto = texto
+        self.bg_color = bg_color
+        self._cache = {} # is_selected -> Sprite
+
+    def definir(self, texto=None, bg_color=None):
+        """Muda texto/cor; so re-renderiza se algo mudou de verdade."""
+        texto = self.texto if texto is None else texto
+        bg_color = self.bg_color if bg_color is None else bg_color
+        if texto != self.texto or bg_color != self.bg_color:
+            self.texto, self.bg_color = texto, bg_color
+            self._cache.clear()
+
+    def _sprite(self, is_selected):
+        sprite = self._cache.get(is_selected)
+        if sprite is None:
+            x1, y1, x2, y2 = self.rect
+            m = self.MARGEM
+
+            def desenhar(img, dx, dy, cor_unica):
+                rect = (x1 + dx, y1 + dy, x2 + dx, y2 + dy)
+                _desenhar_botao(img, rect, self.texto, self.bg_color, is_selected, cor_unica)
+            sprite = _renderizar(desenhar, x1 - m, y1 - m, x2 + m + 1, y2 + m + 1)
+            self._cache[is_selected] = sprite
+        return sprite
+
+    def desenhar(self, img, is_selected=False):
+        m = self.MARGEM
+        self._sprite(is_selected).desenhar(img, self.rect[0] - m, self.rect[1] - m)
+
+
+class TextoContorno:
+    """Texto fixo com contorno preto (ex: titulo do MENU), pre-renderizado."""
+
+    def __init__(self, id, texto, pos, escala, espessura_contorno, espessura, cor=(255, 255, 255)):
+        self.id = id
+        self.texto = texto
+        self.pos = pos
+        self.escala = escala
+        self.espessura_contorno = espessura_contorno
+        self.espessura = espessura
+        self.cor = cor
+        self._sprite = None
+
+    def desenhar(self, img, is_selected=False):
+        if self._sprite is None:
+            font = cv2.FONT_HERSHEY_SIMPLEX
+            (tw, th), base = cv2.getTextSize(self.texto, font, self.escala, self.espessura_contorno)
+            m = self.espessura_contorno * 2 # Folga: o Sprite corta o que sobrar
+            x, y = self.pos
+            x1, y1, x2, y2 = x - m, y - th - m, x + tw + m, y + base + m
+
+            def desenhar(camada, dx, dy, cor_unica):
+                p = (x + dx, y + dy)
+                cv2.putText(camada, self.texto, p, font, self.escala, cor_unica or (0, 0, 0), self.espessura_contorno)
+                cv2.putText(camada, self.texto, p, font, self.escala, cor_unica or self.cor, self.espessura)
+            self._sprite = _renderizar(desenhar, x1, y1, x2, y2)
+            self._origem = (x1, y1)
+        self._sprite.desenhar(img, *self._origem)
+
+
+class TelaUI:
+    """
+    Registro dos widgets fixos de uma tela. Cada widget e renderizado uma vez
+    (por estado) e depois so copiado. O mesmo registro faz o hit-test.
+    """
+
+    def __init__(self):
+        self.widgets = {}
+
+    def adicionar_botao(self, id, rect, texto, bg_color=(60, 120, 190)):
+        self.widgets[id] = Botao(id, rect, texto, bg_color)
+        return self
+
+    def adicionar_texto(self, id, texto, pos, escala, espessura_contorno, espessura):
+        self.widgets[id] = TextoContorno(id, texto, pos, escala, espessura_contorno, espessura)
+        return self
+
+    def definir_botao(self, id, texto=None, bg_color=None):
+        self.widgets[id].definir(texto, bg_color)
+
+    def desenhar(self, img, selecionado=None):
+        for id, widget in self.widgets.items():
+            widget.desenhar(img, is_selected=(id == selecionado))
+
+    def botao_em(self, cursor_xy):
+        """Id do botao sob o cursor (ou None)."""
+        for id, widget in self.widgets.items():
+            if isinstance(widget, Botao) and is_cursor_in_rect(cursor_xy, widget.rect):
+                return id
+        return None
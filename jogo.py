@@ -0,0 +1,202 @@
+"""
+Nucleo do Flappy Dedo, sem desenho e sem camera.
+
+A fisica anda em passos fixos (tick) independentes do FPS da camera, o
+sorteio dos canos usa um RNG proprio (semente) e os canos ficam em arrays
+NumPy pre-alocados (x, altura, gap, contado, ativo). O mesmo nucleo roda no
+flappyDedo.py e aqui no modo offline para calibrar velocidade, gap e a curva
+de dificuldade com entradas simuladas:
+
+    python jogo.py --partidas 500 --velocidade 20 --gap 220 --atraso 4 --ruido 20
+"""
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+
+
+class SimulacaoFlappy:
+    def __init__(self, largura=1280, altura=720, passaro_x=490, passaro_largura=85, passaro_altura=60,
+                 largura_cano=150, velocidade=20, gap=220, intervalo_canos=1.3, tick=1 / 30,
+                 pontos_por_nivel=5, acelera_por_nivel=2, velocidade_max=30, fecha_por_nivel=10, gap_min=120,
+                 max_canos=16, semente=None):
+        self.largura = largura
+        self.altura = altura
+        self.passaro_x = passaro_x
+        self.passaro_largura = passaro_largura
+        self.passaro_altura = passaro_altura
+        self.largura_cano = largura_cano
+        self.tick = tick
+        self.intervalo_canos = intervalo_canos
+
+        # Dificuldade: a cada 'pontos_por_nivel' pontos o cano acelera e o gap fecha
+        # (velocidade em pixels por tick)
+        self.velocidade = velocidade
+        self.gap = gap
+        self.pontos_por_nivel = pontos_por_nivel
+        self.acelera_por_nivel = acelera_por_nivel
+        self.velocidade_max = velocidade_max
+        self.fecha_por_nivel = fecha_por_nivel
+        self.gap_min = gap_min
+
+        self.cano_x = np.zeros(max_canos, np.int32)
+        self.cano_altura = np.zeros(max_canos, np.int32)
+        self.cano_gap = np.zeros(max_canos, np.int32)
+        self.cano_contado = np.zeros(max_canos, bool)
+        self.cano_ativo = np.zeros(max_canos, bool)
+        self.reiniciar(semente)
+
+    def reiniciar(self, semente=None):
+        self.rng = np.random.default_rng(semente)
+        self.cano_ativo[:] = False
+        self.passaro_y = self.altura // 2
+        self.pontos = 0
+        self.ticks = 0
+        self.terminou = False
+        self._ticks_desde_cano = None # None = primeiro cano ja no primeiro tick
+        self._acumulado = 0.0
+
+    def velocidade_atual(self):
+        nivel = self.pontos // self.pontos_por_nivel
+        return min(self.velocidade_max, self.velocidade + nivel * self.acelera_por_nivel)
+
+    def gap_atual(self):
+        nivel = self.pontos // self.pontos_por_nivel
+        return max(self.gap_min, self.gap - nivel * self.fecha_por_nivel)
+
+    def _novo_cano(self):
+        livres = np.flatnonzero(~self.cano_ativo)
+        if len(livres) == 0:
+            return
+        i = livres[0]
+        gap = self.gap_atual()
+        self.cano_x[i] = self.largura
+        self.cano_altura[i] = self.rng.integers(150, self.altura - 150 - gap, endpoint=True)
+        self.cano_gap[i] = gap
+        self.cano_contado[i] = False
+        self.cano_ativo[i] = True
+
+    def passo(self, alvo_y=None):
+        """
+        Um tick. alvo_y: altura do dedo (None = sem mao, o passaro fica onde esta).
+        Retorna (pontos ganhos neste tick, colidiu).
+        """
+        if self.terminou:
+            return 0, False
+        self.ticks += 1
+        if alvo_y is not None:
+            self.passaro_y = int(alvo_y)
+
+        if self._ticks_desde_cano is None or self._ticks_desde_cano * self.tick > self.intervalo_canos:
+            self._novo_cano()
+            self._ticks_desde_cano = 0
+        self._ticks_desde_cano += 1
+
+        ativo = self.cano_ativo
+        x = self.cano_x
+        x[ativo] -= self.velocidade_atual()
+        fim_x = x + self.largura_cano
+
+        # Colisao (AABB) do passaro com o cano de cima (0..altura) e o de baixo (altura+gap..fim da tela)
+        topo = self.passaro_y - self.passaro_altura // 2
+        base = self.passaro_y + self.passaro_altura // 2
+        no_x = ativo & (x <= self.passaro_x + self.passaro_largura) & (fim_x >= self.passaro_x)
+        colidiu = bool(np.any(no_x & ((topo <= self.cano_altura) | (base >= self.cano_altura + self.cano_gap))))
+        colidiu = colidiu or topo <= 0 or base >= self.altura
+
+        # Pontuacao: cano que passou inteiro do passaro conta uma vez
+        passou = ativo & ~self.cano_contado & (fim_x < self.passaro_x)
+        ganhos = int(np.count_nonzero(passou))
+        self.cano_contado |= passou
+        self.pontos += ganhos
+
+        ativo &= fim_x > 0
+        if colidiu:
+            self.terminou = True
+        return ganhos, colidiu
+
+    def atualizar(self, segundos, alvo_y=None, max_ticks=5):
+        """
+        Avanca o tempo real decorrido em ticks fixos (sobra fica para o proximo
+        frame). max_ticks evita rodar uma rajada depois de um travamento longo.
+        """
+        self._acumulado = min(self._acumulado + segundos, max_ticks * self.tick)
+        ganhos, colidiu = 0, False
+        while self._acumulado >= self.tick and not self.terminou:
+            self._acumulado -= self.tick
+            g, c = self.passo(alvo_y)
+            ganhos += g
+            colidiu = colidiu or c
+        return ganhos, colidiu
+
+    def canos(self):
+        """(x, altura, gap) dos canos ativos, para desenhar."""
+        ativo = self.cano_ativo
+        return zip(self.cano_x[ativo].tolist(), self.cano_altura[ativo].tolist(), self.cano_gap[ativo].tolist())
+
+    def proximo_gap(self):
+        """Centro do gap do proximo cano que o passaro ainda nao passou (ou None)."""
+        frente = self.cano_ativo & (self.cano_x + self.largura_cano >= self.passaro_x)
+        if not frente.any():
+            return None
+        i = np.flatnonzero(frente)[np.argmin(self.cano_x[frente])]
+        return int(self.cano_altura[i] + self.cano_gap[i] // 2)
+
+
+# ------------------- Modo offline (calibracao) -------------------
+def jogador_simulado(sim, atraso=4, ruido=20.0, velocidade_mao=45, rng=None):
+    """
+    Entrada simulada: a mao vai para o centro do proximo gap, vendo o jogo com
+    'atraso' ticks de atraso, com ruido (px) e velocidade maxima da mao (px/tick).
+    """
+    rng = rng or np.random.default_rng()
+    vistos = deque(maxlen=atraso + 1)
+    y = sim.altura // 2
+
+    def entrada():
+        nonlocal y
+        alvo = sim.proximo_gap()
+        vistos.append(sim.altura // 2 if alvo is None else alvo)
+        alvo = vistos[0] + rng.normal(0, ruido)
+        y += int(np.clip(alvo - y, -velocidade_mao, velocidade_mao))
+        return y
+    return entrada
+
+
+def simular(partidas=200, max_ticks=30 * 60 * 5, semente=0, atraso=4, ruido=20.0, velocidade_mao=45, **parametros):
+    """Roda 'partidas' jogos completos e devolve (pontos por partida, ticks totais)."""
+    rng = np.random.default_rng(semente)
+    sim = SimulacaoFlappy(**parametros)
+    pontos = np.zeros(partidas, np.int32)
+    ticks = 0
+    for p in range(partidas):
+        sim.reiniciar(int(rng.integers(2**31)))
+        entrada = jogador_simulado(sim, atraso, ruido, velocidade_mao, rng)
+        while not sim.terminou and sim.ticks < max_ticks:
+            sim.passo(entrada())
+        pontos[p] = sim.pontos
+        ticks += sim.ticks
+    return pontos, ticks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula partidas do Flappy Dedo sem camera")
+    parser.add_argument("--partidas", type=int, default=200)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--velocidade", type=int, default=20, help="px por tick (game_pipe_speed)")
+    parser.add_argument("--gap", type=int, default=220, help="game_pipe_gap")
+    parser.add_argument("--intervalo", type=float, default=1.3, help="segundos entre canos")
+    parser.add_argument("--pontos-por-nivel", type=int, default=5)
+    parser.add_argument("--atraso", type=int, default=4, help="atraso do jogador simulado (ticks)")
+    parser.add_argument("--ruido", type=float, default=20.0, help="ruido da mao (px)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    pontos, ticks = simular(args.partidas, semente=args.semente, atraso=args.atraso, ruido=args.ruido,
+                            velocidade=args.velocidade, gap=args.gap, intervalo_canos=args.intervalo,
+                            pontos_por_nivel=args.pontos_por_nivel)
+    duracao = time.perf_counter() - inicio
+    p50, p90 = np.percentile(pontos, (50, 90))
+    print(f"{args.partidas} partidas | pontos: media {pontos.mean():.1f}  p50 {p50:.0f}  p90 {p90:.0f}  max {pontos.max()}")
+    print(f"{ticks} ticks em {duracao:.2f}s ({ticks / duracao:,.0f} ticks/s)")
@@ -0,0 +1,112 @@
+import math
+import time
+
+# Trios de pontos (base, meio, ponta) usados para ver se cada dedo esta esticado:
+# polegar, indicador, medio, anelar, mindinho
+_TRIOS_DEDOS = ((2, 3, 4), (5, 6, 8), (9, 10, 12), (13, 14, 16), (17, 18, 20))
+
+
+class EstadoMaos:
+    """
+    Tudo que sai dos landmarks de um frame, calculado uma vez (quando chega
+    resultado novo da inferencia) e usado por todas as telas.
+
+    angulos:     [maos][5] angulo de dobra de cada dedo, em graus
+    dedos:       [maos][5] 0/1 (angulo < limiar_graus)
+    pinca:       [maos] distancia polegar-indicador em pixels
+
+    Com 1-2 maos o custo fixo de cada chamada do NumPy passava do calculo em
+    si, entao e Python escalar lendo so os 15 landmarks que o teste dos
+    dedos usa (python landmarks.py compara com o caminho antigo).
+    """
+
+    def __init__(self, multi_hand_landmarks, largura, altura, limiar_graus=30.0):
+        self._maos = list(multi_hand_landmarks) if multi_hand_landmarks else []
+        self.quantidade = len(self._maos)
+        self.largura, self.altura = largura, altura
+        self.limiar_graus = limiar_graus
+
+        self.angulos, self.dedos, self.pinca = [], [], []
+        for mao in self._maos:
+            lm = mao.landmark
+            angulos = []
+            for a, b, c in _TRIOS_DEDOS:
+                pa, pb, pc = lm[a], lm[b], lm[c]
+                v1x, v1y = (pb.x - pa.x) * largura, (pb.y - pa.y) * altura
+                v2x, v2y = (pc.x - pb.x) * largura, (pc.y - pb.y) * altura
+                cos = (v1x * v2x + v1y * v2y) / (math.hypot(v1x, v1y) * math.hypot(v2x, v2y) + 1e-6)
+                angulos.append(math.degrees(math.acos(min(1.0, max(-1.0, cos)))))
+            self.angulos.append(angulos)
+            self.dedos.append([int(angulo < limiar_graus) for angulo in angulos])
+            polegar, indicador = lm[4], lm[8]
+            self.pinca.append(math.hypot((polegar.x - indicador.x) * largura, (polegar.y - indicador.y) * altura))
+
+    def mascara(self, i):
+        """Dedos da mao i como int de 5 bits (bit 0 = polegar ... bit 4 = mindinho), ou None."""
+        if i < 0 or i >= self.quantidade:
+            return None
+        polegar, indicador, medio, anelar, mindinho = self.dedos[i]
+        return polegar | indicador << 1 | medio << 2 | anelar << 3 | mindinho << 4
+
+    def ponto(self, i, indice):
+        """Ponto (x, y) inteiro da mao i (ex: indice 8 = ponta do indicador)."""
+        lm = self._maos[i].landmark[indice]
+        return (int(lm.x * self.largura), int(lm.y * self.altura))
+
+    def total_dedos(self):
+        return sum(sum(dedos) for dedos in self.dedos)
+
+
+def analisar_maos(multi_hand_landmarks, largura, altura, limiar_graus=30.0):
+    return EstadoMaos(multi_hand_landmarks, largura, altura, limiar_graus)
+
+
+def _detectar_dedos_antigo(lm_list):
+    """Versao anterior (por mao, em Python puro), mantida so para o benchmark."""
+    def dedo_estendido(p1, p2, p3):
+        v1 = (p2[0] - p1[0], p2[1] - p1[1])
+        v2 = (p3[0] - p2[0], p3[1] - p2[1])
+        dot = v1[0]*v2[0] + v1[1]*v2[1]
+        cos_angle = dot / (math.hypot(*v1) * math.hypot(*v2) + 1e-6)
+        return math.acos(min(1, max(-1, cos_angle))) < math.radians(30)
+    return [int(dedo_estendido(lm_list[a], lm_list[b], lm_list[c]))
+            for a, b, c in ((2, 3, 4), (5, 6, 8), (9, 10, 12), (13, 14, 16), (17, 18, 20))]
+
+
+if __name__ == "__main__":
+    # Benchmark: python landmarks.py
+    import numpy as np
+
+    class _Lm:
+        __slots__ = ("x", "y", "z")
+
+        def __init__(self, x, y, z):
+            self.x, self.y, self.z = x, y, z
+
+    class _Mao:
+        def __init__(self, pontos):
+            self.landmark = [_Lm(*p) for p in pontos]
+
+    WIDTH, HEIGHT = 1280, 720
+    rng = np.random.default_rng(0)
+    repeticoes = 2000
+
+    for n_maos in (1, 2):
+        maos = [_Mao(rng.random((21, 3))) for _ in range(n_maos)]
+
+        # Caminho antigo na tela GESTOS: mao de navegacao convertida uma vez
+        # e depois TODAS as maos convertidas de novo
+        t0 = time.perf_counter()
+        for _ in range(repeticoes):
+            for mao in [maos[0]] + maos:
+                lm_list = [(int(lm.x * WIDTH), int(lm.y * HEIGHT)) for lm in mao.landmark]
+                dedos = _detectar_dedos_antigo(lm_list)
+            pinca = math.hypot(lm_list[4][0] - lm_list[8][0], lm_list[4][1] - lm_list[8][1])
+        t_antigo = (time.perf_counter() - t0) / repeticoes * 1e6
+
+        t0 = time.perf_counter()
+        for _ in range(repeticoes):
+            estado = analisar_maos(maos, WIDTH, HEIGHT)
+        t_novo = (time.perf_counter() - t0) / repeticoes * 1e6
+
+        print(f"{n_maos} mao(s)  antigo: {t_antigo:7.1f} us  novo: {t_novo:7.1f} us")
@@ -0,0 +1,309 @@
+"""
+Manutencao de fotos/ e do highscores (rodar com o jogo fechado).
+
+    python manutencao.py                      # so relatorio (nao muda nada)
+    python manutencao.py --corrigir           # orfas -> fotos/orfas/, apaga linhas sem foto
+    python manutencao.py --arquivar-dias 30   # fotos com mais de 30 dias -> fotos/arquivo/AAAA/MM/DD/
+    python manutencao.py --arquivar-dias 30 --tar   # ... -> fotos/arquivo/AAAA-MM-DD_<id>.tar.gz
+
+Memoria limitada mesmo com centenas de milhares de fotos:
+- a pasta e lida com os.scandir em lotes de --lote nomes; cada lote vira
+  um 'SELECT image_path ... WHERE image_path IN (...)';
+- o highscores e percorrido por keyset ('WHERE id > ultimo ORDER BY id
+  LIMIT n'), nunca com OFFSET nem carregando a tabela inteira;
+- so os exemplos do relatorio ficam guardados.
+
+No modo pastas as linhas continuam no highscores (com o caminho novo) e
+a galeria continua mostrando. No modo --tar as linhas vao para a tabela
+highscores_arquivo (com o nome do .tar.gz) e saem da galeria.
+"""
+import argparse
+import datetime
+import glob
+import os
+import sqlite3
+import tarfile
+import time
+from itertools import islice
+
+from banco import DB_CONFIG, garantir_colunas_derivados, garantir_indices
+from clipe import CODECS
+from derivados import EXTENSOES_FOTO, TAMANHOS
+
+PASTA_ORFAS = "orfas"
+EXTENSOES_CLIPE = sorted({extensao for _, extensao in CODECS})
+PASTA_ARQUIVO = "arquivo"
+IGNORAR_RECENTES = 10 * 60 # s: a foto e gravada antes da linha chegar no banco (spool)
+EXEMPLOS = 10
+
+
+class Relatorio:
+    def __init__(self):
+        self.contagem = {}
+        self.exemplos = {}
+
+    def anotar(self, tipo, item=None, quantidade=1):
+        self.contagem[tipo] = self.contagem.get(tipo, 0) + quantidade
+        if item is not None and len(self.exemplos.setdefault(tipo, [])) < EXEMPLOS:
+            self.exemplos[tipo].append(item)
+
+    def imprimir(self):
+        for tipo, quantidade in self.contagem.items():
+            print(f"  {tipo}: {quantidade}")
+            for item in self.exemplos.get(tipo, []):
+                print(f"      {item}")
+
+
+def em_lotes(iteravel, tamanho):
+    iterador = iter(iteravel)
+    while lote := list(islice(iterador, tamanho)):
+        yield lote
+
+
+def pendentes_no_spool():
+    """Fotos cujo score ainda esta no spool local (nao sao orfas: so nao chegaram no banco)."""
+    nomes = set()
+    for caminho in glob.glob("spool_placar*.db"):
+        try:
+            conn = sqlite3.connect(f"file:{caminho}?mode=ro", uri=True)
+            nomes.update(linha[0] for linha in conn.execute("SELECT image_path FROM pendentes"))
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Aviso: nao foi possivel ler o spool '{caminho}': {e}")
+    return nomes
+
+
+def caminhos_da_linha(image_path, thumb_path, web_path, video_path=None):
+    """Original + derivados (JPEG e WebP) + clipe de uma linha, relativos a fotos/."""
+    caminhos = [image_path]
+    for derivado in (thumb_path, web_path):
+        if derivado:
+            caminhos += [derivado, os.path.splitext(derivado)[0] + ".webp"]
+    if video_path:
+        caminhos.append(video_path)
+    return caminhos
+
+
+def dia_da_linha(created_at, formato):
+    """created_at vem como datetime do MySQL (ou texto, se a coluna for VARCHAR)."""
+    if isinstance(created_at, str):
+        created_at = datetime.datetime.strptime(created_at[:19], "%Y-%m-%d %H:%M:%S")
+    return created_at.strftime(formato)
+
+
+def mover(pasta, relativo, destino_relativo):
+    """Move fotos/relativo -> fotos/destino_relativo. Retorna False se a origem nao existe."""
+    origem = os.path.join(pasta, relativo)
+    destino = os.path.join(pasta, destino_relativo)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    try:
+        os.replace(origem, destino)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+# ------------------- fotos/ -> banco (arquivos orfaos) -------------------
+def listar_fotos(pasta):
+    """Arquivos de imagem soltos em fotos/ (as subpastas sao de derivados, orfas e arquivo)."""
+    limite = time.time() - IGNORAR_RECENTES
+    with os.scandir(pasta) as entradas:
+        for entrada in entradas:
+            if (entrada.is_file() and not entrada.name.startswith(".")
+                    and entrada.name.lower().endswith(EXTENSOES_FOTO)
+                    and entrada.stat().st_mtime < limite):
+                yield entrada.name
+
+
+def procurar_orfas(cursor, pasta, lote, relatorio, corrigir, spool):
+    for nomes in em_lotes(listar_fotos(pasta), lote):
+        marcadores = ", ".join(["%s"] * len(nomes))
+        cursor.execute(f"SELECT image_path FROM highscores WHERE image_path IN ({marcadores})", nomes)
+        no_banco = {linha[0] for linha in cursor.fetchall()}
+        relatorio.anotar("fotos verificadas", quantidade=len(nomes))
+        for nome in nomes:
+            if nome in no_banco or nome in spool:
+                continue
+            relatorio.anotar("fotos sem linha no banco", nome)
+            if corrigir:
+                base = os.path.splitext(nome)[0]
+                mover(pasta, nome, os.path.join(PASTA_ORFAS, nome))
+                for extensao in EXTENSOES_CLIPE: # Clipe da partida (clipe.py), mesmo nome da foto
+                    mover(pasta, base + extensao, os.path.join(PASTA_ORFAS, base + extensao))
+                for sub in TAMANHOS:
+                    for extensao in (".jpg", ".webp"):
+                        mover(pasta, f"{sub}/{base}{extensao}", os.path.join(PASTA_ORFAS, sub, base + extensao))
+
+
+def procurar_derivados_orfaos(pasta, relatorio, corrigir):
+    """Miniaturas / versoes web cuja original nao esta mais em fotos/ (refeitas pelo derivados.py se preciso)."""
+    for sub in TAMANHOS:
+        if not os.path.isdir(os.path.join(pasta, sub)):
+            continue
+        with os.scandir(os.path.join(pasta, sub)) as entradas:
+            for entrada in entradas:
+                if not entrada.is_file():
+                    continue
+                base = os.path.splitext(entrada.name)[0]
+                # Os derivados sao sempre .jpg/.webp, mas a original pode ser .jpeg / .png
+                # (um exists por derivado: memoria constante, mesmo com centenas de milhares de fotos)
+                if not any(os.path.exists(os.path.join(pasta, base + extensao))
+                           for extensao in EXTENSOES_FOTO + tuple(e.upper() for e in EXTENSOES_FOTO)):
+                    relatorio.anotar("derivados sem original", f"{sub}/{entrada.name}")
+                    if corrigir:
+                        os.remove(entrada.path)
+
+
+# ------------------- banco -> fotos/ (linhas sem arquivo) -------------------
+def percorrer(cursor, lote, onde="1=1", parametros=()):
+    """Keyset: lotes de linhas do highscores em ordem de id, sem OFFSET."""
+    ultimo = 0
+    while True:
+        cursor.execute(f"SELECT id, score, image_path, thumb_path, web_path, created_at, video_path FROM highscores "
+                       f"WHERE id > %s AND {onde} ORDER BY id LIMIT %s", (ultimo, *parametros, lote))
+        linhas = cursor.fetchall()
+        if not linhas:
+            return
+        ultimo = linhas[-1][0]
+        yield linhas
+
+
+def procurar_linhas_sem_foto(cnx, cursor, pasta, lote, relatorio, corrigir):
+    for linhas in percorrer(cursor, lote):
+        relatorio.anotar("linhas verificadas", quantidade=len(linhas))
+        sem_foto = [linha[0] for linha in linhas if not os.path.exists(os.path.join(pasta, linha[2]))]
+        for id_linha in sem_foto:
+            relatorio.anotar("linhas sem foto", f"id {id_linha}")
+        if corrigir and sem_foto:
+            marcadores = ", ".join(["%s"] * len(sem_foto))
+            cursor.execute(f"DELETE FROM highscores WHERE id IN ({marcadores})", sem_foto)
+            cnx.commit()
+
+
+# ------------------- Arquivamento -------------------
+def arquivar_em_pastas(cnx, cursor, pasta, lote, limite, relatorio):
+    """Move para fotos/arquivo/AAAA/MM/DD/ e atualiza os caminhos no banco (a galeria continua achando)."""
+    onde = f"created_at < %s AND image_path NOT LIKE '{PASTA_ARQUIVO}/%%'"
+    for linhas in percorrer(cursor, lote, onde, (limite,)):
+        atualizacoes = []
+        for id_linha, _, image_path, thumb_path, web_path, created_at, video_path in linhas:
+            dia = f"{PASTA_ARQUIVO}/{dia_da_linha(created_at, '%Y/%m/%d')}"
+            novos = [f"{dia}/{caminho}" if caminho else None
+                     for caminho in (image_path, thumb_path, web_path, video_path)]
+            for caminho in caminhos_da_linha(image_path, thumb_path, web_path, video_path):
+                mover(pasta, caminho, f"{dia}/{caminho}")
+            atualizacoes.append((*novos, id_linha))
+        cursor.executemany("UPDATE highscores SET image_path = %s, thumb_path = %s, web_path = %s, video_path = %s "
+                           "WHERE id = %s", atualizacoes)
+        cnx.commit()
+        relatorio.anotar("fotos arquivadas (pastas)", quantidade=len(linhas))
+
+
+def garantir_tabela_arquivo(cursor):
+    cursor.execute("CREATE TABLE IF NOT EXISTS highscores_arquivo ("
+                   " id INT PRIMARY KEY, score INT, image_path VARCHAR(255), thumb_path VARCHAR(255),"
+                   " web_path VARCHAR(255), video_path VARCHAR(255), created_at DATETIME, arquivo VARCHAR(255),"
+                   " INDEX (created_at))")
+    # Tabela criada antes dos clipes
+    cursor.execute("SHOW COLUMNS FROM highscores_arquivo LIKE 'video_path'")
+    if not cursor.fetchall():
+        cursor.execute("ALTER TABLE highscores_arquivo ADD COLUMN video_path VARCHAR(255) NULL")
+
+
+def arquivar_em_tar(cnx, cursor, pasta, lote, limite, relatorio):
+    """
+    Um .tar.gz por dia e por lote (gravado por inteiro antes de mexer no
+    banco). So depois as linhas vao para highscores_arquivo e os arquivos
+    sao apagados: se cair no meio, no pior caso sobra um .tar.gz a mais.
+    """
+    garantir_tabela_arquivo(cursor)
+    for linhas in percorrer(cursor, lote, "created_at < %s", (limite,)):
+        por_dia = {}
+        for linha in linhas:
+            por_dia.setdefault(dia_da_linha(linha[5], "%Y-%m-%d"), []).append(linha)
+
+        for dia, linhas_dia in por_dia.items():
+            nome_tar = f"{dia}_{linhas_dia[0][0]}.tar.gz"
+            destino = os.path.join(pasta, PASTA_ARQUIVO, nome_tar)
+            temporario = os.path.join(pasta, PASTA_ARQUIVO, f".{nome_tar}.tmp")
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            # Direto no disco (um lote pode ter centenas de MB), com fsync antes do replace
+            with open(temporario, "wb") as f:
+                with tarfile.open(fileobj=f, mode="w:gz") as tar:
+                    for _, _, image_path, thumb_path, web_path, _, video_path in linhas_dia:
+                        for caminho in caminhos_da_linha(image_path, thumb_path, web_path, video_path):
+                            if os.path.exists(os.path.join(pasta, caminho)):
+                                tar.add(os.path.join(pasta, caminho), arcname=caminho)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, destino)
+
+            ids = [linha[0] for linha in linhas_dia]
+            marcadores = ", ".join(["%s"] * len(ids))
+            cursor.execute("INSERT INTO highscores_arquivo (id, score, image_path, thumb_path, web_path, video_path,"
+                           " created_at, arquivo) SELECT id, score, image_path, thumb_path, web_path, video_path,"
+                           " created_at, %s"
+                           f" FROM highscores WHERE id IN ({marcadores})", (f"{PASTA_ARQUIVO}/{nome_tar}", *ids))
+            cursor.execute(f"DELETE FROM highscores WHERE id IN ({marcadores})", ids)
+            cnx.commit()
+
+            for _, _, image_path, thumb_path, web_path, _, video_path in linhas_dia:
+                for caminho in caminhos_da_linha(image_path, thumb_path, web_path, video_path):
+                    try:
+                        os.remove(os.path.join(pasta, caminho))
+                    except FileNotFoundError:
+                        pass
+            relatorio.anotar("fotos arquivadas (tar)", nome_tar, quantidade=len(linhas_dia))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconciliacao e arquivamento de fotos/ e highscores")
+    parser.add_argument("pasta", nargs="?", default="fotos")
+    parser.add_argument("--corrigir", action="store_true",
+                        help="move as fotos orfas para fotos/orfas/ e apaga as linhas sem foto")
+    parser.add_argument("--arquivar-dias", type=int, metavar="N", help="arquiva fotos com mais de N dias")
+    parser.add_argument("--tar", action="store_true", help="com --arquivar-dias: .tar.gz por dia (sai da galeria)")
+    parser.add_argument("--lote", type=int, default=1000, help="nomes / linhas por consulta")
+    parser.add_argument("--sem-indices", action="store_true", help="nao cria os indices que faltam")
+    args = parser.parse_args()
+
+    import mysql.connector
+
+    inicio = time.perf_counter()
+    relatorio = Relatorio()
+    cnx = mysql.connector.connect(**DB_CONFIG)
+    try:
+        # buffered: o cursor le o lote inteiro (pequeno) e fica livre para o proximo comando
+        cursor = cnx.cursor(buffered=True)
+        garantir_colunas_derivados(cursor)
+        if not args.sem_indices:
+            criados = garantir_indices(cursor)
+            if criados:
+                print(f"Indices criados: {', '.join(criados)}")
+
+        if args.arquivar_dias is not None:
+            limite = datetime.datetime.now() - datetime.timedelta(days=args.arquivar_dias)
+            if args.tar:
+                arquivar_em_tar(cnx, cursor, args.pasta, args.lote, limite, relatorio)
+            else:
+                arquivar_em_pastas(cnx, cursor, args.pasta, args.lote, limite, relatorio)
+
+        procurar_orfas(cursor, args.pasta, args.lote, relatorio, args.corrigir, pendentes_no_spool())
+        procurar_derivados_orfaos(args.pasta, relatorio, args.corrigir)
+        procurar_linhas_sem_foto(cnx, cursor, args.pasta, args.lote, relatorio, args.corrigir)
+        cursor.close()
+    finally:
+        cnx.close()
+
+    print(f"Concluido em {time.perf_counter() - inicio:.1f}s:")
+    relatorio.imprimir()
+    if not args.corrigir and (relatorio.contagem.get("fotos sem linha no banco")
+                              or relatorio.contagem.get("linhas sem foto")
+                              or relatorio.contagem.get("derivados sem original")):
+        print("Nada foi alterado. Use --corrigir para resolver.")
+    if relatorio.contagem.get("linhas sem foto") or args.arquivar_dias is not None:
+        print("O snapshot da galeria (placar.json) e refeito no primeiro score da proxima vez que o jogo abrir.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class Instrumentacao:
+    """
+    Tempo por estagio do frame, no estilo "volta de cronometro":
+
+        instr.novo_frame("MENU")
+        ... captura ...
+        instr.marca("captura")    # tempo desde a marca anterior
+        ... inferencia ...
+        instr.marca("inferencia")
+
+    Guarda as ultimas 'janela' amostras de cada estagio (no geral e por tela)
+    e calcula p50/p95/p99 so quando alguem pede (HUD / exportacao).
+    Desligada, cada chamada e so um 'if' (pode ficar no codigo em evento).
+    """
+
+    TODAS = "TODAS"
+
+    def __init__(self, ativo=False, janela=300, arquivo_exportacao=None, intervalo_exportacao=10.0):
+        self.ativo = ativo
+        self.janela = janela
+        self.arquivo_exportacao = arquivo_exportacao
+        self.intervalo_exportacao = intervalo_exportacao
+        self.hud_visivel = False
+
+        self._amostras = {} # (tela, estagio) -> deque de segundos
+        self._tela = self.TODAS
+        self._t_frame = None
+        self._t_marca = None
+        self._ultima_exportacao = time.monotonic()
+        self._cache_hud = []
+        self._t_cache_hud = 0.0
+
+    def _adicionar(self, estagio, segundos):
+        for tela in (self.TODAS, self._tela):
+            chave = (tela, estagio)
+            fila = self._amostras.get(chave)
+            if fila is None:
+                fila = self._amostras[chave] = deque(maxlen=self.janela)
+            fila.append(segundos)
+
+    def novo_frame(self, tela):
+        """Fecha o frame anterior (registra o 'frame' total) e comeca outro."""
+        if not self.ativo:
+            return
+        agora = time.perf_counter()
+        if self._t_frame is not None:
+            self._adicionar("frame", agora - self._t_frame)
+        self._tela = tela
+        self._t_frame = self._t_marca = agora
+
+        if self.arquivo_exportacao and time.monotonic() - self._ultima_exportacao >= self.intervalo_exportacao:
+            self.exportar()
+
+    def marca(self, estagio):
+        if not self.ativo or self._t_marca is None:
+            return
+        agora = time.perf_counter()
+        self._adicionar(estagio, agora - self._t_marca)
+        self._t_marca = agora
+
+    def registrar(self, estagio, segundos):
+        """Registra um tempo medido fora do loop (ex: inferencia na thread)."""
+        if not self.ativo:
+            return
+        self._adicionar(estagio, segundos)
+
+    def percentis(self):
+        """Lista de (tela, estagio, p50_ms, p95_ms, p99_ms, amostras)."""
+        linhas = []
+        for (tela, estagio), fila in sorted(self._amostras.items()):
+            if not fila:
+                continue
+            ms = np.fromiter(fila, np.float64, len(fila)) * 1000
+            p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+            linhas.append((tela, estagio, round(p50, 2), round(p95, 2), round(p99, 2), len(fila)))
+        return linhas
+
+    def desenhar_hud(self, img, x=10, y=20):
+        if not (self.ativo and self.hud_visivel):
+            return
+        # Recalcula no maximo 2x por segundo
+        if time.monotonic() - self._t_cache_hud > 0.5:
+            self._cache_hud = [l for l in self.percentis() if l[0] == self._tela]
+            self._t_cache_hud = time.monotonic()
+
+        linhas = [f"{self._tela:8s} p50/p95/p99 ms"]
+        linhas += [f"{estagio[:14]:14s} {p50:6.1f} {p95:6.1f} {p99:6.1f}" for _, estagio, p50, p95, p99, _ in self._cache_hud]
+        altura = 18 * len(linhas) + 8
+        cv2.rectangle(img, (x - 5, y - 15), (x + 330, y - 15 + altura), (0, 0, 0), -1)
+        for i, texto in enumerate(linhas):
+            cv2.putText(img, texto, (x, y + i * 18), cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 255, 0), 1)
+
+    def exportar(self, arquivo=None):
+        arquivo = arquivo or self.arquivo_exportacao
+        self._ultima_exportacao = time.monotonic()
+        if not arquivo:
+            return
+        linhas = self.percentis()
+        carimbo = time.strftime("%Y-%m-%d %H:%M:%S")
+        tmp = arquivo + ".tmp"
+        try:
+            with open(tmp, "w", newline="") as f:
+                if arquivo.endswith(".json"):
+                    json.dump({"gerado_em": carimbo,
+                               "estagios": [dict(zip(("tela", "estagio", "p50_ms", "p95_ms", "p99_ms", "amostras"), l))
+                                            for l in linhas]}, f, indent=2)
+                else:
+                    escritor = csv.writer(f)
+                    escritor.writerow(["gerado_em", "tela", "estagio", "p50_ms", "p95_ms", "p99_ms", "amostras"])
+                    for linha in linhas:
+                        escritor.writerow([carimbo, *linha])
+            os.replace(tmp, arquivo)
+        except OSError as e:
+            print(f"Aviso: nao foi possivel exportar as metricas para '{arquivo}': {e}")
+
+
+class LinhaDoTempo:
+    """
+    Linha do tempo da inicializacao: quando cada coisa ficou pronta, em ms
+    desde o inicio do processo. Cada marca sai no console na hora:
+
+        linha_do_tempo.marcar("camera aberta")
+        [inicio +   412 ms] camera aberta
+
+    Pode ser chamada de qualquer thread (os subsistemas carregam em segundo plano).
+    """
+
+    def __init__(self, inicio=None):
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.eventos = [] # (ms desde o inicio, evento)
+        self._lock = threading.Lock()
+
+    def marcar(self, evento):
+        ms = (time.perf_counter() - self.inicio) * 1000
+        with self._lock:
+            self.eventos.append((ms, evento))
+        print(f"[inicio +{ms:6.0f} ms] {evento}")
+
+    def resumo(self):
+        with self._lock:
+            return ", ".join(f"{evento} {ms:.0f} ms" for ms, evento in self.eventos)
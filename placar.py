@@ -0,0 +1,255 @@
+"""
+Placar em memoria para a galeria.
+
+Mantem as tres listas que a galeria mostra, atualizadas a cada score:
+    top       - maiores scores (> 0), heap de tamanho fixo
+    recentes  - ultimos jogos (score > 0), anel (deque com maxlen)
+    galeria   - ultimas fotos da camera / desenho (score = 0)
+
+e grava tudo num JSON versionado (escrita atomica) que o index.php e o
+ranking.php leem sem abrir o MySQL. Na inicializacao as listas sao
+reconstruidas a partir do banco (mais o que estiver no spool).
+"""
+import heapq
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from banco import garantir_colunas_derivados
+from salvamento import gravar_atomico
+
+try:
+    import fcntl # Trava do arquivo (varias cabines no modo quiosque); so existe no Linux/Mac
+except ImportError:
+    fcntl = None
+
+FORMATO = 1 # Muda se o layout do JSON mudar (o PHP confere)
+CAMINHO_PADRAO = os.path.join("galeria", "dados", "placar.json")
+COLUNAS = ("id", "score", "image_path", "thumb_path", "web_path", "video_path", "created_at")
+
+
+class PlacarMemoria:
+    def __init__(self, caminho=CAMINHO_PADRAO, tamanho_top=500, tamanho_recentes=500, tamanho_galeria=50):
+        self.caminho = caminho
+        self.tamanho_top = tamanho_top
+        self._lock = threading.Lock()
+
+        self._top = [] # heap minimo de (score, id, image_path, linha): a raiz e o primeiro a sair
+        self._recentes = deque(maxlen=tamanho_recentes) # [0] = mais recente
+        self._galeria = deque(maxlen=tamanho_galeria)
+        self._nomes = {"top": {}, "recentes": {}, "galeria": {}} # image_path -> linha, em cada lista
+        self.total_jogos = 0 # Scores > 0 no banco + registrados desde entao
+        self._seq = 0 # Desempate (mesmo score: o mais novo primeiro, como o 'id DESC' do ranking.php)
+
+        # Snapshot: outra cabine pode ter gravado depois de nos (modo quiosque)
+        self.versao = 0
+        self._versao_disco = 0 # Ultima versao do arquivo ja incorporada
+        self._total_disco = 0 # total_jogos que o arquivo tinha nessa versao
+        self._liberado = False # So grava depois da carga (senao sobrescreveria o snapshot com listas vazias)
+        self._carga_iniciada = False
+
+    # ------------------- Listas -------------------
+    def _adicionar(self, linha):
+        """Coloca uma linha nas listas em que ela cabe (sem duplicar o mesmo image_path)."""
+        self._seq = max(self._seq, linha["id"])
+        if linha["score"] <= 0:
+            self._guardar_no_anel(self._galeria, self._nomes["galeria"], linha)
+            return
+
+        self._guardar_no_anel(self._recentes, self._nomes["recentes"], linha)
+        nome = linha["image_path"]
+        if nome in self._nomes["top"]:
+            self._completar(self._nomes["top"][nome], linha)
+            return
+        item = (linha["score"], linha["id"], nome, linha)
+        if len(self._top) < self.tamanho_top:
+            heapq.heappush(self._top, item)
+            self._nomes["top"][nome] = linha
+        elif item[:3] > self._top[0][:3]:
+            saiu = heapq.heapreplace(self._top, item)[3]
+            self._nomes["top"].pop(saiu["image_path"], None)
+            self._nomes["top"][nome] = linha
+
+    @staticmethod
+    def _guardar_no_anel(anel, nomes, linha):
+        """Anel em ordem de id decrescente; o mais antigo cai quando enche."""
+        if linha["image_path"] in nomes:
+            PlacarMemoria._completar(nomes[linha["image_path"]], linha)
+            return
+        if len(anel) == anel.maxlen:
+            if linha["id"] < anel[-1]["id"]:
+                return
+            nomes.pop(anel.pop()["image_path"], None)
+        nomes[linha["image_path"]] = linha
+        if not anel or linha["id"] >= anel[0]["id"]:
+            anel.appendleft(linha) # Caso normal: o score que acabou de chegar
+        else:
+            # Linha antiga (carga do banco / snapshot de outra cabine)
+            ordenado = sorted([*anel, linha], key=lambda l: l["id"], reverse=True)
+            anel.clear()
+            anel.extend(ordenado)
+
+    @staticmethod
+    def _completar(existente, linha):
+        """Mesma foto vinda de outro lugar (snapshot, banco): traz os derivados/clipe que faltam."""
+        for campo in ("thumb_path", "web_path", "video_path"):
+            if linha.get(campo) and not existente.get(campo):
+                existente[campo] = linha[campo]
+
+    # ------------------- Entrada -------------------
+    def registrar(self, score, image_path, thumb_path=None, web_path=None, video_path=None, created_at=None):
+        """Chamado junto com o insert no banco. Atualiza as listas e grava o snapshot."""
+        self.gravar({"score": int(score), "image_path": image_path, "thumb_path": thumb_path, "web_path": web_path,
+                     "video_path": video_path, "created_at": created_at or time.strftime("%Y-%m-%d %H:%M:%S")})
+
+    def _registrar_linha(self, linha):
+        with self._lock:
+            self._seq += 1
+            linha["id"] = self._seq
+            if linha["score"] > 0:
+                self.total_jogos += 1
+            self._adicionar(linha)
+
+    def carregar_do_banco(self, db_config, spool=None):
+        """
+        Reconstroi as listas com tres consultas curtas (LIMIT) e um COUNT,
+        mais os scores que ainda estao no spool local. O banco e a fonte da
+        verdade: o snapshot antigo e descartado.
+        """
+        import mysql.connector
+
+        campos = ", ".join(COLUNAS)
+        consultas = (
+            f"SELECT {campos} FROM highscores WHERE score > 0 ORDER BY score DESC, id DESC LIMIT {self.tamanho_top}",
+            f"SELECT {campos} FROM highscores WHERE score > 0 ORDER BY id DESC LIMIT {self._recentes.maxlen}",
+            f"SELECT {campos} FROM highscores WHERE score = 0 ORDER BY id DESC LIMIT {self._galeria.maxlen}",
+        )
+        inicio = time.perf_counter()
+        cnx = mysql.connector.connect(**db_config)
+        try:
+            cursor = cnx.cursor(dictionary=True)
+            garantir_colunas_derivados(cursor) # Banco antigo: o video_path pode ainda nao existir
+            linhas = []
+            for sql in consultas:
+                cursor.execute(sql)
+                linhas.extend(cursor.fetchall())
+            cursor.execute("SELECT COALESCE(SUM(score > 0), 0) AS total, COALESCE(MAX(id), 0) AS ultimo FROM highscores")
+            contagem = cursor.fetchone()
+            cursor.close()
+        finally:
+            cnx.close()
+        # Depois do banco: um score que saiu do spool no meio do caminho conta duas vezes
+        # (em vez de nenhuma); o proximo carregamento corrige
+        pendentes = spool.proximos(100000) if spool is not None else []
+
+        snapshot = self._ler_snapshot()
+        with self._lock:
+            # Registrados antes da carga ja estao no banco ou no spool
+            self._top.clear()
+            self._recentes.clear()
+            self._galeria.clear()
+            for nomes in self._nomes.values():
+                nomes.clear()
+            self._seq = max(self._seq, int(contagem["ultimo"]))
+            for linha in linhas:
+                linha["created_at"] = str(linha["created_at"])
+                self._adicionar(linha)
+            for _, score, image_path, created_at, thumb_path, web_path, video_path in pendentes:
+                self._seq += 1
+                self._adicionar({"id": self._seq, "score": score, "image_path": image_path, "thumb_path": thumb_path,
+                                 "web_path": web_path, "video_path": video_path, "created_at": created_at})
+            self.total_jogos = int(contagem["total"]) + sum(1 for p in pendentes if p[1] > 0)
+            if snapshot is not None:
+                self._versao_disco = snapshot["versao"]
+                self._total_disco = self.total_jogos
+            self._liberado = True
+        print(f"Placar: {len(self._top)} no top, {len(self._recentes)} recentes, {len(self._galeria)} na galeria "
+              f"({self.total_jogos} jogos) carregados em {(time.perf_counter() - inicio) * 1000:.0f} ms.")
+        self.gravar()
+
+    def carregar_em_segundo_plano(self, db_config, spool=None):
+        """
+        O app abre na hora; o snapshot e atualizado quando o banco responder.
+        So a primeira chamada carrega (o jogo chama a cada score salvo).
+        """
+        if self._carga_iniciada:
+            return
+        self._carga_iniciada = True
+        def carregar():
+            try:
+                self.carregar_do_banco(db_config, spool)
+            except Exception as e:
+                # Sem banco: continua a partir do ultimo snapshot
+                print(f"Placar: nao foi possivel ler o banco ({e}); continuando do ultimo snapshot.")
+                self._liberado = True
+                self.gravar()
+        threading.Thread(target=carregar, name="placar-carga", daemon=True).start()
+
+    # ------------------- Snapshot -------------------
+    def _ler_snapshot(self):
+        try:
+            with open(self.caminho, encoding="utf-8") as f:
+                dados = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return dados if dados.get("formato") == FORMATO else None
+
+    def _mesclar_snapshot(self):
+        """Traz o que outro processo gravou depois da nossa ultima leitura. Retorna a versao do arquivo."""
+        dados = self._ler_snapshot()
+        if dados is None:
+            return 0
+        if dados["versao"] > self._versao_disco:
+            with self._lock:
+                for linha in dados["top"] + dados["recentes"] + dados["galeria"]:
+                    self._adicionar(linha)
+                # Jogos das outras cabines desde a ultima vez (o nosso total ja conta os nossos)
+                self.total_jogos += dados["total_jogos"] - self._total_disco
+        return dados["versao"]
+
+    def completar_derivados(self, derivados):
+        """
+        Preenche thumb_path / web_path no snapshot do disco (derivados.py, depois
+        de reprocessar fotos antigas). derivados: {image_path: (thumb_path, web_path)}.
+        O jogo rodando pega as mudancas na proxima mesclagem (_completar).
+        """
+        self._liberado = True # Fora do jogo nao ha carga do banco: parte do arquivo
+        self.gravar(derivados=derivados)
+
+    def gravar(self, nova_linha=None, derivados=None):
+        """
+        Grava o snapshot (tmp + fsync + replace: o PHP nunca le arquivo pela
+        metade). A nova linha entra depois de mesclar o arquivo, para o id dela
+        vir depois dos scores das outras cabines.
+        """
+        if not self._liberado:
+            if nova_linha is not None:
+                self._registrar_linha(nova_linha)
+            return
+        os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+        with open(self.caminho + ".lock", "a") as trava:
+            if fcntl is not None:
+                fcntl.flock(trava, fcntl.LOCK_EX) # Solta ao fechar
+            versao_disco = self._mesclar_snapshot()
+            if nova_linha is not None:
+                self._registrar_linha(nova_linha)
+            with self._lock:
+                if derivados:
+                    for linha in [item[3] for item in self._top] + list(self._recentes) + list(self._galeria):
+                        if linha["image_path"] in derivados:
+                            linha["thumb_path"], linha["web_path"] = derivados[linha["image_path"]]
+                self.versao = max(self.versao, versao_disco) + 1
+                dados = {
+                    "formato": FORMATO,
+                    "versao": self.versao,
+                    "gerado_em": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "total_jogos": self.total_jogos,
+                    "top": [item[3] for item in sorted(self._top, reverse=True)],
+                    "recentes": list(self._recentes),
+                    "galeria": list(self._galeria),
+                }
+                self._versao_disco = self.versao
+                self._total_disco = self.total_jogos
+            gravar_atomico(self.caminho, json.dumps(dados, ensure_ascii=False).encode("utf-8"))
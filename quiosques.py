@@ -0,0 +1,263 @@
+"""
+Modo quiosque: varias cabines num PC so.
+
+    python quiosques.py 0 1 teste.mp4 [--sem-janela] [-- opcoes do flappyDedo.py]
+
+O supervisor (este processo) le as cameras / videos e escreve os frames num
+AnelFrames de entrada por cabine. Cada cabine roda o flappyDedo.main() num
+processo proprio (com o seu Hands, telas, spool e nomes de foto), preso a um
+grupo de nucleos. O frame renderizado volta por um AnelFrames de saida; o
+supervisor mostra as janelas e imprime FPS e latencia (captura -> tela) de
+cada cabine.
+"""
+import argparse
+import multiprocessing as mp
+import os
+import signal
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from anel import AnelFrames
+from buffers import PoolFrames
+
+LARGURA, ALTURA = 1280, 720 # Mesmo tamanho do flappyDedo.py
+FPS_CAMERA = 30
+
+
+# ------------------- Lado da cabine (processo filho) -------------------
+class FonteAnel:
+    """Substitui a CapturaCamera lendo o anel de entrada (mesma interface)."""
+
+    def __init__(self, anel, parar, pool=None):
+        self.anel = anel
+        self.parar_evento = parar
+        self.pool = pool if pool is not None else PoolFrames() # O frame e copiado do anel para um buffer do pool
+        self.timestamp_atual = 0.0
+        self.frames_lidos = 0
+        self.frames_pulados = 0
+        self.frames_duplicados = 0
+        self._ultimo = None # (frame, timestamp, seq)
+
+    def ler(self, timeout=0.1):
+        if self.parar_evento.is_set():
+            return False, None, 0.0, 0
+        seq_anterior = self._ultimo[2] if self._ultimo else 0
+        novo = self.anel.ler(seq_anterior, timeout, destino=self.pool.obter(self.anel.forma))
+        if novo is None:
+            if self._ultimo is None:
+                return True, None, 0.0, 0 # Camera ainda abrindo
+            self.frames_duplicados += 1 # Igual a CapturaCamera: devolve o ultimo de novo
+        else:
+            if seq_anterior and novo[2] > seq_anterior + 1:
+                self.frames_pulados += novo[2] - seq_anterior - 1
+            self._ultimo = novo
+            self.frames_lidos += 1
+        frame, self.timestamp_atual, seq = self._ultimo
+        return True, frame, self.timestamp_atual, seq
+
+    def aguardar_frame(self, timeout, depois_de=0.0):
+        """Igual a CapturaCamera.aguardar_frame, no anel da cabine."""
+        if self.parar_evento.is_set():
+            return True # O proximo ler() ja devolve False
+        return self.anel.aguardar(self._ultimo[2] if self._ultimo else 0, timeout, depois_de)
+
+    def estatisticas(self):
+        return {"lidos": self.frames_lidos, "pulados": self.frames_pulados, "duplicados": self.frames_duplicados}
+
+    def parar(self):
+        self.anel.fechar()
+
+
+class SaidaAnel:
+    """Substitui a janela: escreve o frame renderizado no anel de saida."""
+
+    def __init__(self, anel, fonte, parar):
+        self.anel = anel
+        self.fonte = fonte
+        self.parar_evento = parar
+
+    def mostrar(self, img):
+        # Leva junto o horario de captura, para o supervisor medir a latencia
+        self.anel.escrever(img, self.fonte.timestamp_atual)
+
+    def tecla(self):
+        return ord('q') if self.parar_evento.is_set() else -1
+
+    def fechar(self):
+        self.anel.fechar()
+
+
+def _cabine(indice, entrada, saida, parar, nucleos, argv):
+    # Ctrl+C chega no grupo todo; quem encerra as cabines (pelo evento 'parar') e o supervisor
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if nucleos and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, nucleos)
+        cv2.setNumThreads(len(nucleos))
+
+    import flappyDedo # Importado aqui: cada processo tem o seu estado (telas, Hands, spool)
+    fonte = FonteAnel(entrada, parar, pool=flappyDedo.pool_frames)
+    flappyDedo.main(argv + ["--quiosque", str(indice)], fonte=fonte, saida=SaidaAnel(saida, fonte, parar))
+
+
+def _nucleos_da_cabine(indice, total):
+    """Divide os nucleos disponiveis em grupos iguais, um por cabine."""
+    if not hasattr(os, "sched_getaffinity"):
+        return None # Fora do Linux o sistema decide
+    nucleos = sorted(os.sched_getaffinity(0))
+    por_cabine = max(1, len(nucleos) // total)
+    inicio = (indice * por_cabine) % len(nucleos)
+    return set(nucleos[inicio:inicio + por_cabine])
+
+
+# ------------------- Lado do supervisor -------------------
+class Cabine:
+    def __init__(self, indice, fonte, slots, ctx, parar, nucleos, argv):
+        self.indice = indice
+        self.fonte = fonte
+        self.parar = parar
+        self.entrada = AnelFrames((ALTURA, LARGURA, 3), slots, evento=ctx.Event())
+        self.saida = AnelFrames((ALTURA, LARGURA, 3), slots)
+
+        self.capturados = 0
+        self.exibidos = 0
+        self.ultimo_exibido = 0
+        self.latencias = deque(maxlen=1000)
+        self._contagem_relatorio = (0, 0)
+        self._exibicao = np.empty((ALTURA, LARGURA, 3), np.uint8) # imshow copia, entao um buffer basta
+
+        self.processo = ctx.Process(target=_cabine, name=f"cabine-{indice}",
+                                    args=(indice, self.entrada, self.saida, parar, nucleos, argv))
+        self.thread = threading.Thread(target=self._alimentar, name=f"captura-{indice}", daemon=True)
+
+    def iniciar(self):
+        self.processo.start()
+        self.thread.start()
+
+    def _alimentar(self):
+        """Le a camera / video e escreve no anel de entrada."""
+        cap = cv2.VideoCapture(self.fonte)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, LARGURA)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, ALTURA)
+        cap.set(cv2.CAP_PROP_FPS, FPS_CAMERA)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        arquivo = isinstance(self.fonte, str)
+        periodo = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or FPS_CAMERA)
+        proximo = time.monotonic()
+        # Buffers reaproveitados (o anel copia o frame, entao nada e guardado entre leituras)
+        lido = None
+        redimensionado = np.empty((ALTURA, LARGURA, 3), np.uint8)
+
+        while not self.parar.is_set():
+            ok, lido = cap.read(image=lido)
+            frame = lido
+            if not ok:
+                if arquivo and self.capturados: # Video: volta para o comeco
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                print(f"Cabine {self.indice}: nao foi possivel ler '{self.fonte}'.")
+                break
+            if frame.shape[:2] != (ALTURA, LARGURA):
+                frame = cv2.resize(frame, (LARGURA, ALTURA), dst=redimensionado)
+            if arquivo: # Video no ritmo dele (a camera ja tem o seu)
+                proximo += periodo
+                espera = proximo - time.monotonic()
+                if espera > 0:
+                    time.sleep(espera)
+                elif espera < -periodo:
+                    proximo = time.monotonic()
+            self.entrada.escrever(frame, time.monotonic())
+            self.capturados += 1
+        cap.release()
+
+    def buscar_saida(self):
+        """Frame renderizado mais novo (ou None), ja contabilizando a latencia."""
+        novo = self.saida.ler(self.ultimo_exibido, timeout=0, destino=self._exibicao)
+        if novo is None:
+            return None
+        img, timestamp_captura, self.ultimo_exibido = novo
+        self.exibidos += 1
+        if timestamp_captura:
+            self.latencias.append(time.monotonic() - timestamp_captura)
+        return img
+
+    def relatorio(self, intervalo):
+        capturados, exibidos = self._contagem_relatorio
+        self._contagem_relatorio = (self.capturados, self.exibidos)
+        texto = (f"Cabine {self.indice} ({self.fonte}): captura {(self.capturados - capturados) / intervalo:5.1f} fps | "
+                 f"saida {(self.exibidos - exibidos) / intervalo:5.1f} fps")
+        if self.latencias:
+            ms = np.fromiter(self.latencias, np.float64, len(self.latencias)) * 1000
+            texto += f" | latencia p50 {np.percentile(ms, 50):6.1f} ms  p95 {np.percentile(ms, 95):6.1f} ms"
+            self.latencias.clear()
+        if not self.processo.is_alive():
+            texto += f" | PROCESSO ENCERRADO (codigo {self.processo.exitcode})"
+        return texto
+
+    def encerrar(self):
+        self.thread.join(timeout=2.0)
+        self.processo.join(timeout=10.0)
+        if self.processo.is_alive():
+            print(f"Cabine {self.indice} nao encerrou a tempo; finalizando o processo.")
+            self.processo.terminate()
+            self.processo.join()
+        self.entrada.fechar()
+        self.saida.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gesture Suite - varias cabines")
+    parser.add_argument("fontes", nargs="+", help="indices de camera e/ou arquivos de video")
+    parser.add_argument("--sem-janela", action="store_true", help="nao mostra as janelas (so o relatorio)")
+    parser.add_argument("--intervalo-relatorio", type=float, default=5.0, help="segundos entre relatorios")
+    parser.add_argument("--slots", type=int, default=4, help="frames em cada anel de memoria compartilhada")
+    args, argv_cabines = parser.parse_known_args()
+    if argv_cabines and argv_cabines[0] == "--":
+        argv_cabines = argv_cabines[1:]
+
+    # spawn: cada cabine comeca do zero (fork com threads do OpenCV/MediaPipe nao e seguro)
+    ctx = mp.get_context("spawn")
+    parar = ctx.Event()
+    fontes = [int(f) if f.isdigit() else f for f in args.fontes]
+    cabines = [Cabine(i + 1, fonte, args.slots, ctx, parar, _nucleos_da_cabine(i, len(fontes)), argv_cabines)
+               for i, fonte in enumerate(fontes)]
+    for cabine in cabines:
+        cabine.iniciar()
+    print(f"{len(cabines)} cabine(s) iniciada(s). 'q' ou ESC numa janela (ou Ctrl+C) encerra todas.")
+
+    ultimo_relatorio = time.monotonic()
+    try:
+        while any(c.processo.is_alive() for c in cabines):
+            for cabine in cabines:
+                img = cabine.buscar_saida()
+                if img is not None and not args.sem_janela:
+                    cv2.imshow(f"Gesture Suite - cabine {cabine.indice}", img)
+
+            if args.sem_janela:
+                time.sleep(0.005)
+            else:
+                key = cv2.waitKey(1)
+                if key == 27 or key == ord('q'):
+                    break
+
+            agora = time.monotonic()
+            if agora - ultimo_relatorio >= args.intervalo_relatorio:
+                for cabine in cabines:
+                    print(cabine.relatorio(agora - ultimo_relatorio))
+                ultimo_relatorio = agora
+    except KeyboardInterrupt:
+        pass
+
+    # limpeza: as cabines salvam o que estiver pendente (fotos / spool) antes de sair
+    parar.set()
+    for cabine in cabines:
+        cabine.encerrar()
+    if not args.sem_janela:
+        cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import os
+import queue
+import tempfile
+import threading
+
+import cv2
+
+
+def gravar_atomico(caminho, dados):
+    """
+    Grava 'dados' (bytes) em 'caminho' via arquivo temporario + fsync + rename:
+    quem le (galeria, PHP) ve o arquivo antigo ou o novo, nunca pela metade.
+    O temporario tem nome unico na mesma pasta (varias threads/cabines podem
+    gravar o mesmo arquivo ao mesmo tempo).
+    """
+    pasta, nome = os.path.split(caminho)
+    fd, caminho_tmp = tempfile.mkstemp(prefix=f".{nome}.", suffix=".tmp", dir=pasta or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(dados)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(caminho_tmp, 0o644) # mkstemp cria com 0600; o servidor web precisa ler
+        os.replace(caminho_tmp, caminho)
+    except BaseException:
+        try:
+            os.remove(caminho_tmp)
+        except OSError:
+            pass
+        raise
+
+
+class SalvadorFotos:
+    """
+    Fila limitada de salvamento em segundo plano.
+
+    O loop principal so entrega a imagem; a thread cuida de:
+    espelhar -> aplicar moldura -> codificar JPEG -> gravar em fotos/
+    -> miniatura e versao web (gerar_derivados) -> inserir no banco.
+
+    A gravacao e atomica (arquivo temporario + rename), entao a galeria nunca
+    ve um JPEG pela metade.
+    """
+
+    def __init__(self, pasta, aplicar_moldura=None, inserir_no_banco=None, tamanho_fila=8, qualidade_jpeg=92,
+                 gerar_derivados=None):
+        self.pasta = pasta
+        self.aplicar_moldura = aplicar_moldura
+        self.inserir_no_banco = inserir_no_banco
+        self.gerar_derivados = gerar_derivados # f(imagem, pasta, nome) -> {'miniaturas': ..., 'web': ...}
+        self.qualidade_jpeg = qualidade_jpeg
+        os.makedirs(self.pasta, exist_ok=True)
+
+        self._fila = queue.Queue(maxsize=tamanho_fila)
+        self._thread = threading.Thread(target=self._loop_salvamento, name="salvamento-fotos", daemon=True)
+        self._thread.start()
+
+        self.fotos_salvas = 0
+        self.fotos_com_erro = 0
+        self.salvas_no_loop = 0 # fila cheia: salvou direto no loop principal
+
+    def salvar(self, imagem, nome_arquivo, score=0, espelhar=False, timeout=0.05, video=None):
+        """
+        Agenda o salvamento. A 'imagem' nao pode ser alterada depois pelo chamador.
+        Se a fila estiver cheia por mais de 'timeout' segundos (back-pressure),
+        salva direto aqui para nao perder a foto.
+        video: nome do clipe da partida (clipe.py), que vai para o banco junto com a foto.
+        """
+        tarefa = (imagem, nome_arquivo, score, espelhar, video)
+        try:
+            self._fila.put(tarefa, timeout=timeout)
+        except queue.Full:
+            print(f"Aviso: fila de salvamento cheia, salvando {nome_arquivo} no loop principal.")
+            self.salvas_no_loop += 1
+            self._processar(*tarefa)
+
+    def _loop_salvamento(self):
+        while True:
+            tarefa = self._fila.get()
+            try:
+                if tarefa is None:
+                    break
+                self._processar(*tarefa)
+            finally:
+                self._fila.task_done()
+
+    def _processar(self, imagem, nome_arquivo, score, espelhar, video=None):
+        try:
+            if espelhar:
+                imagem = cv2.flip(imagem, 1)
+            elif self.aplicar_moldura is not None:
+                imagem = imagem.copy() # Nao altera a imagem original do chamador
+
+            if self.aplicar_moldura is not None:
+                self.aplicar_moldura(imagem)
+
+            ok, dados = cv2.imencode(".jpg", imagem, [cv2.IMWRITE_JPEG_QUALITY, self.qualidade_jpeg])
+            if not ok:
+                raise IOError("cv2.imencode falhou")
+
+            local_path = os.path.join(self.pasta, nome_arquivo)
+            gravar_atomico(local_path, dados.tobytes())
+            print(f"Foto salva em: {local_path}")
+
+            # Versoes menores para a galeria; se falhar, a galeria usa a original
+            derivados = {}
+            if self.gerar_derivados is not None:
+                try:
+                    derivados = self.gerar_derivados(imagem, self.pasta, nome_arquivo)
+                except Exception as e:
+                    print(f"Aviso: miniaturas de {nome_arquivo} nao foram geradas: {e}")
+
+            if self.inserir_no_banco is not None:
+                self.inserir_no_banco(score, nome_arquivo, derivados.get("miniaturas"), derivados.get("web"), video)
+            self.fotos_salvas += 1
+
+        except Exception as e:
+            self.fotos_com_erro += 1
+            print(f"❌ ERRO ao salvar {nome_arquivo}: {e}")
+
+    def encerrar(self):
+        """Espera terminar tudo que esta na fila (chamar antes de sair)."""
+        if self._thread is None:
+            return
+        pendentes = self._fila.qsize()
+        if pendentes:
+            print(f"Aguardando {pendentes} foto(s) serem salvas...")
+        self._fila.put(None)
+        self._thread.join()
+        self._thread = None
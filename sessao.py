@@ -0,0 +1,282 @@
+"""
+Gravacao e replay de sessoes (frames da camera + resultado do MediaPipe).
+
+Formato do arquivo (.sessao):
+    b"FDSESSAO3\\n"
+    uma linha JSON com o cabecalho (largura, altura, semente, com_landmarks,
+               deslocamento_horario = time.time() - relogio, para os nomes das fotos)
+    registros: struct '<dqIBqdd' (relogio, seq, tamanho do JPEG, n de maos,
+               seq e timestamp de captura do resultado da inferencia,
+               latencia estimada usada pelo preditor do cursor)
+               + JPEG do frame cru
+               + n bytes com a mao ('R' / 'L') + n * 21 * 3 float32 (x, y, z normalizados)
+
+A inferencia roda em paralelo: o mesmo resultado e usado em varios frames
+seguidos. O seq do resultado e gravado para o replay devolver o mesmo
+objeto enquanto ele nao muda (o passo() so reprocessa resultado novo,
+igual ao jogo ao vivo). A latencia tambem e gravada: ao vivo ela vem do
+relogio de verdade (time.monotonic() na hora de mostrar), que o replay nao
+tem como refazer. Sessoes FDSESSAO1/2 ainda abrem (FDSESSAO1 com um
+resultado por frame; as duas sem latencia).
+"""
+import json
+import queue
+import struct
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from inferencia import ResultadoMaos
+
+MAGICO = b"FDSESSAO3\n"
+_REGISTROS = { # Versoes anteriores: so leitura
+    MAGICO: struct.Struct("<dqIBqdd"),
+    b"FDSESSAO2\n": struct.Struct("<dqIBqd"),
+    b"FDSESSAO1\n": struct.Struct("<dqIB"),
+}
+_REGISTRO = _REGISTROS[MAGICO]
+_SEM_LANDMARKS = 255 # n de maos quando os landmarks nao foram gravados
+
+
+# ------------------- Objetos no formato do MediaPipe -------------------
+class _Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class _ListaLandmarks:
+    __slots__ = ("landmark",)
+
+    def __init__(self, pontos):
+        self.landmark = [_Landmark(float(x), float(y), float(z)) for x, y, z in pontos]
+
+
+class _Classificacao:
+    __slots__ = ("label",)
+
+    def __init__(self, label):
+        self.label = label
+
+
+class _Handedness:
+    __slots__ = ("classification",)
+
+    def __init__(self, label):
+        self.classification = [_Classificacao(label)]
+
+
+def _resultado_gravado(maos, labels, timestamp, seq):
+    if len(maos) == 0:
+        return ResultadoMaos(None, None, timestamp, seq)
+    return ResultadoMaos([_ListaLandmarks(p) for p in maos], [_Handedness(l) for l in labels], timestamp, seq)
+
+
+# ------------------- Gravacao -------------------
+class GravadorSessao:
+    """Grava (frame cru, resultado usado, relogio) numa thread, para nao travar o loop."""
+
+    def __init__(self, caminho, largura, altura, semente, com_landmarks=True, qualidade_jpeg=90,
+                 deslocamento_horario=0.0):
+        self.caminho = caminho
+        self.com_landmarks = com_landmarks
+        self.qualidade_jpeg = qualidade_jpeg
+        self.frames_gravados = 0
+
+        self._arquivo = open(caminho, "wb")
+        self._arquivo.write(MAGICO)
+        cabecalho = {"largura": largura, "altura": altura, "semente": semente, "com_landmarks": com_landmarks,
+                     "deslocamento_horario": deslocamento_horario}
+        self._arquivo.write((json.dumps(cabecalho) + "\n").encode("utf-8"))
+
+        # Fila limitada: se o disco nao acompanhar, o loop espera (a sessao precisa ser completa)
+        self._fila = queue.Queue(maxsize=64)
+        self._thread = threading.Thread(target=self._loop_gravacao, name="gravador-sessao", daemon=True)
+        self._thread.start()
+
+    def gravar(self, img_raw, results, relogio, seq, latencia=0.0):
+        maos, labels = None, None
+        if self.com_landmarks:
+            maos, labels = [], []
+            if results.multi_hand_landmarks:
+                for mao, info in zip(results.multi_hand_landmarks, results.multi_handedness):
+                    maos.append([(lm.x, lm.y, lm.z) for lm in mao.landmark])
+                    labels.append(info.classification[0].label)
+        self._fila.put((img_raw, maos, labels, relogio, seq, results.seq, results.timestamp, latencia))
+
+    def _loop_gravacao(self):
+        while True:
+            item = self._fila.get()
+            if item is None:
+                break
+            img_raw, maos, labels, relogio, seq, seq_resultado, timestamp_resultado, latencia = item
+            ok, jpeg = cv2.imencode(".jpg", img_raw, [cv2.IMWRITE_JPEG_QUALITY, self.qualidade_jpeg])
+            if not ok:
+                continue
+            n = _SEM_LANDMARKS if maos is None else len(maos)
+            self._arquivo.write(_REGISTRO.pack(relogio, seq, len(jpeg), n, seq_resultado, timestamp_resultado,
+                                               latencia))
+            self._arquivo.write(jpeg.tobytes())
+            if maos:
+                self._arquivo.write("".join(l[0] for l in labels).encode("ascii"))
+                self._arquivo.write(np.asarray(maos, np.float32).tobytes())
+            self.frames_gravados += 1
+
+    def fechar(self):
+        self._fila.put(None)
+        self._thread.join()
+        self._arquivo.close()
+        print(f"Sessao gravada em '{self.caminho}' ({self.frames_gravados} frames).")
+
+
+# ------------------- Replay -------------------
+class LeitorSessao:
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = open(caminho, "rb")
+        magico = self._arquivo.read(len(MAGICO))
+        if magico not in _REGISTROS:
+            raise ValueError(f"'{caminho}' nao e um arquivo de sessao")
+        self._registro = _REGISTROS[magico]
+        self.cabecalho = json.loads(self._arquivo.readline().decode("utf-8"))
+        self.cabecalho.setdefault("deslocamento_horario", 0.0) # Antes o relogio ja era o time.time()
+
+    def __iter__(self):
+        """
+        Gera (relogio, seq, img_raw, resultado ou None, latencia ou None).
+        Enquanto o seq do resultado gravado nao muda, o objeto devolvido e o mesmo.
+        """
+        anterior = None
+        while True:
+            cabecalho = self._arquivo.read(self._registro.size)
+            if len(cabecalho) < self._registro.size:
+                return
+            # FDSESSAO1: sem o seq do resultado, cada frame vira um resultado novo; 1 e 2: sem latencia
+            campos = self._registro.unpack(cabecalho)
+            relogio, seq, tamanho_jpeg, n = campos[:4]
+            seq_resultado, timestamp_resultado = campos[4:6] if len(campos) > 4 else (seq, relogio)
+            latencia = campos[6] if len(campos) > 6 else None
+            jpeg = np.frombuffer(self._arquivo.read(tamanho_jpeg), np.uint8)
+            img_raw = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+
+            resultado = None
+            if n != _SEM_LANDMARKS:
+                labels = {"R": "Right", "L": "Left"}
+                letras = self._arquivo.read(n).decode("ascii")
+                maos = np.frombuffer(self._arquivo.read(n * 21 * 3 * 4), np.float32).reshape(n, 21, 3)
+                if anterior is not None and anterior.seq == seq_resultado:
+                    resultado = anterior
+                else:
+                    resultado = _resultado_gravado(maos, [labels[c] for c in letras],
+                                                   timestamp_resultado, seq_resultado)
+                anterior = resultado
+            yield relogio, seq, img_raw, resultado, latencia
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+class FonteReplay:
+    """
+    Substitui a CapturaCamera (mesma interface: ler / estatisticas / parar)
+    lendo os frames de uma sessao gravada.
+
+    tempo_real=True respeita o intervalo gravado entre frames;
+    False entrega o mais rapido possivel (benchmark).
+    """
+
+    def __init__(self, leitor, tempo_real=False):
+        self.leitor = leitor
+        self.tempo_real = tempo_real
+        self._frames = iter(leitor)
+        self._inicio = None
+        self._relogio_inicial = None
+        self.frames_lidos = 0
+        self.resultado_gravado = None
+        self.latencia = None # Latencia do preditor gravada (None em sessoes antigas)
+        self.relogio = 0.0
+
+    def ler(self, timeout=None):
+        try:
+            relogio, seq, img_raw, resultado, latencia = next(self._frames)
+        except StopIteration:
+            return False, None, 0.0, 0
+
+        if self.tempo_real:
+            if self._inicio is None:
+                self._inicio, self._relogio_inicial = time.monotonic(), relogio
+            espera = (relogio - self._relogio_inicial) - (time.monotonic() - self._inicio)
+            if espera > 0:
+                time.sleep(espera)
+
+        self.frames_lidos += 1
+        self.resultado_gravado = resultado
+        self.latencia = latencia
+        self.relogio = relogio
+        return True, img_raw, relogio, seq
+
+    def estatisticas(self):
+        return {"lidos": self.frames_lidos}
+
+    def parar(self):
+        self.leitor.fechar()
+
+
+class InferenciaReplay:
+    """Substitui a InferenciaMaos devolvendo o resultado gravado junto com cada frame."""
+
+    def __init__(self, fonte):
+        self.fonte = fonte
+        self.escala = 1.0
+        self.duas_maos = False
+        self.estado = "pronto"
+
+    def definir_complexidade(self, model_complexity):
+        pass
+
+    def enviar(self, frame_raw, timestamp, seq):
+        pass
+
+    def resultado(self):
+        return self.fonte.resultado_gravado
+
+    def estatisticas(self):
+        return {"replay": True}
+
+    def parar(self):
+        pass
+
+
+class SaidaJanela:
+    """Saida normal: cv2.imshow + cv2.waitKey."""
+
+    def __init__(self, titulo):
+        self.titulo = titulo
+
+    def mostrar(self, img):
+        cv2.imshow(self.titulo, img)
+
+    def tecla(self):
+        return cv2.waitKey(1)
+
+    def fechar(self):
+        cv2.destroyAllWindows()
+
+
+class SaidaNula:
+    """Saida sem janela (replay headless / build server)."""
+
+    def __init__(self):
+        self.frames = 0
+
+    def mostrar(self, img):
+        self.frames += 1
+
+    def tecla(self):
+        return -1
+
+    def fechar(self):
+        pass